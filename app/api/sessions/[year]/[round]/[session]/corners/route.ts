@@ -0,0 +1,37 @@
+import { NextResponse } from 'next/server'
+
+type Params = {
+  params: {
+    year: string
+    round: string
+    session: string
+  }
+}
+
+// Local analysis service started with `python scripts/analysis_server.py`.
+const ANALYSIS_SERVER_URL = process.env.ANALYSIS_SERVER_URL ?? 'http://127.0.0.1:8765'
+
+export async function GET(request: Request, { params }: Params) {
+  const { year, round, session } = params
+  const url = new URL(request.url)
+  const target = new URL(
+    `/sessions/${encodeURIComponent(year)}/${encodeURIComponent(round)}/${encodeURIComponent(session.toUpperCase())}/corners`,
+    ANALYSIS_SERVER_URL,
+  )
+  target.search = url.search
+
+  try {
+    const response = await fetch(target, { cache: 'no-store' })
+    const payload = await response.json()
+    return NextResponse.json(payload, { status: response.status })
+  } catch (error) {
+    return NextResponse.json(
+      {
+        error: 'Analysis server unavailable',
+        details: error instanceof Error ? error.message : String(error),
+        params,
+      },
+      { status: 503 },
+    )
+  }
+}
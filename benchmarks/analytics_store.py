@@ -0,0 +1,185 @@
+"""
+Cross-session query benchmark for the SQLite analytics store (fastf1_pipeline.store).
+
+Builds a fixture output tree from the committed public/data/sessions/*/session.json
+files, replicated across --seasons earlier years, with a seeded corners.json next to
+every session (3 laps per driver, 18 corners per lap). Then it:
+
+  - ingests the tree into a fresh store (one transaction per session) and
+    re-ingests it (every session unchanged, so skipped),
+  - answers the same questions by rescanning the JSON files (only the ones
+    the directory layout allows) and from the store, checks the answers
+    match and compares the timings.
+
+The exit status is 1 on any mismatch or when a store query exceeds
+QUERY_BUDGET_MS.
+
+  python benchmarks/analytics_store.py
+  python benchmarks/analytics_store.py --seasons 5
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from fastf1_pipeline.store import CORNER_METRICS, AnalyticsStore  # noqa: E402
+
+SESSIONS_ROOT = ROOT / "public" / "data" / "sessions"
+CORNERS_PER_LAP = 18
+LAPS_PER_DRIVER = 3
+QUERY_BUDGET_MS = 50.0
+
+
+# ---------- fixture tree ----------
+def _corners_payload(session_payload, rng):
+    meta = session_payload["meta"]
+    drivers = {}
+    for code in session_payload.get("drivers") or {}:
+        laps = []
+        for k in range(LAPS_PER_DRIVER):
+            corners = []
+            for number in range(1, CORNERS_PER_LAP + 1):
+                record = {"corner": number}
+                record.update((key, round(rng.uniform(50.0, 300.0), 3)) for key, _ in CORNER_METRICS)
+                corners.append(record)
+            laps.append({"lapNumber": 10 + k, "lapTimeSeconds": round(rng.uniform(70.0, 95.0), 3), "corners": corners})
+        drivers[code] = laps
+    return {
+        "meta": {key: meta[key] for key in ("year", "round", "session", "generatedAt")} | {"trackIndex": None},
+        "reference": None,
+        "drivers": drivers,
+        "notes": [],
+    }
+
+
+def build_fixture(target, seasons):
+    rng = random.Random(0)
+    sources = sorted(SESSIONS_ROOT.glob("*/*/*/session.json"))
+    years = [int(path.relative_to(SESSIONS_ROOT).parts[0]) for path in sources]
+    span = max(years) - min(years) + 1
+    for season in range(seasons):
+        for path in sources:
+            payload = json.loads(path.read_text())
+            year = payload["meta"]["year"] - season * span
+            payload["meta"]["year"] = year
+            session_dir = target / str(year) / payload["meta"]["round"] / payload["meta"]["session"]
+            session_dir.mkdir(parents=True, exist_ok=True)
+            (session_dir / "session.json").write_text(json.dumps(payload, separators=(",", ":")))
+            corners = _corners_payload(payload, rng)
+            (session_dir / "corners.json").write_text(json.dumps(corners, separators=(",", ":")))
+    return len(sources) * seasons
+
+
+# ---------- the same questions, two ways ----------
+def rescan_corner_metric(root, round_slug, corner, key):
+    rows = []
+    for path in sorted(root.glob(f"*/{round_slug}/*/corners.json")):
+        payload = json.loads(path.read_text())
+        meta = payload["meta"]
+        for driver, laps in payload["drivers"].items():
+            for lap in laps:
+                for record in lap["corners"]:
+                    if record["corner"] == corner:
+                        rows.append((meta["year"], meta["session"], driver, lap["lapNumber"], record[key]))
+    return sorted(rows)
+
+
+def store_corner_metric(store, round_slug, corner, column):
+    return sorted(
+        (r["year"], r["session"], r["driver"], r["lap_number"], r["value"])
+        for r in store.corner_metric(round_slug, corner, column)
+    )
+
+
+def rescan_best_laps(root, session_code):
+    best = {}
+    for path in sorted(root.glob(f"*/*/{session_code}/session.json")):
+        payload = json.loads(path.read_text())
+        meta = payload["meta"]
+        for lap in payload["laps"]:
+            if not lap["isValid"] or lap["lapTimeSeconds"] is None:
+                continue
+            key = (meta["year"], meta["round"], lap["driver"])
+            if key not in best or lap["lapTimeSeconds"] < best[key]:
+                best[key] = lap["lapTimeSeconds"]
+    return sorted((*key, seconds) for key, seconds in best.items())
+
+
+def store_best_laps(store, session_code):
+    return sorted((r["year"], r["round"], r["driver"], r["lap_time"]) for r in store.best_laps(session=session_code))
+
+
+def timed(fn, repeats):
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - t0) * 1000.0)
+    return result, statistics.median(times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare cross-session queries: JSON rescan vs the analytics store.")
+    parser.add_argument("--seasons", type=int, default=3, help="Copies of the committed sessions, one per year.")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "sessions"
+        count = build_fixture(root, args.seasons)
+        size_mb = sum(path.stat().st_size for path in root.rglob("*.json")) / 1e6
+        print(f"fixture: {count} sessions, {size_mb:.0f} MB of JSON")
+
+        with AnalyticsStore(Path(tmp) / "analytics.sqlite") as store:
+            t0 = time.perf_counter()
+            updated = store.ingest(root)
+            ingest_s = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            again = store.ingest(root)
+            reingest_s = time.perf_counter() - t0
+            rows = store.query("SELECT (SELECT COUNT(*) FROM laps) AS laps, (SELECT COUNT(*) FROM corners) AS corners")[0]
+            print(
+                f"ingest: {updated} sessions ({rows['laps']} laps, {rows['corners']} corner rows) in {ingest_s:.2f}s; "
+                f"re-ingest: {again} changed in {reingest_s:.2f}s\n"
+            )
+
+            questions = [
+                ("monaco T6 apex speed, all seasons",
+                 lambda: rescan_corner_metric(root, "monaco", 6, "ApexSpeed"),
+                 lambda: store_corner_metric(store, "monaco", 6, "apex_speed")),
+                ("best valid Q lap per driver, all rounds",
+                 lambda: rescan_best_laps(root, "Q"),
+                 lambda: store_best_laps(store, "Q")),
+            ]
+            failures = []
+            print(f"{'question':<42}{'rows':>7}{'rescan ms':>12}{'store ms':>10}{'speedup':>9}  result")
+            for name, rescan, query in questions:
+                expected, rescan_ms = timed(rescan, max(1, args.repeats // 2))
+                got, store_ms = timed(query, args.repeats)
+                problems = []
+                if got != expected:
+                    problems.append("MISMATCH")
+                if store_ms > QUERY_BUDGET_MS:
+                    problems.append("OVER BUDGET")
+                status = ", ".join(problems) or "ok"
+                if problems:
+                    failures.append(f"{name} ({status})")
+                print(f"{name:<42}{len(got):>7}{rescan_ms:>12.1f}{store_ms:>10.2f}{rescan_ms / store_ms:>8.0f}x  {status}")
+
+    if failures:
+        print(f"\n{len(failures)} failure(s): " + ", ".join(failures))
+        return 1
+    print("\nStore answers match the JSON rescan.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,131 @@
+"""
+Size and parse-time benchmark for the columnar session artifact
+(fastf1_pipeline.columnar) on the committed public/data/sessions/**/session.json
+files.
+
+Every committed session is converted three ways and each form is parsed back:
+
+  indented  -- the committed file as it is (indent=2, the old default)
+  compact   -- the same payload as compact JSON, what the pipeline writes now
+  columnar  -- session.columnar.json from to_columnar; parsing is read_columnar,
+               i.e. json.loads plus decoding every lap column into numpy arrays
+
+The report gives bytes (raw and gzip -6) and the best of --repeats parse times,
+per session and in total. Every columnar file must rebuild the committed lap
+records (columnar_laps_to_records, times compared to the millisecond as that
+function documents); the exit status is 1 otherwise.
+
+  python benchmarks/columnar_size.py
+  python benchmarks/columnar_size.py --repeats 20
+"""
+
+import argparse
+import gzip
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from fastf1_pipeline.columnar import columnar_laps_to_records, read_columnar, to_columnar  # noqa: E402
+from fastf1_pipeline.writer import dumps  # noqa: E402
+
+SESSIONS_ROOT = ROOT / "public" / "data" / "sessions"
+FORMS = ("indented", "compact", "columnar")
+
+
+def to_millisecond(laps):
+    """Lap records with times rounded to the millisecond, as columnar_laps_to_records returns them."""
+
+    def seconds(value):
+        return None if value is None else round(value, 3)
+
+    return [
+        {
+            **lap,
+            "lapTimeSeconds": seconds(lap["lapTimeSeconds"]),
+            "sectorTimesSeconds": [seconds(v) for v in lap["sectorTimesSeconds"]],
+        }
+        for lap in laps
+    ]
+
+
+def best_ms(fn, repeats):
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times) * 1000.0
+
+
+def measure(path, directory, repeats):
+    """{form: (bytes, gzip bytes, parse ms)} for one committed session, and whether its laps round-trip."""
+    indented = path.read_bytes()
+    payload = json.loads(indented)
+    texts = {
+        "indented": indented,
+        "compact": dumps(payload).encode("utf-8"),
+        "columnar": dumps(to_columnar(payload)).encode("utf-8"),
+    }
+    columnar_path = directory / "session.columnar.json"
+    columnar_path.write_bytes(texts["columnar"])
+    parsers = {
+        "indented": lambda: json.loads(texts["indented"]),
+        "compact": lambda: json.loads(texts["compact"]),
+        "columnar": lambda: read_columnar(columnar_path),
+    }
+    row = {
+        form: (len(texts[form]), len(gzip.compress(texts[form], 6)), best_ms(parsers[form], repeats)) for form in FORMS
+    }
+    return row, columnar_laps_to_records(read_columnar(columnar_path)) == to_millisecond(payload["laps"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare committed session.json files with their columnar form.")
+    parser.add_argument("--repeats", type=int, default=5, help="Parses per form; the best run counts.")
+    args = parser.parse_args(argv)
+
+    paths = sorted(SESSIONS_ROOT.glob("*/*/*/session.json"))
+    totals = {form: [0, 0, 0.0] for form in FORMS}
+    failures = []
+    print(f"{'session':<28}{'laps':>6}" + "".join(f"{form + ' KB':>14}{'ms':>7}" for form in FORMS))
+    with tempfile.TemporaryDirectory() as tmp:
+        for path in paths:
+            label = "/".join(path.parts[-4:-1])
+            laps = len(json.loads(path.read_bytes()).get("laps") or [])
+            row, round_trips = measure(path, Path(tmp), args.repeats)
+            if not round_trips:
+                failures.append(label)
+            for form, values in row.items():
+                for k, value in enumerate(values):
+                    totals[form][k] += value
+            print(
+                f"{label:<28}{laps:>6}"
+                + "".join(f"{row[form][0] / 1024:>14.1f}{row[form][2]:>7.2f}" for form in FORMS)
+                + ("" if round_trips else "  LAPS DIFFER")
+            )
+
+    print(f"\n{len(paths)} sessions{'':<6}{'bytes':>12}{'gzip':>12}{'parse ms':>10}")
+    for form in FORMS:
+        size, zipped, parse_ms = totals[form]
+        print(f"{form:<16}{size / 1e6:>10.2f}MB{zipped / 1e6:>10.2f}MB{parse_ms:>10.1f}")
+    base = totals["compact"]
+    col = totals["columnar"]
+    print(
+        f"\ncolumnar vs compact JSON: {col[0] / base[0]:.2f}x bytes, {col[1] / base[1]:.2f}x gzip bytes, "
+        f"{col[2] / base[2]:.2f}x parse time"
+    )
+
+    if failures:
+        print(f"\n{len(failures)} failure(s): columnar laps differ for " + ", ".join(failures))
+        return 1
+    print("Every columnar file rebuilds the committed lap records.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,70 @@
+"""
+Speedup benchmark for the vectorized f1_corners.detect_corners against the
+per-sample while-loop detector it replaced (kept in tests/corner_reference.py
+as detect_corners_reference, unchanged apart from the name).
+
+Both detectors run lap by lap over --laps resampled synthetic laps (200
+distinct seeded laps, cycled); the report gives total and per-lap time and
+the speedup. Every lap must give identical start/apex/end triples; the exit
+status is 1 otherwise.
+
+  python benchmarks/corner_detector.py
+  python benchmarks/corner_detector.py --laps 2000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "tests"))
+
+import f1_corners as fc  # noqa: E402
+
+import synthetic  # noqa: E402
+from corner_reference import detect_corners_reference  # noqa: E402
+
+
+def synthetic_traces(n_laps, distinct=200):
+    laps = []
+    for seed in range(min(n_laps, distinct)):
+        tel = fc.resample_to_common_distance(fc.with_distance(synthetic.synthetic_car_data(seed=seed)))
+        laps.append((tel["Speed"].to_numpy(), tel["Distance"].to_numpy()))
+    return [laps[i % len(laps)] for i in range(n_laps)]
+
+
+def timed(detector, traces):
+    t0 = time.perf_counter()
+    found = [detector(speed, distance) for speed, distance in traces]
+    return found, time.perf_counter() - t0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the vectorized detect_corners against the old while-loop detector.")
+    parser.add_argument("--laps", type=int, default=10_000)
+    args = parser.parse_args(argv)
+
+    traces = synthetic_traces(args.laps)
+    points = sum(len(speed) for speed, _ in traces)
+    print(f"{args.laps} laps, {points / args.laps:.0f} points per lap\n")
+
+    expected, loop_s = timed(detect_corners_reference, traces)
+    got, vector_s = timed(fc.detect_corners, traces)
+    mismatches = sum(a != b for a, b in zip(expected, got))
+
+    print(f"{'detector':<12}{'seconds':>10}{'ms/lap':>10}")
+    print(f"{'while-loop':<12}{loop_s:>10.2f}{loop_s * 1000 / args.laps:>10.3f}")
+    print(f"{'vectorized':<12}{vector_s:>10.2f}{vector_s * 1000 / args.laps:>10.3f}")
+    print(f"\nspeedup: {loop_s / vector_s:.1f}x")
+
+    if mismatches:
+        print(f"\nMISMATCH: {mismatches} laps give different corners")
+        return 1
+    print("Both detectors return identical corners on every lap.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,95 @@
+"""
+Parity and speed check for batch corner detection (f1_corners.detect_corners_batch).
+
+Every engine must return exactly the corners detect_corners finds lap by lap:
+
+  - "numpy": the vectorized detect_corners per lap (the fallback),
+  - "python": the uncompiled sequential kernel (f1_corners._scan_laps),
+  - "numba": the compiled, lap-parallel kernel (skipped when Numba is absent).
+
+Fixtures cover synthetic laps, noisy random traces, NaN gaps, laps too short
+to hold a corner, and traces built to hit the drop/recovery thresholds
+exactly. Then both the fallback and the compiled kernel are timed on
+--laps synthetic laps. The exit status is 1 on any mismatch.
+
+  python benchmarks/corner_kernel.py
+  python benchmarks/corner_kernel.py --laps 20000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "tests"))
+
+import f1_corners as fc  # noqa: E402
+
+import synthetic  # noqa: E402
+from corner_reference import detect_lap_by_lap, edge_batch, noisy_batch, python_kernel  # noqa: E402
+
+
+def synthetic_batch(n_laps):
+    tels = [fc.with_distance(synthetic.synthetic_car_data(seed=i)) for i in range(min(n_laps, 200))]
+    batch = fc.resample_laps_to_common_distance(tels)
+    speed = batch.data[:, batch.channels.index("Speed")].astype(float)
+    reps = -(-n_laps // len(tels))
+    return np.tile(speed, (reps, 1))[:n_laps], np.tile(batch.valid, (reps, 1))[:n_laps]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check batch corner detection engines for parity and speed.")
+    parser.add_argument("--laps", type=int, default=5000, help="Laps in the timing batch.")
+    args = parser.parse_args(argv)
+
+    has_numba = fc._numba_kernels() is not None
+    engines = {
+        "numpy": lambda s, v: fc.detect_corners_batch(s, v, engine="numpy"),
+        "python": python_kernel,
+    }
+    if has_numba:
+        engines["numba"] = lambda s, v: fc.detect_corners_batch(s, v, engine="numba")
+    else:
+        print("numba not installed: compiled kernel skipped\n")
+
+    fixtures = {
+        "synthetic laps": synthetic_batch(200),
+        "noisy traces": noisy_batch(300, 1500, seed=7),
+        "edge cases": edge_batch(),
+    }
+    failures = []
+    for name, (speed, valid) in fixtures.items():
+        expected = detect_lap_by_lap(speed, valid)
+        corners = sum(len(c) for c in expected)
+        for engine, run in engines.items():
+            got = run(speed, valid)
+            bad = [k for k, (a, b) in enumerate(zip(expected, got)) if a != b] + ([-1] if len(got) != len(expected) else [])
+            status = "ok" if not bad else f"MISMATCH in {len(bad)} lap(s), first {bad[0]}"
+            if bad:
+                failures.append(f"{name}/{engine}")
+            print(f"{name:<16}{engine:<8}{len(expected):>6} laps{corners:>8} corners  {status}")
+
+    speed, valid = synthetic_batch(args.laps)
+    print(f"\ntiming: {args.laps} laps x {speed.shape[1]} points")
+    timed = ["numpy"] + (["numba"] if has_numba else [])
+    if has_numba:
+        fc.detect_corners_batch(speed[:2], valid[:2], engine="numba")  # compile (or load the on-disk cache)
+    for engine in timed:
+        t0 = time.perf_counter()
+        fc.detect_corners_batch(speed, valid, engine=engine)
+        seconds = time.perf_counter() - t0
+        print(f"  {engine:<8}{seconds:>8.3f}s  {args.laps / seconds:>10.0f} laps/s")
+
+    if failures:
+        print(f"\n{len(failures)} mismatch(es): " + ", ".join(failures))
+        return 1
+    print("\nAll engines agree.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
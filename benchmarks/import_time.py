@@ -0,0 +1,55 @@
+"""
+Startup budget check: import cost of the pipeline package, the corner module and
+the CLIs, measured with ``python -X importtime`` in fresh interpreters.
+
+Each target must stay under its budget (best of --runs, excluding interpreter
+startup) and must not import the heavy modules listed for it. The targets and
+budgets live in tests/startup.py, which the test suite asserts as well. The exit
+status is 1 on any failure.
+
+  python benchmarks/import_time.py
+  python benchmarks/import_time.py --runs 10 --scale 2   # double every budget
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "tests"))
+
+from startup import TARGETS, import_profile  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check import-time budgets of the pipeline entry points.")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per target; the best run counts.")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every budget (for slow machines).")
+    args = parser.parse_args(argv)
+
+    failures = []
+    print(f"{'target':<36}{'import':>10}{'budget':>10}  result")
+    for target in TARGETS:
+        results = [import_profile(target) for _ in range(args.runs)]
+        best_ms = min(ms for ms, _ in results)
+        modules = set().union(*(mods for _, mods in results))
+        leaked = sorted(name for name in target.forbidden if name in modules)
+        budget = target.budget_ms * args.scale
+        status = "ok"
+        if leaked:
+            status = "IMPORTS " + ", ".join(leaked)
+        elif best_ms > budget:
+            status = "OVER BUDGET"
+        if status != "ok":
+            failures.append(target.name)
+        print(f"{target.name:<36}{best_ms:>8.1f}ms{budget:>8.0f}ms  {status}")
+
+    if failures:
+        print(f"\n{len(failures)} failure(s): " + ", ".join(failures))
+        return 1
+    print("\nAll startup budgets met.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,144 @@
+"""
+Throughput and peak-memory benchmark for the streaming JSON writer
+(fastf1_pipeline.writer.write_json) on large synthetic race payloads.
+
+For each --scales multiple of a 20-car, 57-lap race it writes session.json
+three ways and reports wall time, MB/s and the tracemalloc peak on top of
+the payload itself:
+
+  dumps   -- json.dumps of the payload (laps materialised as dicts) + write_text,
+             what the pipeline did before
+  stream  -- write_json with the stdlib backend
+  orjson  -- write_json with the orjson backend (skipped when not installed)
+
+It also checks that "stream" writes exactly the bytes "dumps" does (compact
+and indented), that "orjson" parses to the same data, and that a write that
+fails half-way leaves the previous file in place and no temp file behind.
+The exit status is 1 on any failure.
+
+  python benchmarks/json_writer.py
+  python benchmarks/json_writer.py --scales 1 10 50
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts"))
+sys.path.insert(0, str(ROOT / "tests"))
+
+from fastf1_pipeline import FetchResult, SessionIdentifier  # noqa: E402
+from fastf1_pipeline.transforms import build_session_tables  # noqa: E402
+from fastf1_pipeline.writer import json_default, orjson_available, write_json  # noqa: E402
+
+import synthetic  # noqa: E402
+
+
+def race_payload(scale):
+    laps = synthetic.synthetic_laps(n_drivers=20 * scale, n_laps=57)
+    result = FetchResult(
+        status="ok",
+        identifier=SessionIdentifier(2025, "synthetic", "R"),
+        session=synthetic.SyntheticSession(laps),
+    )
+    return build_session_tables(result)
+
+
+def write_dumps(path, payload, indent):
+    separators = (",", ":") if indent is None else None
+    path.write_text(json.dumps(payload, indent=indent, separators=separators, default=json_default))
+
+
+def writers():
+    found = {
+        "dumps": write_dumps,
+        "stream": lambda path, payload, indent: write_json(path, payload, indent=indent),
+    }
+    if orjson_available():
+        found["orjson"] = lambda path, payload, indent: write_json(path, payload, indent=indent, backend="orjson")
+    return found
+
+
+def measure(write, path, payload, repeats):
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        write(path, payload, None)
+        times.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    write(path, payload, None)
+    peak = tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+    return min(times), peak
+
+
+class _Explodes:
+    def to_json(self):
+        raise RuntimeError("simulated crash mid-write")
+
+
+def check_atomic(directory):
+    path = directory / "atomic.json"
+    write_json(path, {"version": 1})
+    try:
+        write_json(path, {"laps": list(range(10_000)), "boom": _Explodes()})
+    except RuntimeError:
+        pass
+    return json.loads(path.read_text()) == {"version": 1} and not path.with_suffix(".tmp").exists()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the streaming JSON writer against json.dumps.")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 30])
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        if not check_atomic(directory):
+            failures.append("interrupted write replaced the previous file")
+        if not orjson_available():
+            print("orjson not installed: orjson backend skipped\n")
+
+        print(f"{'laps':>8}{'writer':>9}{'MB':>8}{'seconds':>10}{'MB/s':>8}{'peak MB':>10}  result")
+        for scale in args.scales:
+            payload = race_payload(scale)
+            outputs = {}
+            for name, write in writers().items():
+                path = directory / f"{name}.json"
+                seconds, peak = measure(write, path, payload, args.repeats)
+                outputs[name] = path.read_bytes()
+                size = len(outputs[name]) / 1e6
+                status = "ok"
+                if name == "stream":
+                    indented = directory / "indented.json"
+                    write_dumps(indented, payload, 2)
+                    expected = indented.read_bytes()
+                    write_json(indented, payload, indent=2)
+                    if outputs[name] != outputs["dumps"] or indented.read_bytes() != expected:
+                        status = "BYTES DIFFER"
+                elif name == "orjson" and json.loads(outputs[name]) != json.loads(outputs["dumps"]):
+                    status = "DATA DIFFERS"
+                if status != "ok":
+                    failures.append(f"{name}@{scale}x ({status})")
+                print(
+                    f"{len(payload['laps']):>8}{name:>9}{size:>8.1f}{seconds:>10.3f}"
+                    f"{size / seconds:>8.0f}{peak / 1e6:>10.1f}  {status}"
+                )
+
+    if failures:
+        print(f"\n{len(failures)} failure(s): " + ", ".join(failures))
+        return 1
+    print("\nStreaming output matches json.dumps.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
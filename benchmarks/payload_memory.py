@@ -0,0 +1,133 @@
+"""
+Retained-memory benchmark for the compact lap and corner records
+(fastf1_pipeline.transforms.LapTable, fastf1_pipeline.corners.CornerTable).
+
+Builds a synthetic season (--rounds race + qualifying sessions, 20 drivers)
+and keeps every payload alive, as a season-wide job would, in two forms:
+
+  dicts  -- laps and corners materialised as one dict per lap / corner
+            (the JSON shape, and what the payload held before)
+  tables -- LapTable / CornerTable, turned into dicts only when serialised
+
+and reports tracemalloc's retained and peak bytes for each, plus the extra
+peak of serialising one session (where tables build their dicts). Corner
+records use seeded metric frames (3 laps per driver, 18 corners per lap). Both forms
+must serialise to identical JSON; the exit status is 1 otherwise.
+
+  python benchmarks/payload_memory.py
+  python benchmarks/payload_memory.py --rounds 10
+"""
+
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "scripts"))
+sys.path.insert(0, str(ROOT / "tests"))
+
+from fastf1_pipeline import FetchResult, SessionIdentifier  # noqa: E402
+from fastf1_pipeline.transforms import build_session_tables  # noqa: E402
+from fastf1_pipeline.writer import json_default  # noqa: E402
+from fastf1_pipeline.corners import CornerTable  # noqa: E402
+
+import f1_corners as fc  # noqa: E402
+import synthetic  # noqa: E402
+
+CORNERS_PER_LAP = 18
+LAPS_PER_DRIVER = 3
+
+
+def season_fixtures(rounds):
+    race = synthetic.SyntheticSession(synthetic.synthetic_laps(n_drivers=20, n_laps=57), session_type="R")
+    quali = synthetic.SyntheticSession(synthetic.synthetic_laps(n_drivers=20, n_laps=20, seed=1), session_type="Q")
+    return [
+        FetchResult(status="ok", identifier=SessionIdentifier(2025, f"round-{r:02d}", code), session=session)
+        for r in range(rounds)
+        for code, session in (("Q", quali), ("R", race))
+    ]
+
+
+def metric_frames(n_laps, seed=0):
+    rng = np.random.default_rng(seed)
+    columns = [c for c in fc.CORNER_METRIC_COLUMNS if c != "Corner"]
+    frames = []
+    for _ in range(n_laps):
+        data = {"Corner": np.arange(CORNERS_PER_LAP)}
+        data.update((c, rng.uniform(0.0, 300.0, CORNERS_PER_LAP)) for c in columns)
+        frames.append(pd.DataFrame(data))
+    return frames
+
+
+def build(fixtures, frames, compact):
+    payloads = []
+    for fetch_result in fixtures:
+        payload = build_session_tables(fetch_result)
+        payload["meta"]["generatedAt"] = None
+        if not compact:
+            payload["laps"] = payload["laps"].to_json()
+        numbers = list(range(1, CORNERS_PER_LAP + 1))
+        laps = [CornerTable.from_metrics(frame, numbers) for frame in frames]
+        corners = {
+            f"D{k:02d}": [
+                {"lapNumber": 10 + j, "corners": lap if compact else lap.to_json()}
+                for j, lap in enumerate(laps[k * LAPS_PER_DRIVER : (k + 1) * LAPS_PER_DRIVER])
+            ]
+            for k in range(len(laps) // LAPS_PER_DRIVER)
+        }
+        payloads.append({"session": payload, "corners": corners})
+    return payloads
+
+
+def measure(fixtures, frames, compact):
+    gc.collect()
+    tracemalloc.start()
+    payloads = build(fixtures, frames, compact)
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    text = json.dumps(payloads[-1], separators=(",", ":"), default=json_default)
+    write_peak = tracemalloc.get_traced_memory()[1] - retained
+    tracemalloc.stop()
+    texts = [text] + [json.dumps(p, separators=(",", ":"), default=json_default) for p in payloads[:-1]]
+    return payloads, retained, peak, write_peak, texts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare retained payload memory: lap/corner dicts vs compact tables.")
+    parser.add_argument("--rounds", type=int, default=24)
+    args = parser.parse_args(argv)
+
+    fixtures = season_fixtures(args.rounds)
+    frames = metric_frames(20 * LAPS_PER_DRIVER)
+
+    results = {}
+    for name, compact in (("dicts", False), ("tables", True)):
+        payloads, retained, peak, write_peak, texts = measure(fixtures, frames, compact)
+        laps = sum(len(p["session"]["laps"]) for p in payloads)
+        results[name] = (retained, peak, write_peak, texts)
+        del payloads
+    print(f"season: {len(fixtures)} sessions, {laps} laps, {len(fixtures) * len(frames) * CORNERS_PER_LAP} corner records\n")
+
+    print(f"{'form':<8}{'retained MB':>13}{'peak MB':>10}{'write peak MB':>15}")
+    for name, (retained, peak, write_peak, _) in results.items():
+        print(f"{name:<8}{retained / 1e6:>13.1f}{peak / 1e6:>10.1f}{write_peak / 1e6:>15.1f}")
+    ratio = results["dicts"][0] / results["tables"][0]
+    print(f"\ntables retain {ratio:.1f}x less than dicts")
+
+    if results["dicts"][3] != results["tables"][3]:
+        print("MISMATCH: tables serialise differently from dicts")
+        return 1
+    print("Serialised JSON is identical.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
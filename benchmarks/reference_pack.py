@@ -0,0 +1,130 @@
+"""
+Comparison-latency benchmark for the per-session reference-lap packs
+(fastf1_pipeline.reference, f1_reference_pack).
+
+A synthetic session (--drivers cars, seeded telemetry from synthetic.py) is
+packed once with build_reference_pack and written to a temp directory. Then
+every driver is compared with the fastest driver and with the whole field,
+two ways:
+
+  rebuild -- what f1_corners.main does per comparison: pick each driver's
+             fastest lap, get_car_data -> with_distance -> resample, then
+             subtract Time_s on the shared part of the grid
+  pack    -- load_reference_pack (memory-mapped) and slice + subtract
+
+It checks that every packed lap matches resample_to_common_distance of the
+same lap (to float32 precision) and that the pack's deltas match the rebuilt
+ones. The exit status is 1 on any mismatch.
+
+  python benchmarks/reference_pack.py
+  python benchmarks/reference_pack.py --drivers 40
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "scripts"))
+sys.path.insert(0, str(ROOT / "tests"))
+
+from fastf1_pipeline import FetchResult, SessionIdentifier  # noqa: E402
+from fastf1_pipeline.corners import representative_laps  # noqa: E402
+from fastf1_pipeline.reference import build_reference_pack  # noqa: E402
+
+import f1_corners as fc  # noqa: E402
+import synthetic  # noqa: E402
+from f1_reference_pack import load_reference_pack, write_reference_pack  # noqa: E402
+
+STEP = 2.0
+RTOL = 1e-6
+ATOL = 1e-4
+
+
+def rebuild_lap(laps_df, driver):
+    lap = representative_laps(laps_df, driver, 1).iloc[0]
+    return fc.resample_to_common_distance(fc.with_distance(lap.get_car_data()), step=STEP)
+
+
+def rebuild_delta(laps_df, driver, other):
+    a, b = rebuild_lap(laps_df, driver), rebuild_lap(laps_df, other)
+    n = min(len(a), len(b))
+    return a["Time_s"].to_numpy()[:n] - b["Time_s"].to_numpy()[:n]
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - t0) * 1000.0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare per-comparison lap rebuilds with reference-pack slicing.")
+    parser.add_argument("--drivers", type=int, default=20)
+    parser.add_argument("--laps", type=int, default=12, help="Laps per driver in the synthetic session.")
+    args = parser.parse_args(argv)
+
+    laps_df = synthetic.synthetic_laps(n_drivers=args.drivers, n_laps=args.laps)
+    fetch_result = FetchResult(
+        status="ok",
+        identifier=SessionIdentifier(2025, "synthetic", "Q"),
+        session=synthetic.SyntheticSession(laps_df, session_type="Qualifying"),
+    )
+
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        pack, build_ms = timed(lambda: build_reference_pack(fetch_result, dist_step=STEP))
+        _, write_ms = timed(lambda: write_reference_pack(tmp, pack))
+        mapped, load_ms = timed(lambda: load_reference_pack(tmp))
+        print(
+            f"pack: {len(mapped)} drivers x {len(mapped.channels)} channels x {mapped.data.shape[2]} points, "
+            f"{mapped.nbytes / 1e6:.2f} MB; build {build_ms:.0f} ms, write {write_ms:.1f} ms, load {load_ms:.2f} ms\n"
+        )
+
+        for driver in mapped.drivers:
+            expected = rebuild_lap(laps_df, driver)
+            got = mapped.lap(driver)
+            columns = ["Distance"] + mapped.channels
+            if len(got) != len(expected) or not np.allclose(
+                got[columns].to_numpy(), expected[columns].to_numpy(), rtol=RTOL, atol=ATOL, equal_nan=True
+            ):
+                failures.append(f"packed lap of {driver}")
+
+        reference = mapped.drivers[int(np.argmin([lap["lapTimeSeconds"] for lap in mapped.laps]))]
+        others = [d for d in mapped.drivers if d != reference]
+
+        rebuilt, rebuild_ms = timed(lambda: [rebuild_delta(laps_df, d, reference) for d in others])
+        sliced, pack_ms = timed(lambda: [mapped.delta(d, reference) for d in others])
+        for driver, a, b in zip(others, rebuilt, sliced):
+            if not np.allclose(b[: len(a)], a, rtol=RTOL, atol=ATOL, equal_nan=True):
+                failures.append(f"delta {driver}-{reference}")
+
+        field, field_ms = timed(lambda: [mapped.field_delta(d) for d in mapped.drivers])
+        time_s = mapped.channel("Time_s")
+        for i, driver in enumerate(mapped.drivers):
+            expected = time_s[i] - np.fmin.reduce(np.delete(time_s, i, axis=0), axis=0)  # fmin skips NaN
+            if not np.allclose(field[i], expected, equal_nan=True):
+                failures.append(f"field delta {driver}")
+
+        n = len(others)
+        print(f"{'comparison':<28}{'count':>6}{'total ms':>10}{'per ms':>9}")
+        print(f"{'rebuild driver vs ' + reference:<28}{n:>6}{rebuild_ms:>10.1f}{rebuild_ms / n:>9.2f}")
+        print(f"{'pack driver vs ' + reference:<28}{n:>6}{pack_ms:>10.2f}{pack_ms / n:>9.3f}")
+        print(f"{'pack driver vs field':<28}{len(mapped):>6}{field_ms:>10.2f}{field_ms / len(mapped):>9.3f}")
+        print(f"\npack is {rebuild_ms / pack_ms:.0f}x faster per comparison (excluding the session load a rebuild also needs)")
+        del mapped, time_s, field, sliced  # release the memory map before the temp dir goes
+
+    if failures:
+        print(f"\n{len(failures)} failure(s): " + ", ".join(failures))
+        return 1
+    print("\nPacked laps and deltas match the per-comparison rebuild.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
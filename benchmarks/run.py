@@ -0,0 +1,306 @@
+"""
+Offline benchmark suite for the corner analysis and session pipeline.
+
+Every case runs on synthetic, FastF1-shaped fixtures (see synthetic.py) at
+1x, 10x and 100x scale, is timed (best of several runs) and fingerprints its
+output. Results are compared against baseline.json:
+
+  - a different output fingerprint fails (behaviour changed), and
+  - a time more than --tolerance slower than the baseline fails.
+
+The exit status is 1 on any failure. Rebuild the baseline with --update after
+an intended change, on the machine the comparisons will run on.
+
+  python benchmarks/run.py                      # all cases, all scales
+  python benchmarks/run.py -k detect --scales 1 10
+  python benchmarks/run.py --update             # rewrite baseline.json
+
+Peak memory of the streaming telemetry reader is measured separately by
+benchmarks/stream_memory.py.
+"""
+
+import argparse
+import gc
+import hashlib
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "scripts"))
+sys.path.insert(0, str(ROOT / "tests"))
+
+import f1_corners as fc  # noqa: E402
+from fastf1_pipeline import FetchResult, SessionIdentifier, build_laps_payload  # noqa: E402
+from fastf1_pipeline.transforms import build_session_tables  # noqa: E402
+from fastf1_pipeline.columnar import to_columnar  # noqa: E402
+
+import synthetic  # noqa: E402
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+SCALES = (1, 10, 100)
+MIN_RUNS = 3
+MIN_SECONDS = 1.0
+
+
+class Case(NamedTuple):
+    name: str
+    setup: Callable[[int], Any]   # scale -> fixture
+    run: Callable[[Any], Any]     # fixture -> result
+    digest: Callable[[Any], Any]  # result -> JSON-able summary that must not change
+
+
+# ---------- fixtures ----------
+_cache: Dict[Any, Any] = {}
+
+
+def _memo(key, build):
+    if key not in _cache:
+        _cache[key] = build()
+    return _cache[key]
+
+
+def raw_laps(n):
+    return _memo(("raw", n), lambda: [fc.with_distance(synthetic.synthetic_car_data(seed=i)) for i in range(n)])
+
+
+def resampled_laps(n):
+    return _memo(("resampled", n), lambda: [fc.resample_to_common_distance(t) for t in raw_laps(n)])
+
+
+def detected(n):
+    return _memo(("corners", n), lambda: [fc.detect_corners(t["Speed"], t["Distance"]) for t in resampled_laps(n)])
+
+
+def race_session(scale):
+    def build():
+        laps = synthetic.synthetic_laps(n_drivers=20 * scale, n_laps=57)
+        return FetchResult(
+            status="ok",
+            identifier=SessionIdentifier(2025, "synthetic", "R"),
+            session=synthetic.SyntheticSession(laps),
+        )
+
+    return _memo(("race", scale), build)
+
+
+def qualifying_session(scale):
+    def build():
+        laps = synthetic.synthetic_laps(n_drivers=20 * scale, n_laps=3)
+        return FetchResult(
+            status="ok",
+            identifier=SessionIdentifier(2025, "synthetic", "Q"),
+            session=synthetic.SyntheticSession(laps, session_type="Qualifying"),
+        )
+
+    return _memo(("qualifying", scale), build)
+
+
+def race_payload(scale):
+    return _memo(("payload", scale), lambda: build_session_tables(race_session(scale)))
+
+
+# ---------- fingerprints ----------
+def _rounded(obj):
+    if isinstance(obj, float):
+        return None if obj != obj else round(obj, 6)
+    if isinstance(obj, dict):
+        return {k: _rounded(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_rounded(v) for v in obj]
+    if isinstance(obj, np.ndarray):
+        return _rounded(obj.tolist())
+    if isinstance(obj, np.generic):
+        return _rounded(obj.item())
+    if hasattr(obj, "to_json"):  # LapTable / CornerTable
+        return _rounded(obj.to_json())
+    return obj
+
+
+def fingerprint(obj):
+    text = json.dumps(_rounded(obj), sort_keys=True, default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def _frame_digest(df):
+    return {"rows": len(df), "sums": {c: float(df[c].sum()) for c in df.columns}}
+
+
+def _without_timestamp(payload):
+    meta = dict(payload["meta"], generatedAt=None)
+    return dict(payload, meta=meta)
+
+
+# ---------- cases ----------
+def _align_pairs(n):
+    laps, corners = resampled_laps(n + 1), detected(n + 1)
+    return [(corners[0], laps[0], corners[i], laps[i]) for i in range(1, n + 1)]
+
+
+def _corner_index(n):
+    def build():
+        windows = [fc.per_corner_metrics(t, c)[["d_start", "d_apex", "d_end"]].to_numpy() for t, c in zip(resampled_laps(n), detected(n))]
+        return fc.build_corner_index(windows)
+
+    return _memo(("index", n), build)
+
+
+CASES: List[Case] = [
+    Case(
+        "resample_to_common_distance",
+        raw_laps,
+        lambda laps: [fc.resample_to_common_distance(t) for t in laps],
+        lambda out: [_frame_digest(t) for t in out],
+    ),
+    Case(
+        "resample_laps_to_common_distance",
+        raw_laps,
+        lambda laps: fc.resample_laps_to_common_distance(laps),
+        lambda out: {"shape": list(out.data.shape), "valid": int(out.valid.sum()), "sum": float(np.nansum(out.data, dtype=float))},
+    ),
+    Case(
+        "detect_corners",
+        resampled_laps,
+        lambda laps: [fc.detect_corners(t["Speed"], t["Distance"]) for t in laps],
+        lambda out: out,
+    ),
+    Case(
+        "per_corner_metrics",
+        lambda n: list(zip(resampled_laps(n), detected(n))),
+        lambda pairs: [fc.per_corner_metrics(t, c) for t, c in pairs],
+        lambda out: [df.to_dict("list") for df in out],
+    ),
+    Case(
+        "align_corners_by_distance",
+        _align_pairs,
+        lambda pairs: [fc.align_corners_by_distance(ca, ta, cb, tb) for ca, ta, cb, tb in pairs],
+        lambda out: out,
+    ),
+    Case(
+        "align_corners_by_distance[optimal]",
+        _align_pairs,
+        lambda pairs: [fc.align_corners_by_distance(ca, ta, cb, tb, method="optimal") for ca, ta, cb, tb in pairs],
+        lambda out: out,
+    ),
+    Case(
+        "corner_metrics_by_index",
+        lambda n: (resampled_laps(n), _corner_index(n)),
+        lambda fixture: [fc.corner_metrics_by_index(t, fixture[1]) for t in fixture[0]],
+        lambda out: [df.to_dict("list") for df in out],
+    ),
+    Case(
+        "compare_laps",
+        lambda n: (raw_laps(n + 1), [f"D{i % 20:02d}" for i in range(n + 1)]),
+        lambda fixture: fc.compare_laps(*fixture),
+        lambda out: {"times": out.times, "deltas": out.deltas.to_numpy()},
+    ),
+    Case(
+        "build_session_tables",
+        race_session,
+        build_session_tables,
+        _without_timestamp,
+    ),
+    Case(
+        "build_laps_payload",
+        qualifying_session,
+        build_laps_payload,
+        _without_timestamp,
+    ),
+    Case(
+        "to_columnar",
+        race_payload,
+        to_columnar,
+        lambda out: {name: column["data"] for name, column in out["laps"]["columns"].items()},
+    ),
+]
+
+
+def time_case(case, scale):
+    """Best-of-N wall time (after one warm-up run, with GC paused) and the output fingerprint."""
+    fixture = case.setup(scale)
+    result = case.run(fixture)
+    digest = fingerprint(case.digest(result))
+    del result
+    runs = []
+    gc.collect()
+    gc.disable()
+    try:
+        started = time.perf_counter()
+        while len(runs) < MIN_RUNS or time.perf_counter() - started < MIN_SECONDS:
+            t0 = time.perf_counter()
+            case.run(fixture)
+            runs.append(time.perf_counter() - t0)
+    finally:
+        gc.enable()
+    return min(runs), len(runs), digest
+
+
+def machine_info():
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the offline benchmark suite against baseline.json.")
+    parser.add_argument("-k", dest="pattern", default=None, help="Only run cases whose name contains this text.")
+    parser.add_argument("--scales", type=int, nargs="+", default=list(SCALES))
+    parser.add_argument("--tolerance", type=float, default=1.0, help="Allowed slowdown before failing (1.0 = twice as slow).")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--update", action="store_true", help="Write the measured results into the baseline.")
+    args = parser.parse_args(argv)
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {"cases": {}}
+    stored = baseline.get("cases", {})
+    cases = [c for c in CASES if args.pattern is None or args.pattern in c.name]
+
+    measured = {}
+    failures = []
+    print(f"{'case':<44}{'time':>12}{'baseline':>12}{'ratio':>8}  result")
+    for case in cases:
+        for scale in args.scales:
+            key = f"{case.name}@{scale}x"
+            seconds, runs, digest = time_case(case, scale)
+            measured[key] = {"seconds": round(seconds, 6), "runs": runs, "digest": digest}
+            ref = stored.get(key)
+            status, ratio, ref_text = "new", "", "-"
+            if ref is not None:
+                ratio = f"{seconds / ref['seconds']:.2f}" if ref["seconds"] else ""
+                ref_text = f"{ref['seconds'] * 1000:.2f}ms"
+                if ref["digest"] != digest:
+                    status = "CHANGED OUTPUT"
+                    failures.append(key)
+                elif seconds > ref["seconds"] * (1.0 + args.tolerance):
+                    status = "SLOWER"
+                    failures.append(key)
+                else:
+                    status = "ok"
+            print(f"{key:<44}{seconds * 1000:>10.2f}ms{ref_text:>12}{ratio:>8}  {status}", flush=True)
+
+    if args.update:
+        stored.update(measured)
+        baseline = {"machine": machine_info(), "cases": dict(sorted(stored.items()))}
+        args.baseline.write_text(json.dumps(baseline, indent=2) + "\n")
+        print(f"\nBaseline updated: {args.baseline}")
+        return 0
+
+    if failures:
+        print(f"\n{len(failures)} regression(s): " + ", ".join(failures))
+        return 1
+    print("\nNo regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
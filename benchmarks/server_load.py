@@ -0,0 +1,202 @@
+"""
+Load test for the local analysis server (scripts/fastf1_pipeline/server.py).
+
+The server runs in-process on an ephemeral port with a fixture-backed session
+store: lap tables come from the committed public/data/sessions/*/session.json
+files and every lap answers get_car_data() with seeded synthetic telemetry
+(see tests/synthetic.py), so no FastF1 download is needed. --load-delay
+stands in for the cost of a cold session.load().
+
+Concurrent keep-alive clients request random driver pairs. The same request
+list is replayed twice: the first pass starts with empty caches, the second
+runs against warm ones. Latency percentiles are reported per pass.
+
+  python benchmarks/server_load.py
+  python benchmarks/server_load.py --requests 1000 --concurrency 32 --sessions 6
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "scripts"))
+sys.path.insert(0, str(ROOT / "tests"))
+
+from fastf1_pipeline import FetchResult  # noqa: E402
+from fastf1_pipeline.server import AnalysisServer  # noqa: E402
+from fastf1_pipeline.sessions import SessionManager  # noqa: E402
+
+import synthetic  # noqa: E402
+
+SESSIONS_ROOT = ROOT / "public" / "data" / "sessions"
+
+
+# ---------- fixture-backed session store ----------
+def _fixture_laps(payload):
+    rows = []
+    for k, lap in enumerate(payload.get("laps") or []):
+        flags = set(lap.get("flags") or [])
+        seconds = lap.get("lapTimeSeconds")
+        rows.append({
+            "Driver": lap["driver"],
+            "LapNumber": float(lap["lapNumber"]),
+            "LapTime": pd.Timedelta(seconds=seconds) if seconds is not None else pd.NaT,
+            "IsAccurate": "inaccurate" not in flags,
+            "Deleted": "deleted" in flags,
+            "PitInTime": pd.Timedelta(0) if "in-lap" in flags else pd.NaT,
+            "PitOutTime": pd.Timedelta(0) if "out-lap" in flags else pd.NaT,
+            "Seed": k,
+        })
+    return synthetic.SyntheticLaps(rows)
+
+
+def fixture_sessions(limit):
+    """(year, round, session) -> fixture lap table, for fixtures that have laps."""
+    sessions = {}
+    for path in sorted(SESSIONS_ROOT.glob("*/*/*/session.json")):
+        payload = json.loads(path.read_text())
+        if not payload.get("laps"):
+            continue
+        year, round_slug, code = path.parts[-4:-1]
+        sessions[(int(year), round_slug, code)] = _fixture_laps(payload)
+        if len(sessions) >= limit:
+            break
+    return sessions
+
+
+def fixture_loader(sessions, delay):
+    def load(identifier):
+        key = (identifier.year, identifier.round_slug, identifier.session_code)
+        time.sleep(delay)
+        if key not in sessions:
+            return FetchResult(status="error", identifier=identifier, message=f"No fixture for {key}")
+        return FetchResult(status="ok", identifier=identifier, session=synthetic.SyntheticSession(sessions[key]))
+
+    return load
+
+
+def request_plan(sessions, n_requests, seed):
+    rng = random.Random(seed)
+    choices = []
+    for (year, round_slug, code), laps in sessions.items():
+        timed = laps[laps["LapTime"].notna() & laps["IsAccurate"]]
+        drivers = sorted(timed["Driver"].unique())
+        if len(drivers) >= 2:
+            choices.append((f"/sessions/{year}/{round_slug}/{code}/corners", drivers))
+    plan = []
+    for _ in range(n_requests):
+        path, drivers = rng.choice(choices)
+        plan.append(f"{path}?drivers={','.join(rng.sample(drivers, 2))}")
+    return plan
+
+
+# ---------- client ----------
+async def _get(reader, writer, target):
+    writer.write(f"GET {target} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode("latin-1"))
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    body = await reader.readexactly(length)
+    return status, body
+
+
+async def run_pass(address, plan, concurrency):
+    queue = list(reversed(plan))
+    latencies, errors = [], []
+
+    async def client():
+        reader, writer = await asyncio.open_connection(*address)
+        try:
+            while queue:
+                target = queue.pop()
+                t0 = time.perf_counter()
+                status, body = await _get(reader, writer, target)
+                latencies.append(time.perf_counter() - t0)
+                if status != 200:
+                    errors.append((status, target, body[:200]))
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return np.asarray(latencies), errors, time.perf_counter() - started
+
+
+async def stats(address):
+    reader, writer = await asyncio.open_connection(*address)
+    try:
+        _, body = await _get(reader, writer, "/stats")
+    finally:
+        writer.close()
+        await writer.wait_closed()
+    return json.loads(body)
+
+
+def _row(name, latencies, elapsed):
+    p50, p90, p99 = (np.percentile(latencies, q) * 1000 for q in (50, 90, 99))
+    return (
+        f"{name:<8}{len(latencies):>8}{len(latencies) / elapsed:>10.1f}"
+        f"{p50:>10.1f}{p90:>10.1f}{p99:>10.1f}{latencies.max() * 1000:>10.1f}"
+    )
+
+
+async def main_async(args):
+    sessions = fixture_sessions(args.sessions)
+    plan = request_plan(sessions, args.requests, args.seed)
+    app = AnalysisServer(
+        SessionManager(fixture_loader(sessions, args.load_delay), max_sessions=args.max_sessions),
+        workers=args.workers,
+        max_lap_bytes=int(args.lap_cache_mb * 1024 * 1024),
+    )
+    server = await app.serve("127.0.0.1", 0)
+    address = server.sockets[0].getsockname()[:2]
+    failed = False
+    try:
+        print(f"{len(sessions)} fixture sessions, {args.requests} requests, concurrency {args.concurrency}, "
+              f"{args.workers} workers, simulated load {args.load_delay:.2f}s\n")
+        print(f"{'pass':<8}{'reqs':>8}{'req/s':>10}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+        for name in ("cold", "warm"):
+            latencies, errors, elapsed = await run_pass(address, plan, args.concurrency)
+            print(_row(name, latencies, elapsed), flush=True)
+            for status, target, body in errors[:5]:
+                print(f"  {status} {target}: {body.decode('utf-8', 'replace')}")
+            failed |= bool(errors)
+        print("\ncache:", json.dumps(await stats(address)))
+    finally:
+        await app.aclose(server)
+    return 1 if failed else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the analysis server against fixture sessions.")
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--sessions", type=int, default=4, help="Fixture sessions to spread requests over.")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--max-sessions", type=int, default=4)
+    parser.add_argument("--lap-cache-mb", type=float, default=256.0)
+    parser.add_argument("--load-delay", type=float, default=0.5, help="Simulated seconds per cold session load.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    return asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,116 @@
+"""
+Wall-time benchmark for the asyncio session fan-out (fastf1_pipeline.fanout),
+with the fake loader from tests/fake_loader.py, which sleeps instead of
+calling session.load().
+
+Every session of --years seasons of one weekend (FP1 FP2 FP3 Q R) gets a
+seeded load time between --min and --max seconds. The same request list runs:
+
+  sequential -- one worker, what fetch_fastf1_data.py did per invocation
+  fan-out    -- one worker per session
+  per-cache  -- one worker per session, but the sessions of a season share a
+                cache key with per_cache=1, so each season runs one at a time
+
+and it checks that fan-out finishes within SLACK of the slowest session, that
+per-cache never runs two jobs on one key at once and finishes near the slowest
+season, that results come back in request order, and that a job that raises
+is reported without stopping the others. The exit status is 1 on any failure.
+
+  python benchmarks/session_fanout.py
+  python benchmarks/session_fanout.py --years 5 --max 2.0
+"""
+
+import argparse
+import random
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts"))
+sys.path.insert(0, str(ROOT / "tests"))
+
+from fastf1_pipeline import SessionIdentifier  # noqa: E402
+from fastf1_pipeline.fanout import run_fan_out  # noqa: E402
+from fastf1_pipeline.sessions import session_key  # noqa: E402
+
+from fake_loader import SleepingLoader  # noqa: E402
+
+WEEKEND = ("FP1", "FP2", "FP3", "Q", "R")
+SLACK = 1.25
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare sequential and fanned-out session loads with a sleeping loader.")
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--min", type=float, default=0.2)
+    parser.add_argument("--max", type=float, default=1.0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    identifiers = [
+        SessionIdentifier(year=2025 - k, round_slug="monaco", session_code=code)
+        for k in range(args.years)
+        for code in WEEKEND
+    ]
+    durations = {session_key(identifier): rng.uniform(args.min, args.max) for identifier in identifiers}
+    slowest = max(durations.values())
+    seasons = Counter()
+    for (year, _, _), seconds in durations.items():
+        seasons[year] += seconds
+    slowest_season = max(seasons.values())
+    print(
+        f"{len(identifiers)} sessions; sum of load times {sum(durations.values()):.2f}s, "
+        f"slowest session {slowest:.2f}s, slowest season {slowest_season:.2f}s\n"
+    )
+
+    runs = {
+        "sequential": dict(workers=1),
+        "fan-out": dict(workers=len(identifiers)),
+        "per-cache": dict(workers=len(identifiers), cache_key=lambda ident: ident.year, per_cache=1),
+    }
+    bounds = {"fan-out": slowest * SLACK, "per-cache": slowest_season * SLACK}
+    failures = []
+    print(f"{'run':<12}{'seconds':>9}{'bound':>8}  result")
+    for name, options in runs.items():
+        loader = SleepingLoader(durations)
+        t0 = time.perf_counter()
+        results = run_fan_out(identifiers, loader, processes=False, **options)
+        seconds = time.perf_counter() - t0
+        problems = []
+        if [r.value for r in results] != identifiers:
+            problems.append("ORDER")
+        if name in bounds and seconds > bounds[name]:
+            problems.append("TOO SLOW")
+        if name == "per-cache" and max(loader.peak.values()) > 1:
+            problems.append("CAP EXCEEDED")
+        status = ", ".join(problems) or "ok"
+        if problems:
+            failures.append(f"{name} ({status})")
+        bound = f"{bounds[name]:.2f}" if name in bounds else "-"
+        print(f"{name:<12}{seconds:>9.2f}{bound:>8}  {status}")
+
+    failing = identifiers[len(identifiers) // 2]
+    progress = []
+    results = run_fan_out(
+        identifiers,
+        SleepingLoader(durations, fail=[failing]),
+        workers=len(identifiers),
+        processes=False,
+        on_progress=progress.append,
+    )
+    errors = [r.identifier for r in results if r.error is not None]
+    if errors != [failing] or len(progress) != len(identifiers) or progress[-1].finished != len(identifiers):
+        failures.append("a failing job was not isolated")
+    print(f"\nprogress, last event: {progress[-1].to_text() if progress else '-'}")
+
+    if failures:
+        print(f"\n{len(failures)} failure(s): " + ", ".join(failures))
+        return 1
+    print("\nFan-out finishes with the slowest session.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,121 @@
+"""
+Peak-memory benchmark for the streaming telemetry reader (f1_telemetry_stream).
+
+Generates a synthetic 20-car, 60-lap race chunk by chunk and compares the
+tracemalloc peak of
+
+  eager     -- materialise every car's full telemetry (as session.car_data
+               does), then slice and resample lap by lap
+  streaming -- stream_resampled_laps over the same chunks
+
+The chunks are generated on demand, so "streaming" never holds the session.
+A loaded FastF1 session already has all of its car data in memory
+(session_car_data_chunks only slices it), so there the saving is limited to
+the per-lap copies.
+
+Run from the repo root:  python benchmarks/stream_memory.py [--laps 60 --drivers 20]
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from f1_telemetry_stream import iter_lap_samples, lap_windows, resample_lap, stream_resampled_laps  # noqa: E402
+
+LAP_S = 90.0
+HZ = 4.0
+
+
+def synthetic_laps(n_drivers, n_laps):
+    rows = []
+    for k in range(n_drivers):
+        for n in range(n_laps):
+            start = 60.0 + n * LAP_S
+            rows.append({
+                "Driver": f"D{k:02d}",
+                "DriverNumber": str(k + 1),
+                "LapNumber": float(n + 1),
+                "LapStartTime": pd.Timedelta(seconds=start),
+                "Time": pd.Timedelta(seconds=start + LAP_S),
+            })
+    return pd.DataFrame(rows)
+
+
+def synthetic_car_chunks(seed, n_laps, chunk_rows):
+    """One car's telemetry as a generator of frames; the full session never exists at once."""
+    rng = np.random.default_rng(seed)
+    total = int((60.0 + n_laps * LAP_S + 30.0) * HZ)
+    for lo in range(0, total, chunk_rows):
+        t = np.arange(lo, min(lo + chunk_rows, total)) / HZ
+        phase = (t % LAP_S) / LAP_S * 2 * np.pi
+        speed = 220.0 + 80.0 * np.sin(5 * phase) + rng.normal(0.0, 1.0, len(t))
+        yield pd.DataFrame({
+            "Date": pd.Timestamp("2025-01-01") + pd.to_timedelta(t, unit="s"),
+            "SessionTime": pd.to_timedelta(t, unit="s"),
+            "Time": pd.to_timedelta(t, unit="s"),
+            "RPM": speed * 40.0,
+            "Speed": speed,
+            "nGear": np.clip(speed // 40.0, 1, 8),
+            "Throttle": np.where(np.cos(5 * phase) > 0, 100.0, 0.0),
+            "Brake": np.cos(5 * phase) < -0.5,
+            "DRS": np.zeros(len(t)),
+        })
+
+
+def driver_chunks(laps_df, n_laps, chunk_rows):
+    for k, driver in enumerate(dict.fromkeys(laps_df["Driver"])):
+        yield driver, synthetic_car_chunks(k, n_laps, chunk_rows)
+
+
+def run_eager(laps_df, n_laps, chunk_rows, step):
+    car_data = {driver: pd.concat(list(chunks), ignore_index=True) for driver, chunks in driver_chunks(laps_df, n_laps, chunk_rows)}
+    count = 0
+    for driver, full in car_data.items():
+        windows = lap_windows(laps_df, driver)
+        for window, t, vals, channels in iter_lap_samples([full], windows):
+            resample_lap(t, vals, channels, step)
+            count += 1
+    return count
+
+
+def run_streaming(laps_df, n_laps, chunk_rows, step):
+    count = 0
+    for _ in stream_resampled_laps(driver_chunks(laps_df, n_laps, chunk_rows), laps_df, step=step):
+        count += 1
+    return count
+
+
+def measure(fn, *args):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    count = fn(*args)
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return count, peak, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--laps", type=int, default=60)
+    parser.add_argument("--drivers", type=int, default=20)
+    parser.add_argument("--chunk_rows", type=int, default=2000)
+    parser.add_argument("--step", type=float, default=2.0)
+    args = parser.parse_args()
+
+    laps_df = synthetic_laps(args.drivers, args.laps)
+    bench_args = (laps_df, args.laps, args.chunk_rows, args.step)
+    print(f"{args.drivers} cars x {args.laps} laps, {args.chunk_rows}-row chunks")
+    for name, fn in (("eager", run_eager), ("streaming", run_streaming)):
+        count, peak, elapsed = measure(fn, *bench_args)
+        print(f"{name:>10}: {count} laps, peak {peak / 2**20:8.1f} MiB, {elapsed:6.2f} s")
+
+
+if __name__ == "__main__":
+    main()
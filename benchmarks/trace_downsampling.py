@@ -0,0 +1,77 @@
+"""
+Bounds check for the laps.json trace downsampling (fastf1_pipeline.traces).
+
+Builds the laps.json payload for a synthetic 20-driver qualifying session at
+several point budgets and compares every downsampled trace with the
+full-resolution one (linear interpolation between the kept points):
+
+  - no trace may have more points than the budget,
+  - the payload must stay under BYTES_PER_POINT * budget * drivers,
+  - the worst reconstruction error must stay under each budget's limit
+    (delta traces in seconds, speed traces in km/h).
+
+The exit status is 1 on any failure.
+
+  python benchmarks/trace_downsampling.py
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "scripts"))
+sys.path.insert(0, str(ROOT / "tests"))
+
+from fastf1_pipeline import build_laps_payload  # noqa: E402
+
+from trace_bounds import BYTES_PER_POINT, FULL_RESOLUTION, LIMITS, session, worst_error  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check laps.json trace size and reconstruction error bounds.")
+    parser.add_argument("--drivers", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    fixture = session(args.drivers)
+    full = build_laps_payload(fixture, max_points=FULL_RESOLUTION)
+    full_bytes = len(json.dumps(full, separators=(",", ":")))
+    full_points = max(len(d["delta"]["distance"]) for d in full["drivers"].values())
+    print(f"full resolution: {full_points} points per trace, {full_bytes / 1024:.0f} KiB\n")
+
+    failures = []
+    print(f"{'budget':>8}{'points':>8}{'KiB':>8}{'ratio':>8}{'delta err s':>14}{'speed err':>12}  result")
+    for budget, (delta_limit, speed_limit) in LIMITS.items():
+        payload = build_laps_payload(fixture, max_points=budget)
+        size = len(json.dumps(payload, separators=(",", ":")))
+        points = max(len(trace["distance"]) for d in payload["drivers"].values() for trace in (d["delta"], d["speed"]))
+        delta_err = max(worst_error(full["drivers"][c]["delta"], d["delta"]) for c, d in payload["drivers"].items())
+        speed_err = max(worst_error(full["drivers"][c]["speed"], d["speed"]) for c, d in payload["drivers"].items())
+        problems = []
+        if points > budget:
+            problems.append("TOO MANY POINTS")
+        if size > BYTES_PER_POINT * budget * len(payload["drivers"]):
+            problems.append("TOO LARGE")
+        if delta_err > delta_limit:
+            problems.append("DELTA ERROR")
+        if speed_err > speed_limit:
+            problems.append("SPEED ERROR")
+        status = ", ".join(problems) or "ok"
+        if problems:
+            failures.append(f"{budget} ({status})")
+        print(
+            f"{budget:>8}{points:>8}{size / 1024:>8.0f}{full_bytes / size:>8.1f}"
+            f"{delta_err:>14.4f}{speed_err:>12.2f}  {status}"
+        )
+
+    if failures:
+        print(f"\n{len(failures)} failure(s): " + ", ".join(failures))
+        return 1
+    print("\nAll trace bounds met.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,4 +1,6 @@
 import argparse
+import types
+from typing import List, NamedTuple
 import numpy as np
 import pandas as pd
 import numpy as np
@@ -8,24 +10,53 @@ from pandas.api.types import (
     is_datetime64_any_dtype,
     is_timedelta64_dtype,
 )
-import fastf1
-from fastf1.core import Laps
-import matplotlib.pyplot as plt
+from f1_lap_cache import ResampledLapCache
+from f1_reference_pack import load_reference_pack
+
+# fastf1 and matplotlib are only imported by the functions that need them, so the
+# corner maths can be used (e.g. by scripts/fastf1_pipeline) without loading either.
 
 # ---------- Utilities ----------
 def enable_cache(path="cache"):
+    import fastf1
     fastf1.Cache.enable_cache(path)
 
+def clean_laps(laps_df, driver_code):
+    """The driver's laps that have a time and are not deleted, inaccurate or pit in/out laps."""
+    laps = laps_df[laps_df["Driver"] == driver_code]
+    clean = laps["LapTime"].notna()
+    if "Deleted" in laps.columns:
+        clean &= ~laps["Deleted"].astype(bool)
+    if "IsAccurate" in laps.columns:
+        clean &= laps["IsAccurate"].astype(bool)
+    for column in ("PitInTime", "PitOutTime"):
+        if column in laps.columns:
+            clean &= laps[column].isna()
+    return laps[clean]
+
+def fastest_clean_laps(laps_df, driver_code, count=None):
+    """The driver's clean laps, fastest first; the count fastest when count is given."""
+    laps = clean_laps(laps_df, driver_code)
+    if count is None:
+        return laps.sort_values("LapTime", kind="stable")
+    return laps.nsmallest(count, "LapTime")
+
 def get_fastest_lap(session, driver_code):
-    # pick_driver is deprecated, use pick_drivers
-    laps = session.laps.pick_drivers(driver_code)
-    return laps.pick_fastest()
+    # the lap the pipeline packs and traces for the driver (fastest_clean_laps), or None
+    laps = fastest_clean_laps(session.laps, driver_code, 1)
+    return None if laps.empty else laps.iloc[0]
 
 def with_distance(car_data):
     if "Distance" not in car_data.columns:
         car_data = car_data.add_distance()
     return car_data
 
+# Bump when resampling output changes so cached resampled laps are invalidated.
+RESAMPLE_VERSION = 1
+
+# Lap cache alias for get_fastest_lap's pick; renamed when the selection rule changes.
+FASTEST_LAP_ALIAS = "fastest-clean"
+
 def resample_to_common_distance(tel_df, step=2.0):
     # clean and sort
     tel_df = tel_df.dropna(subset=["Distance"]).sort_values("Distance")
@@ -55,6 +86,101 @@ def resample_to_common_distance(tel_df, step=2.0):
 
     return out
 
+class ResampledLaps(NamedTuple):
+    grid: np.ndarray       # (n_grid,) shared distance grid [m]
+    channels: List[str]    # channel names along axis 1 of data
+    data: np.ndarray       # (n_laps, n_channels, n_grid) float32, NaN where invalid
+    valid: np.ndarray      # (n_laps, n_grid) bool, grid point covered by the lap
+
+def _interp_channels(grid, d, vals):
+    # np.interp for several channels at once: one bracket search per lap
+    hi = np.clip(np.searchsorted(d, grid, side="right"), 1, len(d) - 1)
+    lo = hi - 1
+    w = np.clip((grid - d[lo]) / (d[hi] - d[lo]), 0.0, 1.0)
+    return vals[:, lo] + (vals[:, hi] - vals[:, lo]) * w
+
+def resample_laps_to_common_distance(tel_dfs, step=2.0, channels=None, max_distance=None):
+    """
+    Batch version of resample_to_common_distance for many laps.
+    All laps are interpolated onto one grid (0 .. longest lap, or max_distance)
+    and packed into a single float32 array; points past the end of a lap, or
+    laps with fewer than two distinct distance samples, are marked invalid.
+    Channels are picked once from the first lap (same rules as the single-lap
+    version, Time becomes Time_s) unless given explicitly.
+    """
+    tel_dfs = list(tel_dfs)
+    if channels is None:
+        channels = []
+        if tel_dfs:
+            first = tel_dfs[0]
+            for col in first.columns:
+                if col == "Distance" or col == "Time":
+                    continue
+                if is_datetime64_any_dtype(first[col]) or is_timedelta64_dtype(first[col]):
+                    continue
+                if not is_numeric_dtype(first[col]):
+                    continue
+                channels.append(col)
+            if "Time" in first.columns:
+                channels.append("Time_s")
+    channels = list(channels)
+
+    # clean and sort each lap once, as plain arrays
+    laps = []
+    for tel_df in tel_dfs:
+        d = tel_df["Distance"].to_numpy(dtype=float)
+        keep = ~np.isnan(d)
+        order = np.argsort(d[keep], kind="stable")
+        d = d[keep][order]
+        first_seen = np.ones(len(d), dtype=bool)
+        first_seen[1:] = d[1:] != d[:-1]
+        vals = np.empty((len(channels), len(d)), dtype=float)
+        for c, col in enumerate(channels):
+            if col == "Time_s" and "Time" in tel_df.columns:
+                v = pd.to_timedelta(tel_df["Time"]).dt.total_seconds().to_numpy()
+            else:
+                v = tel_df[col].to_numpy(dtype=float)
+            vals[c] = v[keep][order]
+        laps.append((d[first_seen], vals[:, first_seen]))
+
+    if max_distance is None:
+        max_distance = max((float(d[-1]) for d, _ in laps if len(d)), default=0.0)
+    grid = np.arange(0.0, max_distance, step)
+
+    data = np.full((len(laps), len(channels), len(grid)), np.nan, dtype=np.float32)
+    valid = np.zeros((len(laps), len(grid)), dtype=bool)
+    for i, (d, vals) in enumerate(laps):
+        if len(d) < 2:
+            continue
+        valid[i] = grid < d[-1]
+        data[i][:, valid[i]] = _interp_channels(grid[valid[i]], d, vals)
+
+    return ResampledLaps(grid=grid, channels=channels, data=data, valid=valid)
+
+# Cumulative-sum thresholds within this distance of the limit are re-checked with
+# the sequential scan so rounding can never change which corners are found.
+_THRESHOLD_ATOL = 1e-6
+
+def _descent_drop(sp, i, apex):
+    drop = 0.0
+    for j in range(i, apex):
+        drop += sp[j] - sp[j+1]
+    return drop
+
+def _recovery_end(sp, apex, min_recovery_kmh):
+    n = len(sp)
+    k = apex
+    recover = 0.0
+    while k < n - 1 and recover < min_recovery_kmh and sp[k+1] - sp[k] >= -0.2:
+        recover += max(0.0, sp[k+1] - sp[k])
+        k += 1
+    return k
+
+def _next_true(mask, idx, fill):
+    # For every position, the first index >= it where mask holds (fill if none).
+    nxt = np.where(mask, idx, fill)
+    return np.minimum.accumulate(nxt[::-1])[::-1]
+
 def detect_corners(speed_series, distance_series, min_drop_kmh=18.0, min_recovery_kmh=10.0, min_len_pts=4):
     """
     Very simple heuristic:
@@ -62,129 +188,588 @@ def detect_corners(speed_series, distance_series, min_drop_kmh=18.0, min_recover
     - The apex is the local minimum after the drop
     - Corner ends when speed recovers by min_recovery_kmh or trend reverses
     Returns a list of dicts with start_idx, apex_idx, end_idx.
+
+    Descent runs, drops and recovery points are computed for the whole trace
+    with np.diff-style masks and cumulative sums; the remaining Python loop only
+    visits braking candidates, not every sample.
     """
-    sp = np.asarray(speed_series)
-    d = np.asarray(distance_series)
+    sp = np.asarray(speed_series, dtype=float)
     n = len(sp)
+    if n < 4:
+        return []
+    idx = np.arange(n)
+    step = sp[:-1] - sp[1:]  # step[m] = sp[m] - sp[m+1], positive while slowing down
+
+    # braking candidates: sp[i-1] - sp[i] >= 0.5, only where the scan would still run
+    cand = np.flatnonzero(~(step[: n - 3] < 0.5)) + 1
+    if not len(cand):
+        return []
+
+    # apex = end of the descending run, drop = speed lost along it
+    falling = step > 0
+    apex_of = _next_true(np.append(~falling, True), idx, n - 1)
+    cum_drop = np.concatenate(([0.0], np.cumsum(np.where(falling, step, 0.0))))
+    apex = apex_of[cand]
+    drop = cum_drop[apex] - cum_drop[cand]
+
+    # recovery ends on a drop worse than -0.2 km/h or once gains reach min_recovery_kmh
+    rise = -step
+    halt = _next_true(np.append(~(rise >= -0.2), True), idx, n - 1)
+    cum_gain = np.concatenate(([0.0], np.cumsum(np.where(rise > 0, rise, 0.0))))
+    base = cum_gain[apex]
+    reached = np.maximum(np.searchsorted(cum_gain, base + min_recovery_kmh, side="left"), apex)
+    k = np.minimum(halt[apex], reached)
+    gain = cum_gain[k] - base
+    prev_gain = np.where(k > apex, cum_gain[np.maximum(k - 1, 0)] - base, np.inf)
+
+    is_drop = drop >= min_drop_kmh
+    end = np.minimum(k + 1, n - 1)
+
+    # settle near-threshold candidates with the sequential scan
+    fuzzy = (
+        (np.abs(drop - min_drop_kmh) <= _THRESHOLD_ATOL)
+        | (np.abs(gain - min_recovery_kmh) <= _THRESHOLD_ATOL)
+        | (np.abs(prev_gain - min_recovery_kmh) <= _THRESHOLD_ATOL)
+    )
+    for c in np.flatnonzero(fuzzy).tolist():
+        i, a = int(cand[c]), int(apex[c])
+        is_drop[c] = _descent_drop(sp, i, a) >= min_drop_kmh
+        end[c] = min(_recovery_end(sp, a, min_recovery_kmh) + 1, n - 1)
+
+    # each candidate hands over to the first candidate past its corner (or its descent)
+    is_corner = (is_drop & (end - (cand - 1) >= min_len_pts)).tolist()
+    resume = np.searchsorted(cand, np.where(is_drop, end, apex) + 1).tolist()
+    start = (cand - 1).tolist()
+    apex = apex.tolist()
+    end = end.tolist()
+
     corners = []
+    c, m = 0, len(start)
+    while c < m:
+        if is_corner[c]:
+            corners.append({"start_idx": start[c], "apex_idx": apex[c], "end_idx": end[c]})
+        c = resume[c]
+    return corners
+
+# ---------- Batch corner detection ----------
+def _scan_lap(sp, n, min_drop_kmh, min_recovery_kmh, min_len_pts, out_start, out_apex, out_end, offset, write):
+    # The sequential form of detect_corners for one lap: returns the corner count
+    # and, when write is set, stores the corners from out_*[offset] on. Plain
+    # Python so it can run uncompiled; _numba_kernels() compiles it when available.
+    count = 0
     i = 1
     while i < n - 2:
-        # look for start of braking - negative gradient region
-        if sp[i-1] - sp[i] < 0.5:
+        if sp[i - 1] - sp[i] < 0.5:
             i += 1
             continue
-        # potential braking window
-        j = i
+        apex = i
+        while apex < n - 1 and sp[apex] - sp[apex + 1] > 0:
+            apex += 1
         drop = 0.0
-        while j < n - 1 and sp[j] - sp[j+1] > 0:  # descending
-            drop += sp[j] - sp[j+1]
-            j += 1
-        if drop >= min_drop_kmh:
-            # j is at the apex index approx
-            apex_idx = j
-            # now find recovery
-            k = apex_idx
-            recover = 0.0
-            while k < n - 1 and recover < min_recovery_kmh and sp[k+1] - sp[k] >= -0.2:
-                recover += max(0.0, sp[k+1] - sp[k])
-                k += 1
-            start_idx = max(i - 1, 0)
-            end_idx = min(k + 1, n - 1)
-            if end_idx - start_idx >= min_len_pts:
-                corners.append({"start_idx": start_idx, "apex_idx": apex_idx, "end_idx": end_idx})
-            i = end_idx + 1
+        for j in range(i, apex):
+            drop += sp[j] - sp[j + 1]
+        if drop < min_drop_kmh:
+            i = apex + 1
+            continue
+        k = apex
+        recover = 0.0
+        while k < n - 1 and recover < min_recovery_kmh and sp[k + 1] - sp[k] >= -0.2:
+            gain = sp[k + 1] - sp[k]
+            if gain > 0.0:
+                recover += gain
+            k += 1
+        end = min(k + 1, n - 1)
+        if end - (i - 1) >= min_len_pts:
+            if write:
+                out_start[offset + count] = i - 1
+                out_apex[offset + count] = apex
+                out_end[offset + count] = end
+            count += 1
+        i = end + 1
+    return count
+
+def _scan_laps(speed, lengths, min_drop_kmh, min_recovery_kmh, min_len_pts):
+    # count pass, then a fill pass into flat arrays; lap k owns [offsets[k], offsets[k + 1]).
+    # prange is range here and numba.prange in the compiled copy.
+    n_laps = speed.shape[0]
+    none = np.empty(0, dtype=np.int64)
+    counts = np.zeros(n_laps, dtype=np.int64)
+    for k in prange(n_laps):
+        counts[k] = _scan_lap(speed[k], lengths[k], min_drop_kmh, min_recovery_kmh, min_len_pts,
+                              none, none, none, 0, False)
+    offsets = np.zeros(n_laps + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(counts)
+    start = np.empty(offsets[-1], dtype=np.int64)
+    apex = np.empty(offsets[-1], dtype=np.int64)
+    end = np.empty(offsets[-1], dtype=np.int64)
+    for k in prange(n_laps):
+        _scan_lap(speed[k], lengths[k], min_drop_kmh, min_recovery_kmh, min_len_pts,
+                  start, apex, end, offsets[k], True)
+    return offsets, start, apex, end
+
+prange = range
+_numba_cache = []
+NUMBA_MIN_LAPS = 64
+
+def _numba_kernels():
+    """_scan_laps compiled with Numba and parallel across laps, or None when Numba is not installed."""
+    if not _numba_cache:
+        try:
+            import numba
+        except ImportError:
+            _numba_cache.append(None)
         else:
-            i = j + 1
-    return corners
+            scope = dict(globals(), prange=numba.prange, _scan_lap=numba.njit(cache=True, nogil=True)(_scan_lap))
+            scan_laps = types.FunctionType(_scan_laps.__code__, scope, "_scan_laps")
+            _numba_cache.append(numba.njit(cache=True, parallel=True)(scan_laps))
+    return _numba_cache[0]
+
+def detect_corners_batch(speed, valid=None, min_drop_kmh=18.0, min_recovery_kmh=10.0, min_len_pts=4, engine="auto"):
+    """
+    detect_corners for every lap of an (n_laps, n_grid) speed matrix, e.g. the
+    Speed channel of resample_laps_to_common_distance. valid marks each lap's
+    samples (a prefix of the row, as ResampledLaps.valid does); without it
+    every row is used in full. Returns one corner list per lap, identical to
+    calling detect_corners on each lap's valid samples.
+
+    engine="numba" runs a compiled sequential scan, parallel across laps;
+    engine="numpy" calls the vectorized detect_corners lap by lap; "auto"
+    uses Numba when it is installed and the batch has at least
+    NUMBA_MIN_LAPS laps (below that, importing Numba costs more than it saves).
+    """
+    speed = np.asarray(speed, dtype=float)
+    if speed.ndim != 2:
+        raise ValueError("speed must be an (n_laps, n_grid) matrix")
+    if valid is None:
+        lengths = np.full(speed.shape[0], speed.shape[1], dtype=np.int64)
+    else:
+        lengths = np.asarray(valid, dtype=bool).sum(axis=1).astype(np.int64)
+
+    kernel = None
+    if engine == "numba" or (engine == "auto" and speed.shape[0] >= NUMBA_MIN_LAPS):
+        kernel = _numba_kernels()
+        if kernel is None and engine == "numba":
+            raise ImportError("engine='numba' needs numba (`pip install numba`)")
+    elif engine not in ("auto", "numpy"):
+        raise ValueError(f"Unknown engine {engine!r}")
+
+    if kernel is None:
+        dist = np.arange(speed.shape[1], dtype=float)
+        return [
+            detect_corners(speed[k, :n], dist[:n], min_drop_kmh, min_recovery_kmh, min_len_pts)
+            for k, n in enumerate(lengths.tolist())
+        ]
+
+    offsets, start, apex, end = kernel(
+        np.ascontiguousarray(speed), lengths, float(min_drop_kmh), float(min_recovery_kmh), int(min_len_pts)
+    )
+    offsets, start, apex, end = offsets.tolist(), start.tolist(), apex.tolist(), end.tolist()
+    return [
+        [{"start_idx": start[c], "apex_idx": apex[c], "end_idx": end[c]} for c in range(offsets[k], offsets[k + 1])]
+        for k in range(len(offsets) - 1)
+    ]
+
+CORNER_METRIC_COLUMNS = [
+    "Corner", "d_start", "d_apex", "d_end", "EntrySpeed", "ApexSpeed", "ExitSpeed", "CornerTime",
+    "MinSpeed", "d_min_speed", "BrakingDistance", "d_throttle_on", "MeanThrottle", "MeanBrake",
+]
+
+def _channel(tel, col):
+    if col not in tel:
+        return None
+    return np.asarray(tel[col], dtype=float)
+
+def _segment_positions(start_idx, end_idx):
+    # flat sample indices covering every [start, end] window, plus window offsets
+    lengths = end_idx - start_idx + 1
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    flat = np.repeat(start_idx - offsets, lengths) + np.arange(int(lengths.sum()))
+    return flat, offsets, lengths
+
+def corner_metrics_from_indices(tel, start_idx, apex_idx, end_idx, throttle_on_pct=10.0):
+    """
+    Columnar per-corner metrics. tel is a resampled telemetry frame (or any
+    mapping of column -> array) and the three index arrays describe one corner
+    each. Values are gathered with fancy indexing and window reductions are done
+    with ufunc.reduceat, so there is no per-corner Python work.
+
+    Besides the per_corner_metrics columns this adds the minimum speed and
+    where it occurs, the braking distance (first Brake application to apex),
+    the throttle-on point (first sample from the apex with Throttle at or above
+    throttle_on_pct) and the mean Throttle/Brake inside the corner. Columns
+    whose channel is missing are NaN.
+    """
+    s = np.asarray(start_idx, dtype=np.intp)
+    a = np.asarray(apex_idx, dtype=np.intp)
+    e = np.asarray(end_idx, dtype=np.intp)
+    m = len(s)
+    if m == 0:
+        return pd.DataFrame(columns=CORNER_METRIC_COLUMNS)
+
+    speed = _channel(tel, "Speed")
+    dist = _channel(tel, "Distance")
+    time_s = _channel(tel, "Time_s")
+    throttle = _channel(tel, "Throttle")
+    brake = _channel(tel, "Brake")
+    nan = np.full(m, np.nan)
+
+    flat, offsets, lengths = _segment_positions(s, e)
+    owner = np.repeat(np.arange(m), lengths)
+    big = np.iinfo(np.intp).max
+
+    win_speed = speed[flat]
+    min_speed = np.minimum.reduceat(win_speed, offsets)
+    min_pos = np.minimum.reduceat(np.where(win_speed == min_speed[owner], flat, big), offsets)
+    min_pos = np.where(min_pos == big, s, min_pos)
+
+    if brake is not None:
+        braking = (brake[flat] >= 0.5) & (flat <= a[owner])
+        first_brake = np.minimum.reduceat(np.where(braking, flat, big), offsets)
+        braking_distance = np.where(first_brake == big, 0.0, dist[a] - dist[np.minimum(first_brake, a)])
+        mean_brake = np.add.reduceat(brake[flat], offsets) / lengths
+    else:
+        braking_distance = mean_brake = nan
+
+    if throttle is not None:
+        on = (throttle[flat] >= throttle_on_pct) & (flat >= a[owner])
+        first_on = np.minimum.reduceat(np.where(on, flat, big), offsets)
+        d_throttle_on = np.where(first_on == big, np.nan, dist[np.minimum(first_on, e)])
+        mean_throttle = np.add.reduceat(throttle[flat], offsets) / lengths
+    else:
+        d_throttle_on = mean_throttle = nan
+
+    return pd.DataFrame({
+        "Corner": np.arange(1, m + 1),
+        "d_start": dist[s],
+        "d_apex": dist[a],
+        "d_end": dist[e],
+        "EntrySpeed": speed[s],
+        "ApexSpeed": speed[a],
+        "ExitSpeed": speed[e],
+        "CornerTime": time_s[e] - time_s[s],
+        "MinSpeed": min_speed,
+        "d_min_speed": dist[min_pos],
+        "BrakingDistance": braking_distance,
+        "d_throttle_on": d_throttle_on,
+        "MeanThrottle": mean_throttle,
+        "MeanBrake": mean_brake,
+    })
 
 def per_corner_metrics(tel, corners):
-    rows = []
-    for idx, c in enumerate(corners, start=1):
-        s, a, e = c["start_idx"], c["apex_idx"], c["end_idx"]
-        entry_speed = float(tel["Speed"].iloc[s])
-        apex_speed = float(tel["Speed"].iloc[a])
-        exit_speed = float(tel["Speed"].iloc[e])
-        t_start = float(tel["Time_s"].iloc[s])
-        t_end = float(tel["Time_s"].iloc[e])
-        dt = t_end - t_start
-        rows.append({
-            "Corner": idx,
-            "d_start": float(tel["Distance"].iloc[s]),
-            "d_apex": float(tel["Distance"].iloc[a]),
-            "d_end": float(tel["Distance"].iloc[e]),
-            "EntrySpeed": entry_speed,
-            "ApexSpeed": apex_speed,
-            "ExitSpeed": exit_speed,
-            "CornerTime": dt
-        })
-    return pd.DataFrame(rows)
-
-def align_corners_by_distance(corners_A, tel_A, corners_B, tel_B, tol_m=25.0):
+    start_idx = [c["start_idx"] for c in corners]
+    apex_idx = [c["apex_idx"] for c in corners]
+    end_idx = [c["end_idx"] for c in corners]
+    return corner_metrics_from_indices(tel, start_idx, apex_idx, end_idx)
+
+def apex_distances(corners, tel):
+    apex_idx = np.fromiter((c["apex_idx"] for c in corners), dtype=np.intp, count=len(corners))
+    return np.asarray(tel["Distance"], dtype=float)[apex_idx]
+
+def _candidate_pairs(dA, dB, tol_m):
+    # every (i, j) with |dA[i] - dB[j]| <= tol_m, found by sorted search on B
+    order_B = np.argsort(dB, kind="stable")
+    sorted_B = dB[order_B]
+    lo = np.searchsorted(sorted_B, dA - tol_m, side="left")
+    hi = np.searchsorted(sorted_B, dA + tol_m, side="right")
+    counts = np.maximum(hi - lo, 0)
+    ia = np.repeat(np.arange(len(dA)), counts)
+    offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    jb = order_B[np.repeat(lo - offsets, counts) + np.arange(int(counts.sum()))]
+    diff = np.abs(dA[ia] - dB[jb])
+    keep = diff <= tol_m
+    return ia[keep], jb[keep], diff[keep]
+
+def _match_greedy(dA, dB, tol_m):
+    # closest pairs first, so the result does not depend on corner order
+    ia, jb, diff = _candidate_pairs(dA, dB, tol_m)
+    order = np.lexsort((jb, ia, diff))
+    used_A, used_B = set(), set()
+    matches = []
+    for i, j in zip(ia[order].tolist(), jb[order].tolist()):
+        if i in used_A or j in used_B:
+            continue
+        used_A.add(i)
+        used_B.add(j)
+        matches.append((i, j))
+    return sorted(matches)
+
+def _match_optimal(dA, dB, tol_m):
+    # Most matches, then least total apex offset. With |dA - dB| costs an optimal
+    # matching never crosses, so a DP over both apex orders is exact.
+    order_A = np.argsort(dA, kind="stable").tolist()
+    order_B = np.argsort(dB, kind="stable").tolist()
+    nA, nB = len(order_A), len(order_B)
+    # best[i][j] = (matches, -cost) using the first i sorted A and first j sorted B
+    best = [[(0, 0.0)] * (nB + 1) for _ in range(nA + 1)]
+    for i in range(1, nA + 1):
+        a = float(dA[order_A[i - 1]])
+        for j in range(1, nB + 1):
+            cand = max(best[i - 1][j], best[i][j - 1])
+            diff = abs(a - float(dB[order_B[j - 1]]))
+            if diff <= tol_m:
+                m, c = best[i - 1][j - 1]
+                cand = max(cand, (m + 1, c - diff))
+            best[i][j] = cand
+    matches = []
+    i, j = nA, nB
+    while i > 0 and j > 0:
+        if best[i][j] == best[i - 1][j]:
+            i -= 1
+        elif best[i][j] == best[i][j - 1]:
+            j -= 1
+        else:
+            matches.append((order_A[i - 1], order_B[j - 1]))
+            i -= 1
+            j -= 1
+    return sorted(matches)
+
+_MATCHERS = {"greedy": _match_greedy, "optimal": _match_optimal}
+
+def match_apexes(dA, dB, tol_m=25.0, method="greedy"):
+    """
+    Match two sets of apex distances within tol_m meters.
+    method="greedy" takes the closest remaining pair first; method="optimal"
+    maximises the number of matches and then minimises the summed offset.
+    Returns a sorted list of (indexA, indexB) tuples.
+    """
+    if method not in _MATCHERS:
+        raise ValueError(f"Unknown matching method {method!r}; expected one of {sorted(_MATCHERS)}")
+    dA = np.asarray(dA, dtype=float)
+    dB = np.asarray(dB, dtype=float)
+    if not len(dA) or not len(dB):
+        return []
+    return _MATCHERS[method](dA, dB, tol_m)
+
+def align_corners_by_distance(corners_A, tel_A, corners_B, tel_B, tol_m=25.0, method="greedy"):
     """
     Match corners A to B by apex distance proximity within tol_m meters.
     Returns list of tuples (cornerA, cornerB) as indices.
     """
-    matches = []
-    A_apex = [(i, tel_A["Distance"].iloc[c["apex_idx"]]) for i, c in enumerate(corners_A)]
-    B_apex = [(j, tel_B["Distance"].iloc[c["apex_idx"]]) for j, c in enumerate(corners_B)]
-    used_B = set()
-    for i, dA in A_apex:
-        best = None
-        best_diff = 1e9
-        for j, dB in B_apex:
-            if j in used_B:
-                continue
-            diff = abs(dA - dB)
-            if diff < best_diff and diff <= tol_m:
-                best = j
-                best_diff = diff
-        if best is not None:
-            used_B.add(best)
-            matches.append((i, best))
-    return matches
-
-def plot_speed_with_corners(tel_A, tel_B, corners_A, corners_B, drvA, drvB, title):
-    fig, ax = plt.subplots(figsize=(12, 6))
-    ax.plot(tel_A["Distance"], tel_A["Speed"], label=f"{drvA} Speed")
-    ax.plot(tel_B["Distance"], tel_B["Speed"], label=f"{drvB} Speed", alpha=0.9)
-
-    # Shade A corners
-    for c in corners_A:
-        s = tel_A["Distance"].iloc[c["start_idx"]]
-        e = tel_A["Distance"].iloc[c["end_idx"]]
-        ax.axvspan(s, e, alpha=0.15)
-
-    ax.set_xlabel("Distance [m]")
-    ax.set_ylabel("Speed [km/h]")
-    ax.set_title(title)
-    ax.grid(True, alpha=0.3)
-    ax.legend()
-    plt.tight_layout()
-    return fig
-
-def plot_corner_deltas(dfA, dfB, matches, drvA, drvB):
-    # Build time delta per matched corner: positive means A slower than B in that corner
-    rows = []
-    for ia, ib in matches:
-        cnum = dfA.loc[ia, "Corner"]
-        dt = dfA.loc[ia, "CornerTime"] - dfB.loc[ib, "CornerTime"]
-        rows.append((cnum, dt))
-    if not rows:
-        return None
-    rows.sort(key=lambda x: x[0])
-    C = [r[0] for r in rows]
-    DT = [r[1] for r in rows]
-    fig, ax = plt.subplots(figsize=(12, 4))
-    ax.bar(C, DT)
-    ax.set_xlabel("Corner index")
-    ax.set_ylabel(f"Time delta {drvA}-{drvB} [s]")
-    ax.axhline(0.0, linewidth=1)
-    ax.set_title("Per-corner time delta - positive means first driver is slower")
-    ax.grid(True, axis="y", alpha=0.3)
-    plt.tight_layout()
-    return fig
+    return match_apexes(apex_distances(corners_A, tel_A), apex_distances(corners_B, tel_B), tol_m, method)
+
+def align_laps_to_reference(lap_apexes, reference=0, tol_m=25.0, method="greedy"):
+    """
+    Align the corners of many laps to one reference lap in a single call.
+    lap_apexes is a sequence of apex-distance arrays, one per lap.
+    Returns an int array of shape (n_reference_corners, n_laps) whose entry
+    [c, k] is the corner of lap k matched to reference corner c, or -1.
+    """
+    ref = np.asarray(lap_apexes[reference], dtype=float)
+    out = np.full((len(ref), len(lap_apexes)), -1, dtype=np.intp)
+    for k, apexes in enumerate(lap_apexes):
+        if k == reference:
+            out[:, k] = np.arange(len(ref))
+            continue
+        for c, j in match_apexes(ref, apexes, tol_m, method):
+            out[c, k] = j
+    return out
+
+# ---------- Track corner index ----------
+class CornerIndex(NamedTuple):
+    start: np.ndarray    # consensus corner start distance [m], one entry per corner
+    apex: np.ndarray
+    end: np.ndarray
+    support: np.ndarray  # fraction of source laps in which the corner was detected
+
+def build_corner_index(lap_windows, tol_m=25.0, min_support=0.5):
+    """
+    Build a circuit's canonical corner list from many laps.
+    lap_windows is a sequence of (d_start, d_apex, d_end) arrays, one per lap
+    (e.g. the d_* columns of per_corner_metrics). Apexes from all laps are
+    pooled and split into clusters wherever consecutive apexes are more than
+    tol_m apart; clusters seen in at least min_support of the laps become
+    corners with the median start/apex/end of their members. Corners are
+    numbered by position, so corner k is index[k - 1] for every lap.
+    """
+    windows = [np.asarray(w, dtype=float).reshape(-1, 3) for w in lap_windows]
+    n_laps = len(windows)
+    empty = np.empty(0)
+    if n_laps == 0:
+        return CornerIndex(empty, empty, empty, empty)
+    pooled = np.concatenate(windows)
+    lap_id = np.repeat(np.arange(n_laps), [len(w) for w in windows])
+    if not len(pooled):
+        return CornerIndex(empty, empty, empty, empty)
+
+    order = np.argsort(pooled[:, 1], kind="stable")
+    pooled, lap_id = pooled[order], lap_id[order]
+    cluster = np.concatenate(([0], np.cumsum(np.diff(pooled[:, 1]) > tol_m)))
+
+    start, apex, end, support = [], [], [], []
+    bounds = np.flatnonzero(np.diff(cluster)) + 1
+    for members, laps in zip(np.split(pooled, bounds), np.split(lap_id, bounds)):
+        share = len(np.unique(laps)) / n_laps
+        if share < min_support:
+            continue
+        s, a, e = np.median(members, axis=0)
+        start.append(s)
+        apex.append(a)
+        end.append(e)
+        support.append(share)
+
+    start, apex, end = np.array(start), np.array(apex), np.array(end)
+    # detect_corners never overlaps windows; keep consensus windows disjoint too
+    if len(start) > 1:
+        start[1:] = np.maximum(start[1:], end[:-1])
+        start = np.minimum(start, apex)
+    return CornerIndex(start, apex, end, np.array(support))
+
+def segment_by_corner_index(distance, index, speed=None):
+    """
+    Segment a resampled lap with a CornerIndex instead of detect_corners.
+    Window boundaries are located with np.searchsorted on the lap's Distance;
+    when speed is given the apex is the minimum speed inside each window,
+    otherwise the sample at the index's apex distance. Corners that fall
+    outside the lap's distance range are dropped.
+    Returns (corner_numbers, start_idx, apex_idx, end_idx) as int arrays.
+    """
+    d = np.asarray(distance, dtype=float)
+    none = np.empty(0, dtype=np.intp)
+    if len(d) < 2 or not len(index.apex):
+        return none, none, none, none
+    last = len(d) - 1
+    s = np.searchsorted(d, index.start, side="left")
+    e = np.searchsorted(d, index.end, side="right") - 1
+    keep = (index.start >= d[0]) & (index.end <= d[-1]) & (e > s)
+    numbers = np.flatnonzero(keep) + 1
+    s, e = s[keep], e[keep]
+    if speed is None:
+        a = np.clip(np.searchsorted(d, index.apex[keep]), s, e)
+    elif len(s):
+        sp = np.asarray(speed, dtype=float)
+        flat, offsets, lengths = _segment_positions(s, e)
+        win = sp[flat]
+        lowest = np.minimum.reduceat(win, offsets)
+        owner = np.repeat(np.arange(len(s)), lengths)
+        a = np.minimum.reduceat(np.where(win == lowest[owner], flat, last + 1), offsets)
+        a = np.where(a > last, s, a)
+    else:
+        a = none
+    return numbers, s.astype(np.intp), np.asarray(a, dtype=np.intp), e.astype(np.intp)
+
+def corner_metrics_by_index(tel, index, throttle_on_pct=10.0):
+    """corner_metrics_from_indices for a lap segmented by a CornerIndex; Corner holds the track corner number."""
+    numbers, s, a, e = segment_by_corner_index(_channel(tel, "Distance"), index, _channel(tel, "Speed"))
+    metrics = corner_metrics_from_indices(tel, s, a, e, throttle_on_pct=throttle_on_pct)
+    metrics["Corner"] = numbers
+    return metrics
+
+# ---------- Multi-driver comparison ----------
+def parse_lap_selection(text):
+    """Validate a --laps value; returns the k of "top-k", or the text for "fastest"/"all"."""
+    if text in ("fastest", "all"):
+        return text
+    prefix, _, k = text.partition("-")
+    if prefix != "top" or not k.isdigit() or int(k) < 1:
+        raise ValueError(f"--laps must be 'fastest', 'all' or 'top-k' (e.g. top-3), not {text!r}")
+    return int(k)
+
+def get_driver_laps(session, driver_code, laps="fastest"):
+    """
+    The driver's laps to compare. laps is "fastest" (the single fastest lap),
+    "all" (every valid lap) or "top-k", e.g. "top-3" (the k fastest valid
+    laps). Valid laps are those of clean_laps. Returns a list of Lap rows,
+    fastest first.
+    """
+    if laps == "fastest":
+        count = 1
+    elif laps == "all":
+        count = None
+    else:
+        count = parse_lap_selection(laps)
+    return [lap for _, lap in fastest_clean_laps(session.laps, driver_code, count).iterrows()]
+
+class LapComparison(NamedTuple):
+    corners: pd.DataFrame  # reference corners: Corner, d_apex, CornerTime
+    times: np.ndarray      # (n_corners, n_laps) corner time of every lap, NaN where unmatched
+    stats: pd.DataFrame    # one row per (Corner, Driver): Laps, Best, Median, Consistency, DeltaBest, DeltaMedian
+    deltas: pd.DataFrame   # corners x drivers: best corner time minus the reference driver's best
+
+def compare_laps(tel_dfs, drivers, reference=0, step=2.0, tol_m=25.0, method="greedy"):
+    """
+    Corner-by-corner comparison of laps; drivers names each lap's driver.
+    Lap `reference` numbers the corners and its driver is the delta baseline;
+    every lap is aligned to it only, so cost is linear in the number of laps.
+    """
+    drivers = list(drivers)
+    batch = resample_laps_to_common_distance(tel_dfs, step=step)
+    if "Speed" in batch.channels:
+        lap_corners = detect_corners_batch(batch.data[:, batch.channels.index("Speed")], batch.valid)
+    else:
+        lap_corners = [[] for _ in drivers]
+    apexes, corner_times = [], []
+    for k in range(len(drivers)):
+        valid = batch.valid[k]
+        tel = {"Distance": batch.grid[valid]}
+        for c, col in enumerate(batch.channels):
+            tel[col] = batch.data[k, c, valid].astype(float)
+        metrics = per_corner_metrics(tel, lap_corners[k])
+        apexes.append(metrics["d_apex"].to_numpy(dtype=float))
+        corner_times.append(metrics["CornerTime"].to_numpy(dtype=float))
+
+    aligned = align_laps_to_reference(apexes, reference=reference, tol_m=tol_m, method=method)
+    times = np.full(aligned.shape, np.nan)
+    for k in range(len(drivers)):
+        hit = aligned[:, k] >= 0
+        times[hit, k] = corner_times[k][aligned[hit, k]]
+
+    codes = list(dict.fromkeys(drivers))
+    lap_driver = np.asarray(drivers, dtype=object)
+    n_corners = len(aligned)
+    best = np.full((n_corners, len(codes)), np.nan)
+    median = np.full_like(best, np.nan)
+    spread = np.full_like(best, np.nan)
+    count = np.zeros(best.shape, dtype=int)
+    for j, code in enumerate(codes):
+        own = times[:, lap_driver == code]
+        count[:, j] = np.count_nonzero(~np.isnan(own), axis=1)
+        seen = count[:, j] > 0
+        best[seen, j] = np.nanmin(own[seen], axis=1)
+        median[seen, j] = np.nanmedian(own[seen], axis=1)
+        spread[seen, j] = np.nanstd(own[seen], axis=1)
+
+    ref = codes.index(drivers[reference])
+    corner_numbers = np.arange(1, n_corners + 1)
+    stats = pd.DataFrame({
+        "Corner": np.repeat(corner_numbers, len(codes)),
+        "Driver": np.tile(np.asarray(codes, dtype=object), n_corners),
+        "Laps": count.ravel(),
+        "Best": best.ravel(),
+        "Median": median.ravel(),
+        "Consistency": spread.ravel(),
+        "DeltaBest": (best - best[:, [ref]]).ravel(),
+        "DeltaMedian": (median - median[:, [ref]]).ravel(),
+    })
+    deltas = pd.DataFrame(
+        best - best[:, [ref]],
+        index=pd.Index(corner_numbers, name="Corner"),
+        columns=pd.Index(codes, name="Driver"),
+    )
+    corners = pd.DataFrame({
+        "Corner": corner_numbers,
+        "d_apex": apexes[reference],
+        "CornerTime": corner_times[reference],
+    })
+    return LapComparison(corners=corners, times=times, stats=stats, deltas=deltas)
+
+_PLOT_FUNCTIONS = ("plot_speed_with_corners", "plot_corner_deltas", "plot_delta_matrix")
+
+def __getattr__(name):
+    # plotting moved to f1_corners_plots; keep f1_corners.plot_* working
+    if name in _PLOT_FUNCTIONS:
+        import f1_corners_plots
+        return getattr(f1_corners_plots, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # ---------- Main ----------
+def open_reference_pack(path, step):
+    """load_reference_pack, or None when the pack's grid step is not step (the laps would not match)."""
+    pack = load_reference_pack(path)
+    if not np.isclose(pack.step, step):
+        print(f"Reference pack {path} is on a {pack.step:g} m grid, not --dist_step {step:g}; loading the session.")
+        return None
+    return pack
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--year", type=int, default=2024)
@@ -194,22 +779,63 @@ def main():
     parser.add_argument("--drvB", type=str, default="NOR")
     parser.add_argument("--dist_step", type=float, default=2.0)
     parser.add_argument("--tol_m", type=float, default=25.0)
+    parser.add_argument("--lap_cache", type=str, default="cache/resampled")
+    parser.add_argument("--lap_cache_mb", type=float, default=512.0)
+    parser.add_argument("--no_lap_cache", action="store_true")
+    # precomputed pack (bulk_fetch_fastf1_data.py --reference): fastest laps without loading the session
+    parser.add_argument("--reference_pack", type=str, default=None)
+    # N-driver mode: e.g. --drivers VER NOR LEC --laps top-3 (first driver is the reference)
+    parser.add_argument("--drivers", type=str, nargs="+", default=None)
+    parser.add_argument("--laps", type=str, default="fastest")   # fastest, all, top-k
     args = parser.parse_args()
 
-    enable_cache("cache")
+    if args.drivers:
+        try:
+            parse_lap_selection(args.laps)
+        except ValueError as exc:
+            parser.error(str(exc))
+        return compare_drivers(args)
 
-    session = fastf1.get_session(args.year, args.gp, args.session)
-    session.load()
+    pack = open_reference_pack(args.reference_pack, args.dist_step) if args.reference_pack else None
+    lap_cache = None
+    if not args.no_lap_cache:
+        lap_cache = ResampledLapCache(
+            args.lap_cache, max_bytes=int(args.lap_cache_mb * 1024 * 1024), version=RESAMPLE_VERSION
+        )
 
-    lapA = get_fastest_lap(session, args.drvA)
-    lapB = get_fastest_lap(session, args.drvB)
+    # resampled fastest laps, straight from the reference pack or lap cache when possible
+    drivers = [args.drvA, args.drvB]
+    resampled = {}
+    for drv in drivers:
+        if pack is not None and drv in pack:
+            resampled[drv] = pack.lap(drv)
+        elif lap_cache is not None:
+            lap_number = lap_cache.lap_alias(args.year, args.gp, args.session, drv, FASTEST_LAP_ALIAS)
+            if lap_number is not None:
+                resampled[drv] = lap_cache.get(args.year, args.gp, args.session, drv, lap_number, args.dist_step)
 
-    telA = with_distance(lapA.get_car_data())
-    telB = with_distance(lapB.get_car_data())
+    missing = [drv for drv in drivers if resampled.get(drv) is None]
+    if missing:
+        import fastf1
+        enable_cache("cache")
 
-    # resample to uniform distance grids
-    telA_u = resample_to_common_distance(telA, step=args.dist_step)
-    telB_u = resample_to_common_distance(telB, step=args.dist_step)
+        session = fastf1.get_session(args.year, args.gp, args.session)
+        session.load()
+
+        for drv in missing:
+            lap = get_fastest_lap(session, drv)
+            if lap is None:
+                raise SystemExit(f"No valid laps for {drv}.")
+            tel = with_distance(lap.get_car_data())
+            # resample to uniform distance grids
+            resampled[drv] = resample_to_common_distance(tel, step=args.dist_step)
+            if lap_cache is not None:
+                lap_number = int(lap["LapNumber"])
+                lap_cache.put(args.year, args.gp, args.session, drv, lap_number, args.dist_step, resampled[drv])
+                lap_cache.put_lap_alias(args.year, args.gp, args.session, drv, lap_number, FASTEST_LAP_ALIAS)
+
+    telA_u = resampled[args.drvA]
+    telB_u = resampled[args.drvB]
 
     # corner detection
     corners_A = detect_corners(telA_u["Speed"], telA_u["Distance"])
@@ -223,6 +849,8 @@ def main():
     matches = align_corners_by_distance(corners_A, telA_u, corners_B, telB_u, tol_m=args.tol_m)
 
     # plots
+    from f1_corners_plots import plot_corner_deltas, plot_speed_with_corners
+    import matplotlib.pyplot as plt
     title = f"{args.year} {args.gp} {args.session} - {args.drvA} vs {args.drvB}"
     fig1 = plot_speed_with_corners(telA_u, telB_u, corners_A, corners_B, args.drvA, args.drvB, title)
     fig2 = plot_corner_deltas(dfA, dfB, matches, args.drvA, args.drvB)
@@ -248,5 +876,53 @@ def main():
     else:
         print("No matched corners within tolerance. Try increasing --tol_m.")
 
+def compare_drivers(args):
+    drivers = [d.upper() for d in args.drivers]
+    pack = open_reference_pack(args.reference_pack, args.dist_step) if args.reference_pack else None
+    session = None
+    if pack is None or args.laps != "fastest" or any(drv not in pack for drv in drivers):
+        import fastf1
+        enable_cache("cache")
+
+        session = fastf1.get_session(args.year, args.gp, args.session)
+        session.load()
+
+    tel_dfs, lap_drivers = [], []
+    for drv in drivers:
+        if session is None:
+            tel_dfs.append(pack.lap(drv))
+            lap_drivers.append(drv)
+            continue
+        laps = get_driver_laps(session, drv, args.laps)
+        if not laps:
+            print(f"No valid laps for {drv}, skipping.")
+            continue
+        for lap in laps:
+            tel_dfs.append(with_distance(lap.get_car_data()))
+            lap_drivers.append(drv)
+    if drivers[0] not in lap_drivers:
+        print(f"No valid laps for reference driver {drivers[0]}.")
+        return
+
+    # reference: the first driver's fastest selected lap (laps come fastest first)
+    result = compare_laps(tel_dfs, lap_drivers, reference=0, step=args.dist_step, tol_m=args.tol_m)
+
+    from f1_corners_plots import plot_delta_matrix
+    import matplotlib.pyplot as plt
+    title = f"{args.year} {args.gp} {args.session} - corner time vs {drivers[0]} ({args.laps} laps)"
+    fig = plot_delta_matrix(result.deltas, title)
+    plt.show()
+
+    print(f"\n{len(tel_dfs)} laps, {len(result.corners)} reference corners.")
+    print(f"\nBest corner time delta vs {drivers[0]} [s]:")
+    print(result.deltas.round(3).to_string())
+    if len(tel_dfs) > len(set(lap_drivers)):
+        median = result.stats.pivot(index="Corner", columns="Driver", values="DeltaMedian")[result.deltas.columns]
+        consistency = result.stats.pivot(index="Corner", columns="Driver", values="Consistency")[result.deltas.columns]
+        print(f"\nMedian corner time delta vs {drivers[0]} [s]:")
+        print(median.round(3).to_string())
+        print("\nConsistency (std of corner time over laps) [s]:")
+        print(consistency.round(3).to_string())
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,61 @@
+import numpy as np
+import matplotlib.pyplot as plt
+
+def plot_speed_with_corners(tel_A, tel_B, corners_A, corners_B, drvA, drvB, title):
+    fig, ax = plt.subplots(figsize=(12, 6))
+    ax.plot(tel_A["Distance"], tel_A["Speed"], label=f"{drvA} Speed")
+    ax.plot(tel_B["Distance"], tel_B["Speed"], label=f"{drvB} Speed", alpha=0.9)
+
+    # Shade A corners
+    for c in corners_A:
+        s = tel_A["Distance"].iloc[c["start_idx"]]
+        e = tel_A["Distance"].iloc[c["end_idx"]]
+        ax.axvspan(s, e, alpha=0.15)
+
+    ax.set_xlabel("Distance [m]")
+    ax.set_ylabel("Speed [km/h]")
+    ax.set_title(title)
+    ax.grid(True, alpha=0.3)
+    ax.legend()
+    plt.tight_layout()
+    return fig
+
+def plot_corner_deltas(dfA, dfB, matches, drvA, drvB):
+    # Build time delta per matched corner: positive means A slower than B in that corner
+    rows = []
+    for ia, ib in matches:
+        cnum = dfA.loc[ia, "Corner"]
+        dt = dfA.loc[ia, "CornerTime"] - dfB.loc[ib, "CornerTime"]
+        rows.append((cnum, dt))
+    if not rows:
+        return None
+    rows.sort(key=lambda x: x[0])
+    C = [r[0] for r in rows]
+    DT = [r[1] for r in rows]
+    fig, ax = plt.subplots(figsize=(12, 4))
+    ax.bar(C, DT)
+    ax.set_xlabel("Corner index")
+    ax.set_ylabel(f"Time delta {drvA}-{drvB} [s]")
+    ax.axhline(0.0, linewidth=1)
+    ax.set_title("Per-corner time delta - positive means first driver is slower")
+    ax.grid(True, axis="y", alpha=0.3)
+    plt.tight_layout()
+    return fig
+
+def plot_delta_matrix(deltas, title):
+    # corners x drivers heatmap: red means slower than the reference driver in that corner
+    fig, ax = plt.subplots(figsize=(max(6, 0.6 * deltas.shape[1] + 2), max(4, 0.35 * deltas.shape[0] + 1.5)))
+    values = deltas.to_numpy(dtype=float)
+    finite = values[~np.isnan(values)]
+    limit = float(np.abs(finite).max()) if finite.size else 1.0
+    im = ax.imshow(values, cmap="RdBu_r", vmin=-limit, vmax=limit, aspect="auto")
+    ax.set_xticks(range(deltas.shape[1]))
+    ax.set_xticklabels(deltas.columns)
+    ax.set_yticks(range(deltas.shape[0]))
+    ax.set_yticklabels(deltas.index)
+    ax.set_xlabel("Driver")
+    ax.set_ylabel("Corner")
+    ax.set_title(title)
+    fig.colorbar(im, ax=ax, label="Time delta [s]")
+    plt.tight_layout()
+    return fig
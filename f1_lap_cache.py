@@ -0,0 +1,96 @@
+import json
+import os
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+class ResampledLapCache:
+    """
+    On-disk cache of resampled lap telemetry, one memory-mapped .npy per lap.
+
+    Entries are keyed by year/GP/session/driver/lap number/dist_step plus a
+    version tag, so bumping the version of the resampling code makes old
+    entries unreachable; they are removed on the next eviction pass. Lap picks
+    such as "fastest" are stored per session as aliases for lap numbers
+    (lap_alias / put_lap_alias), so a hit needs no session load. The directory
+    is kept under max_bytes by evicting the least recently used files (a hit
+    refreshes the file's mtime).
+    """
+
+    def __init__(self, root="cache/resampled", max_bytes=512 * 1024 * 1024, version=1):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.version = version
+
+    def _name(self, *parts):
+        return "_".join(re.sub(r"[^A-Za-z0-9.-]+", "-", str(p)) for p in parts)
+
+    def _path(self, year, gp, session, driver, lap, step):
+        name = self._name(year, gp, session, driver, int(lap), f"{float(step):g}m")
+        return self.root / f"{name}.v{self.version}.npy"
+
+    def _alias_path(self, year, gp, session):
+        return self.root / f"{self._name(year, gp, session)}.laps.v{self.version}.json"
+
+    def _aliases(self, year, gp, session):
+        try:
+            return json.loads(self._alias_path(year, gp, session).read_text())
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def lap_alias(self, year, gp, session, driver, pick="fastest"):
+        """The lap number last stored for the driver's pick, or None."""
+        return self._aliases(year, gp, session).get(pick, {}).get(str(driver))
+
+    def put_lap_alias(self, year, gp, session, driver, lap, pick="fastest"):
+        self.root.mkdir(parents=True, exist_ok=True)
+        aliases = self._aliases(year, gp, session)
+        aliases.setdefault(pick, {})[str(driver)] = int(lap)
+        path = self._alias_path(year, gp, session)
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(json.dumps(aliases, sort_keys=True))
+        os.replace(tmp_path, path)
+
+    def get(self, year, gp, session, driver, lap, step):
+        """The cached lap as a frame whose columns are read-only views of the memory-mapped file."""
+        path = self._path(year, gp, session, driver, lap, step)
+        try:
+            records = np.load(path, mmap_mode="r")
+        except (FileNotFoundError, ValueError):
+            return None
+        os.utime(path)
+        return pd.DataFrame({name: records[name] for name in records.dtype.names}, copy=False)
+
+    def put(self, year, gp, session, driver, lap, step, tel_u):
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self._path(year, gp, session, driver, lap, step)
+        records = tel_u.to_records(index=False)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as fh:
+            np.save(fh, records)
+        os.replace(tmp_path, path)
+        self.evict()
+        return path
+
+    def evict(self):
+        entries = []
+        total = 0
+        for path in self.root.glob("*.laps.v*.json"):
+            if not path.name.endswith(f".v{self.version}.json"):
+                path.unlink(missing_ok=True)
+        current = f".v{self.version}.npy"
+        for path in self.root.glob("*.npy"):
+            if not path.name.endswith(current):
+                path.unlink(missing_ok=True)
+                continue
+            stat = path.stat()
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+            total += stat.st_size
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
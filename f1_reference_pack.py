@@ -0,0 +1,132 @@
+import json
+import os
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Bump when the file layout changes; older packs are then rejected on load.
+PACK_VERSION = 1
+PACK_DATA = "reference.npy"
+PACK_META = "reference.json"
+
+_REDUCERS = {"min": np.nanmin, "median": np.nanmedian, "mean": np.nanmean}
+
+
+class ReferencePack:
+    """
+    Every driver's reference lap in a session, resampled onto one distance grid.
+
+    data is a (drivers, channels, grid) float32 array, NaN past the end of a
+    driver's lap; points[i] is how many grid points driver i's lap covers
+    (always a prefix of the grid). Written as reference.npy plus a
+    reference.json sidecar naming the axes; load_reference_pack memory-maps
+    the array, so comparisons below are a slice and a subtract.
+    """
+
+    def __init__(self, drivers, channels, step, data, points=None, laps=None, meta=None):
+        self.drivers = list(drivers)
+        self.channels = list(channels)
+        self.step = float(step)
+        self.data = data
+        if points is None:
+            points = [int(np.count_nonzero(~np.isnan(data[i, 0]))) for i in range(len(self.drivers))]
+        self.points = [int(p) for p in points]
+        self.laps = list(laps) if laps is not None else [{} for _ in self.drivers]
+        self.meta = dict(meta or {})
+
+    @classmethod
+    def from_resampled(cls, drivers, resampled, step, laps=None, meta=None):
+        """Pack an f1_corners.ResampledLaps batch holding one lap per driver."""
+        return cls(drivers, resampled.channels, step, resampled.data, resampled.valid.sum(axis=1), laps, meta)
+
+    def __len__(self):
+        return len(self.drivers)
+
+    def __contains__(self, driver):
+        return driver in self.drivers
+
+    @property
+    def grid(self):
+        return np.arange(self.data.shape[2]) * self.step
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes
+
+    def index(self, driver):
+        try:
+            return self.drivers.index(driver)
+        except ValueError:
+            raise KeyError(f"{driver} has no lap in this reference pack") from None
+
+    def channel(self, name):
+        """(drivers, grid) view of one channel."""
+        return self.data[:, self.channels.index(name)]
+
+    def trace(self, driver, channel="Speed"):
+        return self.data[self.index(driver), self.channels.index(channel)]
+
+    def lap(self, driver):
+        """The driver's lap as a resampled telemetry frame (Distance plus every channel), like resample_to_common_distance."""
+        i = self.index(driver)
+        n = self.points[i]
+        out = pd.DataFrame({"Distance": self.grid[:n]})
+        for c, name in enumerate(self.channels):
+            out[name] = self.data[i, c, :n].astype(float)
+        return out
+
+    def delta(self, driver, other, channel="Time_s"):
+        """driver minus other at every grid point; NaN where either lap has ended."""
+        return self.trace(driver, channel) - self.trace(other, channel)
+
+    def field_delta(self, driver, channel="Time_s", reduce="min"):
+        """driver minus the rest of the field reduced per grid point ("min": fastest Time_s, "median", "mean")."""
+        i = self.index(driver)
+        values = self.channel(channel)
+        others = np.delete(np.arange(len(self.drivers)), i)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)  # grid points past every other lap's end
+            field = _REDUCERS[reduce](values[others], axis=0)
+        return values[i] - field
+
+
+def write_reference_pack(directory, pack):
+    """Write reference.npy and its sidecar, each via a temp file renamed into place (array first)."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    data_path = directory / PACK_DATA
+    meta_path = directory / PACK_META
+    tmp_path = data_path.with_name(data_path.name + ".tmp")
+    with open(tmp_path, "wb") as fh:
+        np.save(fh, np.ascontiguousarray(pack.data, dtype=np.float32))
+    os.replace(tmp_path, data_path)
+    sidecar = {
+        "version": PACK_VERSION,
+        "shape": list(pack.data.shape),
+        "step": pack.step,
+        "drivers": pack.drivers,
+        "channels": pack.channels,
+        "points": pack.points,
+        "laps": pack.laps,
+        "meta": pack.meta,
+    }
+    tmp_path = meta_path.with_name(meta_path.name + ".tmp")
+    tmp_path.write_text(json.dumps(sidecar, separators=(",", ":")))
+    os.replace(tmp_path, meta_path)
+    return data_path
+
+
+def load_reference_pack(directory, mmap=True):
+    """Open a pack written by write_reference_pack; the array is memory-mapped unless mmap is False."""
+    directory = Path(directory)
+    sidecar = json.loads((directory / PACK_META).read_text())
+    if sidecar.get("version") != PACK_VERSION:
+        raise ValueError(f"{directory} holds a version {sidecar.get('version')} reference pack, expected {PACK_VERSION}")
+    data = np.load(directory / PACK_DATA, mmap_mode="r" if mmap else None)
+    if list(data.shape) != sidecar["shape"]:
+        raise ValueError(f"{directory / PACK_DATA} does not match its sidecar (shape {data.shape})")
+    return ReferencePack(
+        sidecar["drivers"], sidecar["channels"], sidecar["step"], data, sidecar["points"], sidecar["laps"], sidecar["meta"]
+    )
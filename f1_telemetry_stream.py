@@ -0,0 +1,169 @@
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import (
+    is_numeric_dtype,
+    is_datetime64_any_dtype,
+    is_timedelta64_dtype,
+)
+
+# Columns that are time stamps or derived here, never interpolated as channels.
+_SKIP_COLUMNS = {"Date", "SessionTime", "Time", "Distance"}
+
+
+class LapWindow(NamedTuple):
+    driver: str
+    lap_number: int
+    start_s: float   # session time of the lap start [s]
+    end_s: float     # session time of the lap end [s]
+
+
+class StreamedLap(NamedTuple):
+    driver: str
+    lap_number: int
+    tel: pd.DataFrame  # resampled lap, same columns as resample_to_common_distance
+
+
+def lap_windows(laps_df, driver):
+    """Lap start/end session times of one driver from a FastF1 Laps frame, in session order."""
+    laps = laps_df[laps_df["Driver"] == driver]
+    start = pd.to_timedelta(laps["LapStartTime"]).dt.total_seconds().to_numpy()
+    end = pd.to_timedelta(laps["Time"]).dt.total_seconds().to_numpy()
+    number = laps["LapNumber"].to_numpy(dtype=float)
+    ok = ~(np.isnan(start) | np.isnan(end) | np.isnan(number)) & (end > start)
+    windows = [LapWindow(driver, int(n), float(s), float(e)) for n, s, e in zip(number[ok], start[ok], end[ok])]
+    return sorted(windows, key=lambda w: w.start_s)
+
+
+def iter_frame_chunks(df, chunk_rows=20000):
+    """Yield consecutive row slices of an in-memory frame (views, not copies)."""
+    for i in range(0, len(df), chunk_rows):
+        yield df.iloc[i:i + chunk_rows]
+
+
+def _telemetry_channels(chunk):
+    channels = []
+    for col in chunk.columns:
+        if col in _SKIP_COLUMNS:
+            continue
+        if is_datetime64_any_dtype(chunk[col]) or is_timedelta64_dtype(chunk[col]):
+            continue
+        if not is_numeric_dtype(chunk[col]):
+            continue
+        channels.append(col)
+    return channels
+
+
+def _chunk_arrays(chunk, channels):
+    t = pd.to_timedelta(chunk["SessionTime"]).dt.total_seconds().to_numpy()
+    return t, np.stack([chunk[col].to_numpy(dtype=float) for col in channels]) if channels else np.empty((0, len(t)))
+
+
+def iter_lap_samples(chunks, windows, channels=None):
+    """
+    Split a stream of car-data chunks (frames in SessionTime order) into laps.
+    Yields (window, t, vals, channels) per lap in windows, where t is the time
+    since the lap start [s] and vals is a (n_channels, n_samples) array. Rows are
+    assigned with np.searchsorted against the lap boundaries; only the rows of
+    the lap being assembled are buffered, so a chunk never needs the rest of the
+    session in memory. Samples outside every window are dropped.
+    """
+    windows = list(windows)
+    if not windows:
+        return
+    starts = np.array([w.start_s for w in windows])
+    ends = np.array([w.end_s for w in windows])
+    current = 0
+    buf_t: List[np.ndarray] = []
+    buf_v: List[np.ndarray] = []
+
+    def flush():
+        t = np.concatenate(buf_t) - starts[current] if buf_t else np.empty(0)
+        vals = np.concatenate(buf_v, axis=1) if buf_v else np.empty((len(channels), 0))
+        buf_t.clear()
+        buf_v.clear()
+        return windows[current], t, vals, channels
+
+    for chunk in chunks:
+        if channels is None:
+            channels = _telemetry_channels(chunk)
+        t, vals = _chunk_arrays(chunk, channels)
+        while current < len(windows):
+            lo = np.searchsorted(t, starts[current], side="left")
+            hi = np.searchsorted(t, ends[current], side="left")
+            if hi > lo:
+                # copy so the buffered lap does not pin the whole chunk
+                buf_t.append(t[lo:hi].copy())
+                buf_v.append(vals[:, lo:hi].copy())
+            if hi == len(t):
+                break  # the lap continues in the next chunk
+            yield flush()
+            current += 1
+    if current < len(windows) and buf_t:
+        yield flush()
+
+
+def integrate_distance(t, speed):
+    """Distance along the lap [m], the same integration as FastF1's add_distance."""
+    dt = np.empty(len(t))
+    if len(t):
+        dt[0] = t[0]
+        dt[1:] = np.diff(t)
+    return np.cumsum(speed / 3.6 * dt)
+
+
+def resample_lap(t, vals, channels, step=2.0):
+    """
+    resample_to_common_distance for one streamed lap given as arrays: Distance is
+    integrated from Speed, then every channel and Time_s are interpolated onto the
+    0 .. lap length grid.
+    """
+    d = integrate_distance(t, vals[channels.index("Speed")])
+    keep = ~np.isnan(d)
+    d, t, vals = d[keep], t[keep], vals[:, keep]
+    if len(d) and np.any(d[1:] < d[:-1]):
+        order = np.argsort(d, kind="stable")
+        d, t, vals = d[order], t[order], vals[:, order]
+    first_seen = np.ones(len(d), dtype=bool)
+    first_seen[1:] = d[1:] != d[:-1]
+    d, t, vals = d[first_seen], t[first_seen], vals[:, first_seen]
+
+    grid = np.arange(0.0, float(d[-1]) if len(d) else 0.0, step)
+    out = {"Distance": grid}
+    for c, col in enumerate(channels):
+        out[col] = np.interp(grid, d, vals[c])
+    out["Time_s"] = np.interp(grid, d, t)
+    return pd.DataFrame(out)
+
+
+def stream_resampled_laps(driver_chunks, laps_df, step=2.0):
+    """
+    Generator over (driver, chunks) pairs, e.g. from session_car_data_chunks.
+    Each driver's car data is read chunk by chunk, cut into laps with the
+    timing from laps_df, distance-integrated and resampled, and yielded as a
+    StreamedLap as soon as the lap is complete. Drivers are handled one after
+    another, so on top of the chunk source this holds one chunk plus one lap.
+    That is the whole footprint only when the chunks are read lazily; FastF1 has
+    no such reader (see session_car_data_chunks).
+    """
+    for driver, chunks in driver_chunks:
+        for window, t, vals, channels in iter_lap_samples(chunks, lap_windows(laps_df, driver)):
+            if len(t) < 2 or "Speed" not in channels:
+                continue
+            yield StreamedLap(window.driver, window.lap_number, resample_lap(t, vals, channels, step))
+
+
+def session_car_data_chunks(session, chunk_rows=20000, drivers=None) -> Iterator[Tuple[str, Iterable[pd.DataFrame]]]:
+    """
+    (driver code, chunk iterator) for every driver of a loaded FastF1 session.
+    The chunks are views of session.car_data, which FastF1 keeps in memory whole.
+    """
+    codes: Dict[str, str] = dict(
+        zip(session.laps["DriverNumber"].astype(str), session.laps["Driver"].astype(str))
+    )
+    for number, car_data in session.car_data.items():
+        code = codes.get(str(number))
+        if code is None or (drivers and code not in drivers):
+            continue
+        yield code, iter_frame_chunks(car_data, chunk_rows)
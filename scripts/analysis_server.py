@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Run the local analysis service that answers on-demand corner comparisons.
+
+Usage:
+  python scripts/analysis_server.py --port 8765
+  curl 'http://127.0.0.1:8765/sessions/2025/bahrain/Q/corners?drivers=VER,NOR'
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from pathlib import Path
+from typing import Sequence
+
+from fastf1_pipeline import PipelineConfig
+from fastf1_pipeline.server import run_server
+from fastf1_pipeline.sessions import SessionManager, calendar_order, fastf1_loader
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Serve corner comparisons from cached FastF1 sessions as JSON.")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind (default: localhost only).")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=2, help="Processes for resampling and corner analysis.")
+    parser.add_argument(
+        "--max-sessions",
+        type=int,
+        default=4,
+        help="Loaded FastF1 sessions kept in memory (each holds the full telemetry).",
+    )
+    parser.add_argument(
+        "--lap-cache-mb",
+        type=float,
+        default=256.0,
+        help="Memory budget for cached resampled laps.",
+    )
+    parser.add_argument(
+        "--calendar",
+        type=Path,
+        default=Path("public/data/calendar2025.json"),
+        help="Calendar JSON that defines the session order used for prefetching.",
+    )
+    parser.add_argument(
+        "--prefetch",
+        type=int,
+        default=1,
+        help="Sessions after each requested one (in calendar order) to load in the background; 0 disables.",
+    )
+    parser.add_argument(
+        "--prefetch-sessions",
+        nargs="+",
+        default=["Q", "R"],
+        help="Session codes that make up each round in the prefetch order.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = parse_args(argv)
+    config = PipelineConfig()
+    order = calendar_order(args.calendar, args.prefetch_sessions) if args.prefetch and args.calendar.exists() else []
+    sessions = SessionManager(
+        fastf1_loader(config),
+        max_sessions=args.max_sessions,
+        order=order,
+        prefetch_depth=args.prefetch,
+    )
+
+    def ready(address) -> None:
+        print(f"Analysis server listening on http://{address[0]}:{address[1]}", flush=True)
+
+    try:
+        asyncio.run(
+            run_server(
+                sessions,
+                host=args.host,
+                port=args.port,
+                workers=args.workers,
+                max_lap_bytes=int(args.lap_cache_mb * 1024 * 1024),
+                ready=ready,
+            )
+        )
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
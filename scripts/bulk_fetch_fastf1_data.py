@@ -5,17 +5,40 @@ Bulk fetch FastF1 telemetry for multiple rounds/sessions.
 Examples:
   python scripts/bulk_fetch_fastf1_data.py --year 2024 --sessions Q R
   python scripts/bulk_fetch_fastf1_data.py --year 2024 --sessions Q --tracks australia monaco
+  python scripts/bulk_fetch_fastf1_data.py --year 2025 --sessions Q R --workers 4 --timeout 600 --retries 2
+  python scripts/bulk_fetch_fastf1_data.py --year 2025 --sessions Q R --corners --build-track-index
+  python scripts/bulk_fetch_fastf1_data.py --year 2025 --sessions Q R --corners --store
+  python scripts/bulk_fetch_fastf1_data.py --year 2025 --sessions Q R --reference
 """
 
 from __future__ import annotations
 
 import argparse
 import json
-from dataclasses import dataclass
+import signal
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Iterable, List, Sequence
-
-from fastf1_pipeline import PipelineConfig, SessionIdentifier, build_session_payload, fetch_session
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from fastf1_pipeline import (
+    PipelineConfig,
+    SessionIdentifier,
+    build_corners_payload,
+    build_laps_payload,
+    fetch_session,
+)
+from fastf1_pipeline.incremental import BuildManifest, BuildRecord, build_key, fingerprint_cache, output_id
+from fastf1_pipeline.reference import build_reference_pack
+from fastf1_pipeline.profiling import StageTimer, peak_rss_mb, profiled, write_run_report
+from fastf1_pipeline.store import AnalyticsStore
+from fastf1_pipeline.transforms import build_session_tables
+from fastf1_pipeline.writer import resolve_backend
+from fastf1_pipeline.track_index import build_track_index, update_track_index
 
 
 @dataclass(slots=True)
@@ -26,6 +49,49 @@ class FetchSummary:
     status: str
     message: str | None
     output_path: Path | None
+    attempts: int = 1
+    record: BuildRecord | None = None
+    stages: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    profile_path: Path | None = None
+
+
+@dataclass(slots=True)
+class SessionTask:
+    year: int
+    round_id: str
+    round_number: int
+    session_code: str
+
+
+RETRYABLE_STATUSES = {"error", "timeout"}
+SUCCESS_STATUSES = {"ok", "unchanged"}
+
+
+class TaskTimeout(BaseException):
+    """Raised inside a task that exceeded its time budget.
+
+    Derives from BaseException so the broad ``except Exception`` in
+    ``fetch_session`` does not turn it into an ordinary fetch error.
+    """
+
+
+@contextmanager
+def time_limit(seconds: float | None) -> Iterator[None]:
+    """Abort the enclosed block with TaskTimeout after ``seconds`` (POSIX main thread only)."""
+    if not seconds or not hasattr(signal, "SIGALRM") or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def _expire(signum, frame):  # noqa: ARG001
+        raise TaskTimeout(f"Timed out after {seconds:g}s")
+
+    previous = signal.signal(signal.SIGALRM, _expire)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
 
 
 def load_rounds(calendar_path: Path) -> List[dict]:
@@ -46,46 +112,225 @@ def should_include_round(round_entry: dict, wanted_tracks: set[str] | None) -> b
     return round_id in wanted_tracks
 
 
-def fetch_round_sessions(
-    *,
-    year: int,
-    round_entry: dict,
-    session_codes: Iterable[str],
-    config: PipelineConfig,
-) -> List[FetchSummary]:
-    results: List[FetchSummary] = []
-
-    round_id: str = round_entry.get("id")
-    round_number: int = round_entry.get("round")
-
-    for session_code in session_codes:
-        identifier = SessionIdentifier(
+def build_tasks(year: int, rounds: Iterable[dict], session_codes: Sequence[str]) -> List[SessionTask]:
+    return [
+        SessionTask(
             year=year,
-            round_slug=round_id,
+            round_id=round_entry.get("id"),
+            round_number=round_entry.get("round"),
             session_code=normalize_session_code(session_code),
         )
+        for round_entry in rounds
+        for session_code in session_codes
+    ]
 
-        cache_dir = config.resolve_cache(year, round_id, identifier.session_code)
-        fetch_result = fetch_session(identifier, cache_dir)
-        payload = build_session_payload(fetch_result)
-
-        output_dir = config.resolve_output(year, round_id, identifier.session_code)
-        output_dir.mkdir(parents=True, exist_ok=True)
-        output_path = output_dir / "session.json"
-        output_path.write_text(json.dumps(payload, indent=2))
 
-        results.append(
-            FetchSummary(
-                round_id=round_id,
-                round_number=round_number,
+def run_session_task(
+    task: SessionTask,
+    config: PipelineConfig,
+    timeout: float | None = None,
+    previous: BuildRecord | None = None,
+    force: bool = False,
+    profile_dir: Path | None = None,
+) -> FetchSummary:
+    """
+    Fetch, transform and write one session. Safe to run in a worker process.
+
+    When ``previous`` is the session's last build record, its key still matches
+    the raw cache and every enabled artifact exists, nothing is fetched or
+    written unless ``force`` is set.
+    Per-stage timings are returned in ``FetchSummary.stages``; with a
+    ``profile_dir`` the whole task also runs under cProfile.
+    """
+    timer = StageTimer()
+    profile_path = None
+    if profile_dir is not None:
+        profile_path = profile_dir / f"{task.year}_{task.round_id}_{task.session_code}.prof"
+    with profiled(profile_path), timer.stage("total"):
+        summary = _run_session_task(task, config, timeout, previous, force, timer)
+    summary.stages = timer.to_json()
+    summary.profile_path = profile_path
+    return summary
+
+
+def _run_session_task(
+    task: SessionTask,
+    config: PipelineConfig,
+    timeout: float | None,
+    previous: BuildRecord | None,
+    force: bool,
+    timer: StageTimer,
+) -> FetchSummary:
+    identifier = SessionIdentifier(
+        year=task.year,
+        round_slug=task.round_id,
+        session_code=task.session_code,
+    )
+    cache_dir = config.resolve_cache(task.year, task.round_id, identifier.session_code)
+    output_dir = config.resolve_output(task.year, task.round_id, identifier.session_code)
+    previous_files = previous.files if previous is not None else None
+    track_entry = config.track_entry(task.round_id) if config.build_corners else None
+    track_key = track_entry["key"] if track_entry else None
+
+    artifacts = config.output_artifacts(task.year, task.round_id, identifier.session_code)
+    if previous is not None and not force and all(path.exists() for path in artifacts):
+        with timer.stage("fingerprint"):
+            files = fingerprint_cache(cache_dir, previous_files)
+        if build_key(files, config=config, track_index=track_key) == previous.key:
+            return FetchSummary(
+                round_id=task.round_id,
+                round_number=task.round_number,
                 session_code=identifier.session_code,
-                status=fetch_result.status,
-                message=fetch_result.message,
-                output_path=output_path,
+                status="unchanged",
+                message="Inputs and transform unchanged; kept existing output.",
+                output_path=output_dir / "session.json",
             )
+
+    try:
+        with time_limit(timeout):
+            with timer.stage("fetch"):
+                fetch_result = fetch_session(identifier, cache_dir, telemetry=config.needs_telemetry, timer=timer)
+            with timer.stage("transform"):
+                payload = build_session_tables(fetch_result, corners_file=config.build_corners)
+            output_path = config.write_manifest(output_dir, payload, timer=timer)
+            if config.build_corners:
+                with timer.stage("corners"):
+                    corners_payload = build_corners_payload(fetch_result, track_entry=track_entry)
+                    config.write_corners(output_dir, corners_payload)
+            if config.build_traces:
+                with timer.stage("traces"):
+                    laps_payload = build_laps_payload(fetch_result, max_points=config.trace_points)
+                    config.write_laps(output_dir, laps_payload)
+            if config.build_reference:
+                with timer.stage("reference"):
+                    pack = build_reference_pack(fetch_result)
+                    if pack is not None:
+                        config.write_reference(config.resolve_reference(task.year, task.round_id, identifier.session_code), pack)
+    except TaskTimeout as exc:
+        return FetchSummary(
+            round_id=task.round_id,
+            round_number=task.round_number,
+            session_code=task.session_code,
+            status="timeout",
+            message=str(exc),
+            output_path=None,
         )
 
-    return results
+    record = None
+    if fetch_result.status == "ok":
+        with timer.stage("fingerprint"):
+            files = fingerprint_cache(cache_dir, previous_files)
+        record = BuildRecord(key=build_key(files, config=config, track_index=track_key), files=files)
+
+    return FetchSummary(
+        round_id=task.round_id,
+        round_number=task.round_number,
+        session_code=identifier.session_code,
+        status=fetch_result.status,
+        message=fetch_result.message,
+        output_path=output_path,
+        record=record,
+    )
+
+
+def _crashed_summary(task: SessionTask, exc: BaseException) -> FetchSummary:
+    return FetchSummary(
+        round_id=task.round_id,
+        round_number=task.round_number,
+        session_code=task.session_code,
+        status="error",
+        message=f"{exc.__class__.__name__}: {exc}",
+        output_path=None,
+    )
+
+
+def run_tasks(
+    tasks: Sequence[SessionTask],
+    *,
+    config: PipelineConfig,
+    workers: int = 1,
+    timeout: float | None = None,
+    retries: int = 0,
+    on_result: Callable[[FetchSummary], None] | None = None,
+    manifest: BuildManifest | None = None,
+    force: bool = False,
+    profile_dir: Path | None = None,
+) -> List[FetchSummary]:
+    """
+    Run session tasks, sequentially or on a process pool of ``workers``.
+
+    Failed or timed-out tasks are resubmitted up to ``retries`` times.
+    ``on_result`` is called as each task settles (completion order); the
+    returned list follows task order. With a ``manifest``, sessions whose
+    inputs are unchanged are skipped and fresh build records are saved as
+    results arrive. ``profile_dir`` enables a cProfile dump per session.
+    """
+    results: List[FetchSummary | None] = [None] * len(tasks)
+
+    def previous_record(task: SessionTask) -> BuildRecord | None:
+        if manifest is None:
+            return None
+        return manifest.get(output_id(task.year, task.round_id, task.session_code))
+
+    def settle(index: int, summary: FetchSummary) -> None:
+        results[index] = summary
+        if manifest is not None and summary.record is not None:
+            task = tasks[index]
+            manifest.update(output_id(task.year, task.round_id, task.session_code), summary.record)
+            manifest.save()
+        if on_result is not None:
+            on_result(summary)
+
+    if workers <= 1:
+        for index, task in enumerate(tasks):
+            attempt = 0
+            while True:
+                attempt += 1
+                try:
+                    summary = run_session_task(task, config, timeout, previous_record(task), force, profile_dir)
+                except Exception as exc:  # pragma: no cover - defensive logging
+                    summary = _crashed_summary(task, exc)
+                summary.attempts = attempt
+                if summary.status not in RETRYABLE_STATUSES or attempt > retries:
+                    break
+            settle(index, summary)
+        return [summary for summary in results if summary is not None]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        def submit(index: int) -> object:
+            task = tasks[index]
+            return pool.submit(run_session_task, task, config, timeout, previous_record(task), force, profile_dir)
+
+        pending: Dict[object, Tuple[int, int]] = {submit(index): (index, 1) for index in range(len(tasks))}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, attempt = pending.pop(future)
+                task = tasks[index]
+                try:
+                    summary = future.result()
+                except Exception as exc:  # worker crashed or result could not be unpickled
+                    summary = _crashed_summary(task, exc)
+                summary.attempts = attempt
+                if summary.status in RETRYABLE_STATUSES and attempt <= retries:
+                    pending[submit(index)] = (index, attempt + 1)
+                    continue
+                settle(index, summary)
+
+    return [summary for summary in results if summary is not None]
+
+
+def task_report(summary: FetchSummary) -> Dict[str, Any]:
+    return {
+        "round": summary.round_id,
+        "roundNumber": summary.round_number,
+        "session": summary.session_code,
+        "status": summary.status,
+        "attempts": summary.attempts,
+        "message": summary.message,
+        "stages": summary.stages,
+        "profile": str(summary.profile_path) if summary.profile_path else None,
+    }
 
 
 def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
@@ -108,6 +353,97 @@ def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
         default=Path("public/data/calendar2025.json"),
         help="Path to the calendar JSON used to resolve track identifiers.",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes (default: 1, run sessions one after another).",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=None,
+        help="Per-session time budget in seconds (default: no limit).",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=1,
+        help="How many times to retry a session that errored or timed out (default: 1).",
+    )
+    parser.add_argument(
+        "--indent",
+        type=int,
+        default=None,
+        help="Pretty-print session.json with this indent (default: compact JSON).",
+    )
+    parser.add_argument(
+        "--orjson",
+        action="store_true",
+        help="Write JSON with orjson when it is installed (faster; NaN is written as null).",
+    )
+    parser.add_argument(
+        "--no-columnar",
+        action="store_true",
+        help="Skip writing the columnar session.columnar.json artifact.",
+    )
+    parser.add_argument(
+        "--corners",
+        action="store_true",
+        help="Also load telemetry and write corners.json with per-driver corner metrics.",
+    )
+    parser.add_argument(
+        "--traces",
+        action="store_true",
+        help="Also load telemetry and write laps.json with downsampled speed and time-delta traces.",
+    )
+    parser.add_argument(
+        "--reference",
+        action="store_true",
+        help="Also load telemetry and write a reference-lap pack (every driver's fastest lap as one float32 array).",
+    )
+    parser.add_argument(
+        "--trace-points",
+        type=int,
+        default=400,
+        help="Point budget per downsampled trace in laps.json (default: 400).",
+    )
+    parser.add_argument(
+        "--no-track-index",
+        action="store_true",
+        help="Detect corners per lap even when the circuit has a track corner index entry.",
+    )
+    parser.add_argument(
+        "--build-track-index",
+        action="store_true",
+        help="After fetching, rebuild the track corner index for the selected tracks from their corners.json files.",
+    )
+    parser.add_argument(
+        "--store",
+        nargs="?",
+        type=Path,
+        const=True,
+        default=None,
+        metavar="PATH",
+        help="After fetching, load every written session into the SQLite analytics store "
+        "(default path: cache/fastf1/analytics.sqlite).",
+    )
+    parser.add_argument(
+        "--report",
+        type=Path,
+        default=None,
+        help="Where to write the machine-readable run report (default: cache/fastf1/run_report.json).",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Run every session under cProfile and dump .prof files next to the run report.",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rebuild every session even if its raw cache and transform version are unchanged.",
+    )
     return parser.parse_args(argv)
 
 
@@ -122,40 +458,76 @@ def main(argv: Sequence[str] | None = None) -> int:
     if not rounds:
         raise SystemExit(f"No rounds found in {calendar_path}")
 
-    config = PipelineConfig()
+    config = PipelineConfig(
+        json_indent=args.indent,
+        json_backend=resolve_backend("orjson" if args.orjson else "json", args.indent),
+        write_columnar=not args.no_columnar,
+        build_corners=args.corners,
+        build_traces=args.traces,
+        trace_points=args.trace_points,
+        build_reference=args.reference,
+        use_track_index=not args.no_track_index,
+    )
+    if args.orjson and config.json_backend != "orjson":
+        print("orjson is not installed or --indent is not 2; writing JSON with the standard library.")
     sessions = [normalize_session_code(code) for code in args.sessions]
     tracks_filter = set(args.tracks) if args.tracks else None
 
-    summaries: List[FetchSummary] = []
+    selected_rounds = [entry for entry in rounds if should_include_round(entry, tracks_filter)]
+    tasks = build_tasks(args.year, selected_rounds, sessions)
 
-    for round_entry in rounds:
-        if not should_include_round(round_entry, tracks_filter):
-            continue
+    report_path = args.report or config.resolve_run_report()
+    profile_dir = report_path.parent / "profiles" if args.profile else None
+    finished = 0
 
-        round_results = fetch_round_sessions(
-            year=args.year,
-            round_entry=round_entry,
-            session_codes=sessions,
-            config=config,
+    def report_progress(summary: FetchSummary) -> None:
+        nonlocal finished
+        finished += 1
+        retry_note = f" after {summary.attempts} attempts" if summary.attempts > 1 else ""
+        print(
+            f"[{finished}/{len(tasks)}] {summary.round_id} / {summary.session_code} -> {summary.status}{retry_note}",
+            flush=True,
         )
 
-        summaries.extend(round_results)
+    started_at = datetime.now(timezone.utc)
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    summaries = run_tasks(
+        tasks,
+        config=config,
+        workers=args.workers,
+        timeout=args.timeout,
+        retries=args.retries,
+        on_result=report_progress,
+        manifest=BuildManifest.load(config.resolve_build_manifest()),
+        force=args.force,
+        profile_dir=profile_dir,
+    )
+    wall_s = time.perf_counter() - wall_start
+    cpu_s = time.process_time() - cpu_start
 
     success = 0
+    unchanged = 0
     failures = []
 
+    print()
     for summary in summaries:
-        status_icon = "✅" if summary.status == "ok" else "⚠️"
+        status_icon = "✅" if summary.status in SUCCESS_STATUSES else "⚠️"
         print(
             f"{status_icon} {summary.round_number:02d} {summary.round_id} / {summary.session_code} "
             f"-> {summary.status}"
         )
         if summary.status == "ok":
             success += 1
+        elif summary.status == "unchanged":
+            unchanged += 1
         else:
             failures.append(summary)
 
-    print(f"\nCompleted {len(summaries)} fetches ({success} ok, {len(failures)} warnings).")
+    print(
+        f"\nCompleted {len(summaries)} fetches "
+        f"({success} ok, {unchanged} unchanged, {len(failures)} warnings)."
+    )
     if failures:
         print("Warnings:")
         for summary in failures:
@@ -163,6 +535,42 @@ def main(argv: Sequence[str] | None = None) -> int:
                 f"  - {summary.round_id} {summary.session_code}: {summary.status}"
                 + (f" ({summary.message})" if summary.message else "")
             )
+
+    totals = StageTimer()
+    for summary in summaries:
+        totals.merge(summary.stages)
+    report = {
+        "startedAt": started_at.isoformat(),
+        "args": {key: str(value) if isinstance(value, Path) else value for key, value in vars(args).items()},
+        "wallSeconds": round(wall_s, 3),
+        "cpuSeconds": round(cpu_s, 3),
+        "peakRssMb": {"main": peak_rss_mb(), "workers": peak_rss_mb(children=True)},
+        "counts": {"ok": success, "unchanged": unchanged, "warnings": len(failures)},
+        "stages": totals.to_json(),
+        "tasks": [task_report(summary) for summary in summaries],
+    }
+    write_run_report(report_path, report)
+    breakdown = ", ".join(
+        f"{name} {timing.wall_s:.1f}s" for name, timing in totals.stages.items() if name != "total"
+    )
+    print(f"\nStage wall time: {breakdown or 'n/a'} (run {wall_s:.1f}s). Report: {report_path}")
+
+    if args.build_track_index:
+        track_ids = list(dict.fromkeys(entry.get("id") for entry in selected_rounds))
+        entries = build_track_index(config.root / config.output_dir, track_ids)
+        index_path = update_track_index(config.resolve_track_index(), entries, indent=config.json_indent)
+        print(f"\nTrack corner index: {len(entries)}/{len(track_ids)} tracks updated in {index_path}")
+
+    if args.store:
+        store_path = config.resolve_analytics_store() if args.store is True else args.store
+        ids = [
+            output_id(task.year, task.round_id, task.session_code)
+            for task, summary in zip(tasks, summaries)
+            if summary.status in SUCCESS_STATUSES
+        ]
+        with AnalyticsStore(store_path) as store:
+            updated = store.ingest(config.root / config.output_dir, ids)
+        print(f"\nAnalytics store: {updated}/{len(ids)} sessions updated in {store_path}")
     return 0
 
 
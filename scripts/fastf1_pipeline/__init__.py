@@ -9,5 +9,7 @@ incrementally without changing the public contract.
 """
 
 from .config import PipelineConfig  # noqa: F401
+from .corners import build_corners_payload  # noqa: F401
 from .fetch import FetchResult, SessionIdentifier, fetch_session  # noqa: F401
+from .traces import build_laps_payload  # noqa: F401
 from .transforms import build_session_payload  # noqa: F401
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import importlib.util
+import sys
+from types import ModuleType
+from typing import Optional
+
+
+def lazy_import(name: str) -> Optional[ModuleType]:
+    """
+    Return ``name`` as a module whose code runs on first attribute access, or None
+    when it is not installed. Keeps ``import fastf1_pipeline`` (and CLI ``--help``)
+    from paying for pandas/numpy until a transform actually needs them.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None:
+        return None
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
@@ -0,0 +1,209 @@
+"""
+Compact struct-of-arrays encoding of session payloads.
+
+``session.json`` stores one dict per lap, repeating every key. The columnar
+artifact (``session.columnar.json``) keeps ``meta``/``drivers``/``corners``/
+``notes`` as-is and stores laps as one typed array per field::
+
+    "laps": {
+      "length": 1425,
+      "columns": {
+        "lapTimeSeconds": {"dtype": "float32", "data": "<base64>"},
+        "driver": {"dtype": "int8", "dictionary": ["VER", ...], "data": "<base64>"},
+        "flags": {"dtype": "uint16", "bits": ["missing-laptime", ...], "data": "<base64>"},
+        ...
+      }
+    }
+
+Arrays are little-endian and base64 encoded, so a browser can wrap them in a
+``Float32Array`` without parsing numbers. Missing values are NaN for floats
+and -1 for integers; string columns are dictionary encoded.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+from ._lazy import lazy_import
+from .transforms import _FLAG_BITS, _FLAG_ORDER, LapTable
+from .writer import write_json
+
+# numpy is imported on first use; it ships with pandas/fastf1
+np = lazy_import("numpy")
+
+COLUMNAR_FORMAT = "session-columnar"
+COLUMNAR_VERSION = 1
+COLUMNAR_FILENAME = "session.columnar.json"
+
+# (lap field, encoding) in storage order.
+_LAP_COLUMNS = [
+    ("driver", "dictionary"),
+    ("lapNumber", "int16"),
+    ("stint", "int16"),
+    ("compound", "dictionary"),
+    ("tyreLife", "int16"),
+    ("lapTimeSeconds", "float32"),
+    ("sectorTimesSeconds", "float32"),
+    ("isPersonalBest", "bool"),
+    ("trackStatus", "dictionary"),
+    ("hasData", "bool"),
+    ("flags", "flags"),
+    ("isValid", "bool"),
+]
+
+
+def _encode(array: "np.ndarray") -> Dict[str, Any]:
+    array = np.ascontiguousarray(array, dtype=array.dtype.newbyteorder("<"))
+    column: Dict[str, Any] = {"dtype": array.dtype.name, "data": base64.b64encode(array.tobytes()).decode("ascii")}
+    if array.ndim > 1:
+        column["shape"] = list(array.shape)
+    return column
+
+
+def _decode(column: Dict[str, Any]) -> "np.ndarray":
+    array = np.frombuffer(base64.b64decode(column["data"]), dtype=np.dtype(column["dtype"]).newbyteorder("<"))
+    if "shape" in column:
+        array = array.reshape(column["shape"])
+    return array
+
+
+def _is_missing(value: Any) -> bool:
+    return value is None or (isinstance(value, float) and value != value)
+
+
+def _encode_dictionary(values: List[Any]) -> Dict[str, Any]:
+    dictionary: List[Any] = []
+    positions: Dict[Any, int] = {}
+    codes = []
+    for value in values:
+        if _is_missing(value):
+            codes.append(-1)
+            continue
+        if value not in positions:
+            positions[value] = len(dictionary)
+            dictionary.append(value)
+        codes.append(positions[value])
+    dtype = np.int8 if len(dictionary) < 128 else np.int16 if len(dictionary) < 32768 else np.int32
+    column = _encode(np.asarray(codes, dtype=dtype))
+    column["dictionary"] = dictionary
+    return column
+
+
+def _encode_lap_column(laps: LapTable | List[Dict[str, Any]], field: str, encoding: str) -> Dict[str, Any]:
+    if encoding == "flags" and isinstance(laps, LapTable):
+        column = _encode(laps.flags.astype(np.uint16))
+        column["bits"] = list(_FLAG_ORDER)
+        return column
+    values = laps.column(field) if isinstance(laps, LapTable) else [lap.get(field) for lap in laps]
+    if encoding == "dictionary":
+        return _encode_dictionary(values)
+    if encoding == "int16":
+        return _encode(np.asarray([-1 if _is_missing(v) else v for v in values], dtype=np.int16))
+    if encoding == "float32":
+        if field == "sectorTimesSeconds":
+            values = [[float("nan") if v is None else v for v in sectors] for sectors in values]
+            return _encode(np.asarray(values, dtype=np.float32).reshape(len(laps), 3))
+        return _encode(np.asarray([float("nan") if v is None else v for v in values], dtype=np.float32))
+    if encoding == "bool":
+        return _encode(np.asarray([bool(v) for v in values], dtype=np.bool_))
+    if encoding == "flags":
+        bits = [sum(_FLAG_BITS[flag] for flag in flags or ()) for flags in values]
+        column = _encode(np.asarray(bits, dtype=np.uint16))
+        column["bits"] = list(_FLAG_ORDER)
+        return column
+    raise ValueError(f"Unknown column encoding {encoding!r}")
+
+
+def to_columnar(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a ``build_session_payload`` (or ``build_session_tables``) result into the columnar layout."""
+    if np is None:
+        raise RuntimeError("numpy is required to write columnar session artifacts.")
+    laps = payload.get("laps", [])
+    return {
+        "format": COLUMNAR_FORMAT,
+        "version": COLUMNAR_VERSION,
+        "meta": payload.get("meta", {}),
+        "drivers": payload.get("drivers", {}),
+        "corners": payload.get("corners", {}),
+        "notes": payload.get("notes", []),
+        "laps": {
+            "length": len(laps),
+            "columns": {field: _encode_lap_column(laps, field, encoding) for field, encoding in _LAP_COLUMNS},
+        },
+    }
+
+
+def write_columnar(target_dir: Path, payload: Dict[str, Any], *, backend: str = "json") -> Path:
+    return write_json(target_dir / COLUMNAR_FILENAME, to_columnar(payload), backend=backend)
+
+
+def read_columnar(path: Path) -> Dict[str, Any]:
+    """
+    Load a columnar artifact. ``laps`` becomes a dict of numpy arrays; dictionary
+    columns are returned decoded as object arrays (None where missing) and
+    ``flags`` stays a uint16 bitmask over ``laps_flag_names``.
+    """
+    if np is None:
+        raise RuntimeError("numpy is required to read columnar session artifacts.")
+    raw = json.loads(Path(path).read_text())
+    if raw.get("format") != COLUMNAR_FORMAT or raw.get("version") != COLUMNAR_VERSION:
+        raise ValueError(f"{path} is not a {COLUMNAR_FORMAT} v{COLUMNAR_VERSION} file")
+
+    columns: Dict[str, Any] = {}
+    flag_names: List[str] = []
+    for field, column in raw["laps"]["columns"].items():
+        array = _decode(column)
+        if "dictionary" in column:
+            lookup = np.asarray(list(column["dictionary"]) + [None], dtype=object)
+            array = lookup[array]
+        elif "bits" in column:
+            flag_names = column["bits"]
+        columns[field] = array
+
+    return {
+        "meta": raw["meta"],
+        "drivers": raw["drivers"],
+        "corners": raw["corners"],
+        "notes": raw["notes"],
+        "laps": columns,
+        "laps_flag_names": flag_names,
+    }
+
+
+def columnar_laps_to_records(columnar: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Rebuild row-format lap dicts from ``read_columnar`` output. Times are rounded
+    to the millisecond, FastF1's timing resolution, to undo float32 storage.
+    """
+    laps = columnar["laps"]
+    flag_names = columnar["laps_flag_names"]
+
+    def seconds(value: float) -> float | None:
+        return None if value != value else round(float(value), 3)
+
+    def integer(value: int) -> int | None:
+        return None if value < 0 else int(value)
+
+    records = []
+    for i in range(len(laps["driver"])):
+        bits = int(laps["flags"][i])
+        records.append(
+            {
+                "driver": laps["driver"][i],
+                "lapNumber": integer(laps["lapNumber"][i]),
+                "stint": integer(laps["stint"][i]),
+                "compound": laps["compound"][i],
+                "tyreLife": integer(laps["tyreLife"][i]),
+                "lapTimeSeconds": seconds(laps["lapTimeSeconds"][i]),
+                "sectorTimesSeconds": [seconds(v) for v in laps["sectorTimesSeconds"][i]],
+                "isPersonalBest": bool(laps["isPersonalBest"][i]),
+                "trackStatus": laps["trackStatus"][i],
+                "hasData": bool(laps["hasData"][i]),
+                "flags": [name for bit, name in enumerate(flag_names) if bits & (1 << bit)],
+                "isValid": bool(laps["isValid"][i]),
+            }
+        )
+    return records
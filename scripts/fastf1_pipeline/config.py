@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, List
+
+from .profiling import StageTimer, stage
+from .writer import write_json
 
 
 @dataclass(slots=True)
@@ -14,6 +16,15 @@ class PipelineConfig:
     output_dir: Path = field(default_factory=lambda: Path("public/data/sessions"))
     cache_dir: Path = field(default_factory=lambda: Path("cache/fastf1/raw"))
     enabled_sessions: Iterable[str] = ("P", "Q", "R")
+    json_indent: int | None = None
+    json_backend: str = "json"  # or "orjson" (see writer.py); falls back to "json" when not installed
+    write_columnar: bool = True
+    build_corners: bool = False
+    build_traces: bool = False
+    trace_points: int = 400
+    build_reference: bool = False
+    track_index_path: Path = field(default_factory=lambda: Path("public/data/track_corners.json"))
+    use_track_index: bool = True
 
     def resolve_output(self, year: int, round_slug: str, session_code: str) -> Path:
         return self.root / self.output_dir / str(year) / round_slug / session_code
@@ -21,7 +32,75 @@ class PipelineConfig:
     def resolve_cache(self, year: int, round_slug: str, session_code: str) -> Path:
         return self.root / self.cache_dir / str(year) / round_slug / session_code
 
-    def write_manifest(self, target_dir: Path, payload: dict) -> None:
-        target_dir.mkdir(parents=True, exist_ok=True)
-        manifest_path = target_dir / "session.json"
-        manifest_path.write_text(json.dumps(payload, indent=2))
+    def resolve_build_manifest(self) -> Path:
+        return self.root / self.cache_dir / "build_manifest.json"
+
+    def resolve_track_index(self) -> Path:
+        return self.root / self.track_index_path
+
+    def track_entry(self, round_slug: str) -> dict | None:
+        """The circuit's track corner index entry, if corner builds should use one."""
+        if not self.use_track_index:
+            return None
+        from .track_index import load_track_entry
+
+        return load_track_entry(self.resolve_track_index(), round_slug)
+
+    def resolve_run_report(self) -> Path:
+        return self.root / self.cache_dir.parent / "run_report.json"
+
+    def resolve_analytics_store(self) -> Path:
+        return self.root / self.cache_dir.parent / "analytics.sqlite"
+
+    def resolve_reference(self, year: int, round_slug: str, session_code: str) -> Path:
+        return self.root / self.cache_dir.parent / "reference" / str(year) / round_slug / session_code
+
+    def output_artifacts(self, year: int, round_slug: str, session_code: str) -> List[Path]:
+        """Every file a build of the session writes with the enabled stages."""
+        output_dir = self.resolve_output(year, round_slug, session_code)
+        paths = [output_dir / "session.json"]
+        if self.write_columnar:
+            from .columnar import COLUMNAR_FILENAME
+
+            paths.append(output_dir / COLUMNAR_FILENAME)
+        if self.build_corners:
+            paths.append(output_dir / "corners.json")
+        if self.build_traces:
+            paths.append(output_dir / "laps.json")
+        if self.build_reference:
+            from .reference import REFERENCE_FILES
+
+            reference_dir = self.resolve_reference(year, round_slug, session_code)
+            paths.extend(reference_dir / name for name in REFERENCE_FILES)
+        return paths
+
+    def write_json(self, path: Path, payload: dict) -> Path:
+        """Stream ``payload`` into ``path`` atomically (compact unless json_indent is set)."""
+        return write_json(path, payload, indent=self.json_indent, backend=self.json_backend)
+
+    def write_manifest(self, target_dir: Path, payload: dict, timer: StageTimer | None = None) -> Path:
+        """Write session.json plus the columnar artifact."""
+        with stage(timer, "write.file"):
+            manifest_path = self.write_json(target_dir / "session.json", payload)
+        if self.write_columnar:
+            from .columnar import write_columnar
+
+            with stage(timer, "write.columnar"):
+                write_columnar(target_dir, payload, backend=self.json_backend)
+        return manifest_path
+
+    @property
+    def needs_telemetry(self) -> bool:
+        return self.build_corners or self.build_traces or self.build_reference
+
+    def write_corners(self, target_dir: Path, payload: dict) -> Path:
+        return self.write_json(target_dir / "corners.json", payload)
+
+    def write_laps(self, target_dir: Path, payload: dict) -> Path:
+        return self.write_json(target_dir / "laps.json", payload)
+
+    def write_reference(self, target_dir: Path, pack) -> Path:
+        """Write a ``ReferencePack`` as reference.npy + reference.json (see reference.py)."""
+        from .reference import write_reference_pack
+
+        return write_reference_pack(target_dir, pack)
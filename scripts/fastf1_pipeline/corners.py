@@ -0,0 +1,247 @@
+"""
+Corner analytics stage: per-driver corner metrics written to ``corners.json``.
+
+For each driver the representative laps (fastest clean laps) are resampled
+onto a distance grid, corners are detected and measured, and every corner is
+numbered by matching its apex against the session's reference lap (the
+fastest representative lap overall). When the circuit has an entry in the
+track corner index (see ``track_index``) laps are instead segmented against
+its fixed corner windows and carry the track's corner numbers. Drivers are
+processed one at a time so only one driver's telemetry is resampled and held
+at once.
+"""
+
+from __future__ import annotations
+
+import math
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Sequence
+
+from ._lazy import lazy_import
+from .fetch import FetchResult
+
+# pandas is imported on first use; None when it is not installed (FastF1 absent)
+pd = lazy_import("pandas")
+
+# Bump whenever build_corners_payload output changes; incremental builds key on it.
+CORNERS_VERSION = 2
+
+_METRIC_DECIMALS = 3
+
+
+def corner_engine():
+    """Import the repo-root ``f1_corners`` module that holds the corner maths."""
+    root = str(Path(__file__).resolve().parents[2])
+    if root not in sys.path:
+        sys.path.append(root)
+    import f1_corners  # type: ignore
+
+    return f1_corners
+
+
+def representative_laps(laps_df: "pd.DataFrame", driver: str, count: int) -> "pd.DataFrame":
+    """
+    The driver's ``count`` fastest laps that have a time and are not deleted,
+    inaccurate or pit laps; the same pick as ``f1_corners.py`` comparisons.
+    """
+    return corner_engine().fastest_clean_laps(laps_df, driver, count)
+
+
+def lap_number(lap: Any) -> int | None:
+    """The lap's ``LapNumber`` as an int, or None when it is missing."""
+    value = lap.get("LapNumber")
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    return int(value)
+
+
+def clean_number(value: Any) -> Any:
+    """A JSON-ready metric: NaN becomes None and floats are rounded to ``_METRIC_DECIMALS``."""
+    if isinstance(value, float):
+        if math.isnan(value):
+            return None
+        return round(value, _METRIC_DECIMALS)
+    return value
+
+
+def metric_records(metrics: "pd.DataFrame", corner_numbers: Sequence[int | None]) -> List[Dict[str, Any]]:
+    """Metric rows keyed by reference corner number instead of the lap-local ``Corner`` index."""
+    return CornerTable.from_metrics(metrics, corner_numbers).to_json()
+
+
+@dataclass(slots=True)
+class CornerTable:
+    """
+    One lap's corner records held as a (corners x metrics) array plus the
+    corner numbers, so a payload does not keep a dict per corner alive.
+    ``to_json`` builds the records exactly as ``corners.json`` stores them.
+    """
+
+    numbers: List[int | None]
+    columns: Sequence[str]
+    values: Any  # 2-D numpy array, one row per corner
+
+    @classmethod
+    def from_metrics(cls, metrics: "pd.DataFrame", corner_numbers: Sequence[int | None]) -> "CornerTable":
+        values = metrics.drop(columns=["Corner"])
+        return cls(list(corner_numbers)[: len(values)], tuple(values.columns), values.to_numpy())
+
+    def __len__(self) -> int:
+        return len(self.numbers)
+
+    def to_json(self) -> List[Dict[str, Any]]:
+        records = []
+        for number, row in zip(self.numbers, self.values.tolist()):
+            record: Dict[str, Any] = {"corner": number}
+            record.update((key, clean_number(value)) for key, value in zip(self.columns, row))
+            records.append(record)
+        return records
+
+
+def _analyse_laps(engine: Any, laps: "pd.DataFrame", dist_step: float, index: Any = None) -> List[Dict[str, Any]]:
+    """
+    Resample one driver's laps in a single batch and measure every corner, either
+    detected per lap or, when ``index`` is a ``CornerIndex``, cut from its windows.
+    """
+    rows = [lap for _, lap in laps.iterrows()]
+    if not rows:
+        return []
+    tels = [engine.with_distance(lap.get_car_data()) for lap in rows]
+    batch = engine.resample_laps_to_common_distance(tels, step=dist_step)
+    del tels
+    if index is None:
+        lap_corners = engine.detect_corners_batch(batch.data[:, batch.channels.index("Speed")], batch.valid)
+
+    analysed = []
+    for i, lap in enumerate(rows):
+        valid = batch.valid[i]
+        if not valid.any():
+            continue
+        tel = {"Distance": batch.grid[valid]}
+        for c, channel in enumerate(batch.channels):
+            tel[channel] = batch.data[i, c, valid].astype(float)
+        if index is None:
+            corners = lap_corners[i]
+            apexes = engine.apex_distances(corners, tel)
+            metrics = engine.per_corner_metrics(tel, corners)
+        else:
+            metrics = engine.corner_metrics_by_index(tel, index)
+            apexes = metrics["d_apex"].to_numpy()
+        analysed.append(
+            {
+                "lapNumber": lap_number(lap),
+                "lapTimeSeconds": clean_number(lap["LapTime"].total_seconds()),
+                "apexes": apexes,
+                "metrics": metrics,
+            }
+        )
+    return analysed
+
+
+def _empty_payload(meta: Dict[str, Any], note: str) -> Dict[str, Any]:
+    return {"meta": meta, "reference": None, "drivers": {}, "notes": [note]}
+
+
+def build_corners_payload(
+    fetch_result: FetchResult,
+    *,
+    drivers: Iterable[str] | None = None,
+    laps_per_driver: int = 3,
+    dist_step: float = 2.0,
+    tol_m: float = 25.0,
+    track_entry: Dict[str, Any] | None = None,
+) -> Dict[str, Any]:
+    """
+    Convert a telemetry-loaded FastF1 session into the ``corners.json`` payload.
+
+    Every corner record carries the reference corner number it matched
+    (``corner``, None when unmatched) plus the per_corner_metrics columns.
+    With a ``track_entry`` from the track corner index, ``corner`` is the
+    track's corner number instead and no per-lap detection is done.
+    """
+    identifier = fetch_result.identifier
+    selected_drivers: Sequence[str] | None = [d.upper() for d in drivers] if drivers else None
+
+    meta = {
+        "year": identifier.year,
+        "round": identifier.round_slug,
+        "session": identifier.session_code,
+        "generatedAt": datetime.now(timezone.utc).isoformat(),
+        "status": fetch_result.status,
+        "version": CORNERS_VERSION,
+        "distStep": dist_step,
+        "tolM": tol_m,
+        "lapsPerDriver": laps_per_driver,
+        "trackIndex": track_entry["key"] if track_entry else None,
+    }
+
+    if fetch_result.status != "ok" or fetch_result.session is None or pd is None:
+        return _empty_payload(meta, fetch_result.message or "Session unavailable")
+
+    laps_df = getattr(fetch_result.session, "laps", None)
+    if laps_df is None or laps_df.empty:
+        return _empty_payload(meta, "No lap data returned by fastf1 for this session.")
+
+    codes = list(dict.fromkeys(laps_df["Driver"].tolist()))
+    if selected_drivers:
+        codes = [code for code in codes if code in selected_drivers]
+
+    picks = {code: representative_laps(laps_df, code, laps_per_driver) for code in codes}
+    fastest = {code: laps["LapTime"].iloc[0] for code, laps in picks.items() if not laps.empty}
+    if not fastest:
+        return _empty_payload(meta, "No clean laps available for corner analysis.")
+
+    engine = corner_engine()
+    index = None
+    if track_entry:
+        from .track_index import corner_index_from_entry
+
+        index = corner_index_from_entry(track_entry)
+
+    reference_driver = min(fastest, key=fastest.get)
+    reference = _analyse_laps(engine, picks[reference_driver].iloc[:1], dist_step, index)
+    if not reference:
+        return _empty_payload(meta, "Reference lap has no usable telemetry.")
+    reference = reference[0]
+    if index is not None:
+        reference_numbers = reference["metrics"]["Corner"].tolist()
+    else:
+        reference_numbers = list(range(1, len(reference["apexes"]) + 1))
+
+    drivers_payload: Dict[str, List[Dict[str, Any]]] = {}
+    for code in codes:
+        lap_entries = []
+        # the reference driver's fastest lap is the reference lap, already analysed
+        if code == reference_driver:
+            analysed = [reference] + _analyse_laps(engine, picks[code].iloc[1:], dist_step, index)
+        else:
+            analysed = _analyse_laps(engine, picks[code], dist_step, index)
+        for lap in analysed:
+            if index is not None:
+                numbers = lap["metrics"]["Corner"].tolist()
+            else:
+                matched = {j: i + 1 for i, j in engine.match_apexes(reference["apexes"], lap["apexes"], tol_m=tol_m)}
+                numbers = [matched.get(j) for j in range(len(lap["apexes"]))]
+            lap_entries.append(
+                {
+                    "lapNumber": lap["lapNumber"],
+                    "lapTimeSeconds": lap["lapTimeSeconds"],
+                    "corners": CornerTable.from_metrics(lap["metrics"], numbers),
+                }
+            )
+        drivers_payload[code] = lap_entries
+
+    return {
+        "meta": meta,
+        "reference": {
+            "driver": reference_driver,
+            "lapNumber": reference["lapNumber"],
+            "lapTimeSeconds": reference["lapTimeSeconds"],
+            "corners": CornerTable.from_metrics(reference["metrics"], reference_numbers),
+        },
+        "drivers": drivers_payload,
+        "notes": [],
+    }
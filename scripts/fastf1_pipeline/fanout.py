@@ -0,0 +1,137 @@
+"""
+Asyncio fan-out of blocking per-session jobs.
+
+``fan_out`` runs one blocking ``job(identifier)`` per requested session on an
+executor, at most ``workers`` at a time, so a weekend (FP1 ... R) or a run of
+seasons takes about as long as its slowest sessions rather than their sum.
+Callers whose jobs share a FastF1 cache directory can pass ``cache_key`` to
+cap them at ``per_cache`` at a time: FastF1 keeps an HTTP cache in SQLite and
+writes parsed data as pickles in that directory, and two loads writing the
+same files at once only duplicate the download. ``fetch_fastf1_data.py``
+gives every session its own cache directory, so it needs no such cap.
+
+Jobs are plain ``SessionIdentifier -> result`` callables, like the session
+manager's loaders, so the orchestrator can be exercised with a stub that
+sleeps. Real FastF1 loads belong on a process pool (``processes=True``):
+``fastf1.Cache.enable_cache`` is process-wide, so threads cannot each load
+into their own cache directory.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from collections import defaultdict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Sequence
+
+from .fetch import SessionIdentifier
+
+SessionJob = Callable[[SessionIdentifier], Any]
+
+
+@dataclass(slots=True)
+class FanOutResult:
+    identifier: SessionIdentifier
+    value: Any = None
+    error: str | None = None
+    seconds: float = 0.0
+
+
+@dataclass(slots=True)
+class FanOutProgress:
+    """Snapshot passed to ``on_progress`` each time a job finishes."""
+
+    finished: int
+    total: int
+    running: int
+    waiting: int
+    elapsed: float
+    result: FanOutResult
+
+    def to_text(self) -> str:
+        ident = self.result.identifier
+        outcome = f"error: {self.result.error}" if self.result.error else "done"
+        return (
+            f"[{self.finished}/{self.total}] {ident.year} {ident.round_slug} {ident.session_code} -> {outcome} "
+            f"({self.result.seconds:.1f}s; {self.running} running, {self.waiting} waiting, {self.elapsed:.1f}s elapsed)"
+        )
+
+
+async def fan_out(
+    identifiers: Sequence[SessionIdentifier],
+    job: SessionJob,
+    executor: Executor,
+    *,
+    workers: int,
+    cache_key: Callable[[SessionIdentifier], Hashable] | None = None,
+    per_cache: int = 1,
+    on_progress: Callable[[FanOutProgress], None] | None = None,
+) -> List[FanOutResult]:
+    """
+    Run ``job`` for every identifier on ``executor`` and return the results in
+    request order. A job that raises yields a result with ``error`` set; the
+    others carry on.
+    """
+    loop = asyncio.get_running_loop()
+    slots = asyncio.Semaphore(max(1, workers))
+    cache_slots: Dict[Hashable, asyncio.Semaphore] = defaultdict(lambda: asyncio.Semaphore(max(1, per_cache)))
+    started = time.perf_counter()
+    counts = {"running": 0, "finished": 0}
+
+    async def run(identifier: SessionIdentifier) -> FanOutResult:
+        # take the cache slot first so a job waiting on its directory does not hold a worker
+        cache_slot = cache_slots[cache_key(identifier)] if cache_key is not None else contextlib.nullcontext()
+        async with cache_slot, slots:
+            counts["running"] += 1
+            t0 = time.perf_counter()
+            try:
+                result = FanOutResult(identifier, value=await loop.run_in_executor(executor, job, identifier))
+            except Exception as exc:
+                result = FanOutResult(identifier, error=f"{exc.__class__.__name__}: {exc}")
+            result.seconds = time.perf_counter() - t0
+            counts["running"] -= 1
+        counts["finished"] += 1
+        if on_progress is not None:
+            on_progress(
+                FanOutProgress(
+                    finished=counts["finished"],
+                    total=len(identifiers),
+                    running=counts["running"],
+                    waiting=len(identifiers) - counts["finished"] - counts["running"],
+                    elapsed=time.perf_counter() - started,
+                    result=result,
+                )
+            )
+        return result
+
+    return list(await asyncio.gather(*(run(identifier) for identifier in identifiers)))
+
+
+def run_fan_out(
+    identifiers: Sequence[SessionIdentifier],
+    job: SessionJob,
+    *,
+    workers: int = 4,
+    processes: bool = True,
+    cache_key: Callable[[SessionIdentifier], Hashable] | None = None,
+    per_cache: int = 1,
+    on_progress: Callable[[FanOutProgress], None] | None = None,
+) -> List[FanOutResult]:
+    """``fan_out`` on a fresh process (or thread) pool of ``workers``, from synchronous code."""
+    workers = max(1, min(workers, len(identifiers)))
+    pool_type = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    with pool_type(max_workers=workers) as executor:
+        return asyncio.run(
+            fan_out(
+                identifiers,
+                job,
+                executor,
+                workers=workers,
+                cache_key=cache_key,
+                per_cache=per_cache,
+                on_progress=on_progress,
+            )
+        )
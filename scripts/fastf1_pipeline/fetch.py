@@ -4,10 +4,7 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Literal, Optional
 
-try:
-    import fastf1  # type: ignore
-except ImportError:  # pragma: no cover - library not installed yet
-    fastf1 = None  # type: ignore
+from .profiling import StageTimer, stage
 
 
 @dataclass(slots=True)
@@ -24,20 +21,30 @@ class FetchResult:
     message: Optional[str] = None
 
 
-def fetch_session(identifier: SessionIdentifier, cache_dir: Path) -> FetchResult:
+def fetch_session(
+    identifier: SessionIdentifier,
+    cache_dir: Path,
+    *,
+    telemetry: bool = False,
+    timer: StageTimer | None = None,
+) -> FetchResult:
     """
     Placeholder for future FastF1 session fetching.
 
     Args:
         identifier: Year/round/session selection.
         cache_dir: Where raw FastF1 caches should live.
+        telemetry: Also load car telemetry (needed for corner analytics).
+        timer: Optional stage timer; ``session.load`` is recorded as ``fetch.load``.
 
     Returns:
         FetchResult describing the outcome.
     """
     cache_dir.mkdir(parents=True, exist_ok=True)
 
-    if fastf1 is None:
+    try:
+        import fastf1  # type: ignore  # deferred: importing fastf1 costs ~0.5s
+    except ImportError:  # pragma: no cover - library not installed yet
         return FetchResult(
             status="fastf1_not_installed",
             identifier=identifier,
@@ -47,7 +54,8 @@ def fetch_session(identifier: SessionIdentifier, cache_dir: Path) -> FetchResult
     try:
         fastf1.Cache.enable_cache(str(cache_dir))
         session = fastf1.get_session(identifier.year, identifier.round_slug, identifier.session_code)
-        session.load(laps=True, telemetry=False, weather=False)
+        with stage(timer, "fetch.load"):
+            session.load(laps=True, telemetry=telemetry, weather=False)
         return FetchResult(
             status="ok",
             identifier=identifier,
@@ -0,0 +1,154 @@
+"""
+Content-addressed build records for incremental pipeline runs.
+
+Each written session is recorded with a key derived from the raw FastF1 cache
+files it was built from, ``PAYLOAD_VERSION`` of the transform, the driver
+filter and the output format. A later run whose key still matches can skip
+fetching and rewriting that session entirely.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from .config import PipelineConfig
+from .corners import CORNERS_VERSION
+from .reference import REFERENCE_VERSION
+from .traces import TRACES_VERSION
+from .transforms import PAYLOAD_VERSION
+
+# Stat signature + content digest per cache file, keyed by path relative to the cache dir.
+FileFingerprints = Dict[str, List[Any]]
+
+# Only FastF1's parsed data files count as inputs; its HTTP cache database is
+# touched by every run even when nothing upstream changed.
+CACHE_INPUT_SUFFIX = ".ff1pkl"
+
+_HASH_CHUNK = 1 << 20
+
+
+def _sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(_HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fingerprint_cache(cache_dir: Path, previous: Optional[FileFingerprints] = None) -> FileFingerprints:
+    """
+    Hash every FastF1 data file under ``cache_dir``. Files whose size and mtime match the
+    ``previous`` fingerprints reuse the stored digest instead of being re-read.
+    """
+    previous = previous or {}
+    fingerprints: FileFingerprints = {}
+    if not cache_dir.exists():
+        return fingerprints
+    for dirpath, _, filenames in os.walk(cache_dir):
+        for name in filenames:
+            if not name.endswith(CACHE_INPUT_SUFFIX):
+                continue
+            path = Path(dirpath) / name
+            rel = path.relative_to(cache_dir).as_posix()
+            stat = path.stat()
+            known = previous.get(rel)
+            if known and known[0] == stat.st_size and known[1] == stat.st_mtime_ns:
+                fingerprints[rel] = known
+            else:
+                fingerprints[rel] = [stat.st_size, stat.st_mtime_ns, _sha256_file(path)]
+    return dict(sorted(fingerprints.items()))
+
+
+def build_key(
+    files: FileFingerprints,
+    *,
+    config: PipelineConfig,
+    drivers: Iterable[str] | None = None,
+    track_index: str | None = None,
+) -> str:
+    """
+    Digest of everything that determines a session's output files. ``track_index``
+    is the key of the track corner index entry the corner build segments against.
+    """
+    material = {
+        "inputs": {rel: entry[2] for rel, entry in sorted(files.items())},
+        "payloadVersion": PAYLOAD_VERSION,
+        "drivers": sorted(d.upper() for d in drivers) if drivers else None,
+        "jsonIndent": config.json_indent,
+        "columnar": config.write_columnar,
+        "cornersVersion": CORNERS_VERSION if config.build_corners else None,
+        "trackIndex": track_index if config.build_corners else None,
+        "tracesVersion": TRACES_VERSION if config.build_traces else None,
+        "tracePoints": config.trace_points if config.build_traces else None,
+    }
+    if config.json_backend != "json":  # only keyed when set, so existing keys stay valid
+        material["jsonBackend"] = config.json_backend
+    if config.build_reference:
+        material["referenceVersion"] = REFERENCE_VERSION
+    return hashlib.sha256(json.dumps(material, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+@dataclass(slots=True)
+class BuildRecord:
+    key: str
+    files: FileFingerprints
+    payload_version: int = PAYLOAD_VERSION
+    drivers: Optional[List[str]] = None
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "key": self.key,
+            "payloadVersion": self.payload_version,
+            "drivers": self.drivers,
+            "files": self.files,
+        }
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "BuildRecord":
+        return cls(
+            key=data["key"],
+            files=data.get("files", {}),
+            payload_version=data.get("payloadVersion", 0),
+            drivers=data.get("drivers"),
+        )
+
+
+@dataclass(slots=True)
+class BuildManifest:
+    """Build records for every output, stored as one JSON file next to the raw cache."""
+
+    path: Path
+    records: Dict[str, BuildRecord] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path) -> "BuildManifest":
+        if not path.exists():
+            return cls(path=path)
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return cls(path=path)
+        records = {name: BuildRecord.from_json(entry) for name, entry in data.get("outputs", {}).items()}
+        return cls(path=path, records=records)
+
+    def get(self, output_id: str) -> Optional[BuildRecord]:
+        return self.records.get(output_id)
+
+    def update(self, output_id: str, record: BuildRecord) -> None:
+        self.records[output_id] = record
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {"outputs": {name: record.to_json() for name, record in sorted(self.records.items())}}
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(data, indent=1, sort_keys=True))
+        tmp_path.replace(self.path)
+
+
+def output_id(year: int, round_slug: str, session_code: str) -> str:
+    return f"{year}/{round_slug}/{session_code}"
@@ -0,0 +1,130 @@
+"""
+Lightweight stage timing for pipeline runs.
+
+``StageTimer`` accumulates wall time, CPU time and call counts per named
+stage (``with timer.stage("transform"):`` or ``@timer.timed("transform")``)
+and records the process's peak RSS as each stage finishes. ``profiled``
+optionally wraps a block in cProfile and dumps the stats for
+``python -m pstats`` / snakeviz. The bulk CLI collects one timer per session
+into ``run_report.json``.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import functools
+import json
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Dict, Iterator, Optional
+
+try:
+    import resource  # type: ignore
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore
+
+
+def peak_rss_mb(children: bool = False) -> float | None:
+    """Peak resident set size of this process (or of its finished children) in MiB."""
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF)
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(usage.ru_maxrss / scale, 1)
+
+
+@dataclass(slots=True)
+class StageTiming:
+    calls: int = 0
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    peak_rss_mb: float | None = None
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "wallSeconds": round(self.wall_s, 4),
+            "cpuSeconds": round(self.cpu_s, 4),
+            "peakRssMb": self.peak_rss_mb,
+        }
+
+
+@dataclass(slots=True)
+class StageTimer:
+    """Per-stage wall/CPU totals, in the order stages were first entered."""
+
+    stages: Dict[str, StageTiming] = field(default_factory=dict)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        timing = self.stages.setdefault(name, StageTiming())
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            timing.calls += 1
+            timing.wall_s += time.perf_counter() - wall_start
+            timing.cpu_s += time.process_time() - cpu_start
+            timing.peak_rss_mb = peak_rss_mb()
+
+    def timed(self, name: str | None = None) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        """Decorator form of ``stage``; the stage defaults to the function name."""
+
+        def decorate(func: Callable[..., Any]) -> Callable[..., Any]:
+            @functools.wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                with self.stage(name or func.__name__):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorate
+
+    def merge(self, stages: Dict[str, Dict[str, Any]]) -> None:
+        """Add the totals of a ``to_json`` result (e.g. from a worker process)."""
+        for name, data in stages.items():
+            timing = self.stages.setdefault(name, StageTiming())
+            timing.calls += data["calls"]
+            timing.wall_s += data["wallSeconds"]
+            timing.cpu_s += data["cpuSeconds"]
+            if data.get("peakRssMb") is not None:
+                timing.peak_rss_mb = max(timing.peak_rss_mb or 0.0, data["peakRssMb"])
+
+    def to_json(self) -> Dict[str, Dict[str, Any]]:
+        return {name: timing.to_json() for name, timing in self.stages.items()}
+
+
+def stage(timer: Optional[StageTimer], name: str) -> ContextManager[None]:
+    """``timer.stage(name)``, or a no-op when instrumentation is off."""
+    if timer is None:
+        return nullcontext()
+    return timer.stage(name)
+
+
+@contextmanager
+def profiled(path: Optional[Path]) -> Iterator[None]:
+    """Run the block under cProfile and dump stats to ``path``; no-op when ``path`` is None."""
+    if path is None:
+        yield
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(str(path))
+
+
+def write_run_report(path: Path, report: Dict[str, Any]) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(report, indent=2))
+    tmp_path.replace(path)
+    return path
@@ -0,0 +1,101 @@
+"""
+Reference-lap stage: one telemetry pack per session for instant comparisons.
+
+Every driver's fastest clean lap (the same pick as ``laps.json``) is resampled
+onto one shared distance grid in a single batch and written as a contiguous
+float32 ``reference.npy`` of shape (drivers, channels, grid) plus a
+``reference.json`` sidecar, via the repo-root ``f1_reference_pack`` module.
+Readers memory-map the array, so ``f1_corners.py --reference_pack`` and any
+driver-vs-driver or driver-vs-field delta are a slice and a subtract, with no
+FastF1 session load or resampling.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any, Iterable, Sequence
+
+from ._lazy import lazy_import
+from .corners import clean_number, corner_engine, lap_number, representative_laps
+from .fetch import FetchResult
+
+pd = lazy_import("pandas")
+
+# Bump whenever build_reference_pack output changes; incremental builds key on it.
+REFERENCE_VERSION = 1
+
+# Files of a written pack (f1_reference_pack.PACK_DATA and PACK_META).
+REFERENCE_FILES = ("reference.npy", "reference.json")
+
+# Channels packed when the telemetry has them, in this order.
+REFERENCE_CHANNELS = ("Speed", "Throttle", "Brake", "RPM", "nGear", "DRS", "Time_s")
+
+
+def _pack_module():
+    """Import the repo-root ``f1_reference_pack`` module (``corner_engine`` puts the root on sys.path)."""
+    corner_engine()
+    import f1_reference_pack  # type: ignore
+
+    return f1_reference_pack
+
+
+def build_reference_pack(
+    fetch_result: FetchResult,
+    *,
+    drivers: Iterable[str] | None = None,
+    dist_step: float = 2.0,
+    channels: Sequence[str] = REFERENCE_CHANNELS,
+) -> Any:
+    """
+    The session's ``f1_reference_pack.ReferencePack``, or None when the session,
+    its laps or every driver's telemetry is unavailable.
+    """
+    if fetch_result.status != "ok" or fetch_result.session is None or pd is None:
+        return None
+    laps_df = getattr(fetch_result.session, "laps", None)
+    if laps_df is None or laps_df.empty:
+        return None
+
+    codes = list(dict.fromkeys(laps_df["Driver"].tolist()))
+    if drivers:
+        selected = {d.upper() for d in drivers}
+        codes = [code for code in codes if code in selected]
+    picks = [(code, representative_laps(laps_df, code, 1)) for code in codes]
+    picks = [(code, laps.iloc[0]) for code, laps in picks if not laps.empty]
+    if not picks:
+        return None
+
+    engine = corner_engine()
+    tels = [engine.with_distance(lap.get_car_data()) for _, lap in picks]
+    present = set(tels[0].columns) | ({"Time_s"} if "Time" in tels[0].columns else set())
+    batch = engine.resample_laps_to_common_distance(
+        tels, step=dist_step, channels=[c for c in channels if c in present]
+    )
+    del tels
+    keep = [i for i in range(len(picks)) if batch.valid[i].any()]
+    if not keep:
+        return None
+
+    identifier = fetch_result.identifier
+    return _pack_module().ReferencePack(
+        drivers=[picks[i][0] for i in keep],
+        channels=batch.channels,
+        step=dist_step,
+        data=batch.data[keep],
+        points=batch.valid[keep].sum(axis=1),
+        laps=[
+            {"lapNumber": lap_number(picks[i][1]), "lapTimeSeconds": clean_number(picks[i][1]["LapTime"].total_seconds())}
+            for i in keep
+        ],
+        meta={
+            "year": identifier.year,
+            "round": identifier.round_slug,
+            "session": identifier.session_code,
+            "generatedAt": datetime.now(timezone.utc).isoformat(),
+            "version": REFERENCE_VERSION,
+        },
+    )
+
+
+def write_reference_pack(target_dir: Any, pack: Any) -> Any:
+    return _pack_module().write_reference_pack(target_dir, pack)
@@ -0,0 +1,288 @@
+"""
+Local analysis service: on-demand corner comparisons served as JSON.
+
+A long-running asyncio process keeps recently loaded FastF1 sessions (via
+``SessionManager``, which also coalesces concurrent loads) and resampled
+fastest laps in size-bounded LRU caches, so comparing another driver pair on
+a warm session costs a resample + corner pass instead of a cold
+``session.load()``. Session loading runs on a thread (it is mostly I/O and
+keeps the session object in this process for the cache); resampling and
+corner maths run on a process pool so the event loop never blocks.
+
+Endpoints (GET only):
+
+    /health
+    /stats
+    /sessions/{year}/{round}/{session}/corners?drivers=VER,NOR[&tol_m=25&dist_step=2&method=greedy]
+
+The first driver is the reference; every other driver's corners are numbered
+by matching apexes against it (``f1_corners.align_laps_to_reference``).
+The stdlib HTTP handling is deliberately minimal: it is meant to sit behind
+the Next.js API route on localhost, not on a public interface.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from .corners import clean_number, corner_engine, lap_number, metric_records, representative_laps
+from .fetch import SessionIdentifier
+from .sessions import LRUCache, SessionManager
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error", 502: "Bad Gateway"}
+_MAX_HEADER_LINES = 100
+
+
+class RequestError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+def _frame_bytes(entry: Tuple[Dict[str, Any], Any]) -> int:
+    return int(entry[1].memory_usage(index=True).sum())
+
+
+# ---------- process-pool work (top level so it pickles) ----------
+def resample_lap(tel: Any, dist_step: float) -> Any:
+    return corner_engine().resample_to_common_distance(tel, step=dist_step)
+
+
+def compare_driver_laps(laps: Dict[str, Tuple[Dict[str, Any], Any]], tol_m: float, method: str) -> Dict[str, Any]:
+    """Corner metrics per driver, numbered by the first driver's corners, plus per-corner time deltas."""
+    engine = corner_engine()
+    codes = list(laps)
+    corners, metrics = {}, {}
+    for code in codes:
+        tel = laps[code][1]
+        corners[code] = engine.detect_corners(tel["Speed"], tel["Distance"])
+        metrics[code] = engine.per_corner_metrics(tel, corners[code])
+    apexes = [engine.apex_distances(corners[code], laps[code][1]) for code in codes]
+    aligned = engine.align_laps_to_reference(apexes, reference=0, tol_m=tol_m, method=method)
+
+    drivers = {}
+    for k, code in enumerate(codes):
+        numbers: List[int | None] = [None] * len(corners[code])
+        for c, j in enumerate(aligned[:, k].tolist()):
+            if j >= 0:
+                numbers[j] = c + 1
+        drivers[code] = dict(laps[code][0], corners=metric_records(metrics[code], numbers))
+
+    reference_times = metrics[codes[0]]["CornerTime"].tolist()
+    comparison = []
+    for c, row in enumerate(aligned.tolist()):
+        times = {code: (float(metrics[code]["CornerTime"].iloc[j]) if j >= 0 else None) for code, j in zip(codes, row)}
+        comparison.append(
+            {
+                "corner": c + 1,
+                "apexDistance": clean_number(float(apexes[0][c])),
+                "cornerTime": {code: clean_number(t) for code, t in times.items()},
+                "deltaSeconds": {
+                    code: (clean_number(t - reference_times[c]) if t is not None else None)
+                    for code, t in times.items()
+                },
+            }
+        )
+    return {"drivers": drivers, "comparison": comparison}
+
+
+def _fastest_lap_telemetry(session: Any, driver: str) -> Tuple[Dict[str, Any], Any] | None:
+    laps = getattr(session, "laps", None)
+    if laps is None or laps.empty:
+        return None
+    picked = representative_laps(laps, driver, 1)
+    if picked.empty:
+        return None
+    lap = picked.iloc[0]
+    info = {"lapNumber": lap_number(lap), "lapTimeSeconds": clean_number(lap["LapTime"].total_seconds())}
+    return info, corner_engine().with_distance(lap.get_car_data())
+
+
+class AnalysisServer:
+    """Caches, executors and request handling for the analysis service."""
+
+    def __init__(
+        self,
+        sessions: SessionManager,
+        *,
+        workers: int = 2,
+        max_lap_bytes: int = 256 * 1024 * 1024,
+    ) -> None:
+        self.sessions = sessions
+        self.laps = LRUCache(max_bytes=max_lap_bytes, sizeof=_frame_bytes)
+        self.pool = ProcessPoolExecutor(max_workers=workers)
+        self.requests = 0
+        self._connections: Dict["asyncio.Task[None]", asyncio.StreamWriter] = {}
+
+    # ---------- analysis ----------
+    async def session(self, identifier: SessionIdentifier) -> Any:
+        result = await self.sessions.get(identifier)
+        if result.status != "ok" or result.session is None:
+            raise RequestError(502, f"Session unavailable: {result.message or result.status}")
+        return result.session
+
+    async def lap(self, identifier: SessionIdentifier, driver: str, dist_step: float) -> Tuple[Dict[str, Any], Any]:
+        key = (identifier.year, identifier.round_slug, identifier.session_code, driver, dist_step)
+        entry = self.laps.get(key)
+        if entry is not None:
+            return entry
+        session = await self.session(identifier)
+        loop = asyncio.get_running_loop()
+        found = await loop.run_in_executor(None, _fastest_lap_telemetry, session, driver)
+        if found is None:
+            raise RequestError(404, f"No clean timed lap for driver {driver}")
+        info, tel = found
+        resampled = await loop.run_in_executor(self.pool, resample_lap, tel, dist_step)
+        entry = (info, resampled)
+        self.laps.put(key, entry)
+        return entry
+
+    async def corners(
+        self,
+        identifier: SessionIdentifier,
+        drivers: Sequence[str],
+        *,
+        tol_m: float = 25.0,
+        dist_step: float = 2.0,
+        method: str = "greedy",
+    ) -> Dict[str, Any]:
+        entries = await asyncio.gather(*(self.lap(identifier, code, dist_step) for code in drivers))
+        laps = dict(zip(drivers, entries))
+        result = await asyncio.get_running_loop().run_in_executor(self.pool, compare_driver_laps, laps, tol_m, method)
+        meta = {
+            "year": identifier.year,
+            "round": identifier.round_slug,
+            "session": identifier.session_code,
+            "reference": drivers[0],
+            "tolM": tol_m,
+            "distStep": dist_step,
+            "method": method,
+        }
+        return {"meta": meta, **result}
+
+    def stats(self) -> Dict[str, Any]:
+        return {"requests": self.requests, "sessions": self.sessions.stats(), "laps": self.laps.stats()}
+
+    # ---------- HTTP ----------
+    async def route(self, method: str, target: str) -> Tuple[int, Dict[str, Any]]:
+        if method != "GET":
+            raise RequestError(405, "Only GET is supported")
+        url = urlsplit(target)
+        parts = [unquote(p) for p in url.path.strip("/").split("/") if p]
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        if parts == ["health"]:
+            return 200, {"status": "ok"}
+        if parts == ["stats"]:
+            return 200, self.stats()
+        if len(parts) == 5 and parts[0] == "sessions" and parts[4] == "corners":
+            try:
+                identifier = SessionIdentifier(year=int(parts[1]), round_slug=parts[2], session_code=parts[3].upper())
+                tol_m = float(query.get("tol_m", 25.0))
+                dist_step = float(query.get("dist_step", 2.0))
+            except ValueError as exc:
+                raise RequestError(400, str(exc)) from exc
+            drivers = list(dict.fromkeys(d.strip().upper() for d in query.get("drivers", "").split(",") if d.strip()))
+            if len(drivers) < 2:
+                raise RequestError(400, "Pass at least two drivers, e.g. ?drivers=VER,NOR")
+            method_name = query.get("method", "greedy")
+            if method_name not in ("greedy", "optimal"):
+                raise RequestError(400, f"Unknown method {method_name!r}")
+            if dist_step <= 0:
+                raise RequestError(400, "dist_step must be positive")
+            return 200, await self.corners(identifier, drivers, tol_m=tol_m, dist_step=dist_step, method=method_name)
+        raise RequestError(404, f"No route for {url.path}")
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            while True:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                method, target, headers = request
+                self.requests += 1
+                try:
+                    status, payload = await self.route(method, target)
+                except RequestError as exc:
+                    status, payload = exc.status, {"error": str(exc)}
+                except Exception as exc:  # pragma: no cover - defensive logging
+                    status, payload = 500, {"error": f"{exc.__class__.__name__}: {exc}"}
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write(_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            self._connections.pop(task, None)
+            writer.close()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8765) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self.handle, host, port)
+
+    async def aclose(self, server: asyncio.AbstractServer) -> None:
+        """Stop accepting, drop idle keep-alive connections and shut the worker pool down."""
+        server.close()
+        # closing the transport ends each handler's pending read with EOF
+        for writer in list(self._connections.values()):
+            writer.close()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        await server.wait_closed()
+        await self.sessions.aclose()
+        self.pool.shutdown(cancel_futures=True)
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Tuple[str, str, Dict[str, str]] | None:
+    line = await reader.readline()
+    if not line.strip():
+        return None
+    method, target, _version = line.decode("latin-1").split()
+    headers: Dict[str, str] = {}
+    for _ in range(_MAX_HEADER_LINES):
+        raw = await reader.readline()
+        if raw in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = raw.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", 0) or 0)
+    if length:
+        await reader.readexactly(length)  # GET bodies are ignored
+    return method.upper(), target, headers
+
+
+def _response(status: int, payload: Dict[str, Any], keep_alive: bool) -> bytes:
+    body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status} {_REASONS.get(status, 'OK')}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+async def run_server(
+    sessions: SessionManager,
+    *,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    workers: int = 2,
+    max_lap_bytes: int = 256 * 1024 * 1024,
+    ready: Optional[Callable[[Tuple[str, int]], None]] = None,
+) -> None:
+    """Serve until cancelled."""
+    app = AnalysisServer(sessions, workers=workers, max_lap_bytes=max_lap_bytes)
+    server = await app.serve(host, port)
+    try:
+        if ready is not None:
+            ready(server.sockets[0].getsockname()[:2])
+        await server.serve_forever()
+    finally:
+        await app.aclose(server)
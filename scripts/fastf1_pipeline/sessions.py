@@ -0,0 +1,242 @@
+"""
+Session manager: coalesced and prefetched ``fetch_session`` calls.
+
+Every FastF1 load goes through ``SessionManager.get``. Loaded sessions are kept
+in a small LRU; a request for a session that is already loading waits on the
+same load instead of starting another one (single-flight), so VER-vs-NOR and
+VER-vs-LEC arriving together cost one ``session.load()``. With a calendar
+order, each request also queues the next sessions in the background, one at
+a time, so browsing round by round finds them warm.
+
+Loaders are plain ``SessionIdentifier -> FetchResult`` callables run on a
+thread, which keeps the manager testable with a stub that sleeps.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Sequence, Set, Tuple
+
+from .config import PipelineConfig
+from .fetch import FetchResult, SessionIdentifier, fetch_session
+
+SessionLoader = Callable[[SessionIdentifier], FetchResult]
+SessionKey = Tuple[int, str, str]
+
+
+class LRUCache:
+    """
+    Least-recently-used mapping bounded by entry count and/or total size.
+    ``sizeof`` estimates an entry's size in bytes (required with ``max_bytes``).
+    """
+
+    def __init__(
+        self,
+        *,
+        max_items: int | None = None,
+        max_bytes: int | None = None,
+        sizeof: Callable[[Any], int] | None = None,
+    ) -> None:
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof or (lambda value: 0)
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if key in self._entries:
+            self.bytes -= self._entries.pop(key)[1]
+        size = int(self.sizeof(value))
+        self._entries[key] = (value, size)
+        self.bytes += size
+        # never evict the entry just added, even if it alone exceeds the budget
+        while len(self._entries) > 1 and (
+            (self.max_items is not None and len(self._entries) > self.max_items)
+            or (self.max_bytes is not None and self.bytes > self.max_bytes)
+        ):
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self.bytes -= evicted_size
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+def session_key(identifier: SessionIdentifier) -> SessionKey:
+    return (identifier.year, identifier.round_slug, identifier.session_code)
+
+
+def fastf1_loader(config: PipelineConfig, *, telemetry: bool = True) -> SessionLoader:
+    """``fetch_session`` against the pipeline's raw cache directories."""
+
+    def load(identifier: SessionIdentifier) -> FetchResult:
+        cache_dir = config.resolve_cache(identifier.year, identifier.round_slug, identifier.session_code)
+        return fetch_session(identifier, cache_dir, telemetry=telemetry)
+
+    return load
+
+
+def calendar_order(calendar_path: Path, session_codes: Sequence[str], year: int | None = None) -> List[SessionIdentifier]:
+    """Every (round, session) of a calendar file in running order, e.g. bahrain Q, bahrain R, saudi-arabia Q, ..."""
+    data = json.loads(Path(calendar_path).read_text())
+    year = int(year if year is not None else data["year"])
+    rounds = sorted(data.get("rounds", []), key=lambda entry: entry.get("round", 0))
+    return [
+        SessionIdentifier(year=year, round_slug=entry["id"], session_code=code.strip().upper())
+        for entry in rounds
+        if entry.get("id")
+        for code in session_codes
+    ]
+
+
+class SessionManager:
+    """
+    Single-flight, LRU-cached session loads with optional calendar prefetch.
+
+    Counters: ``hits`` (served from cache), ``misses`` (started a load),
+    ``coalesced`` (joined a load already in flight), ``prefetched`` (background
+    loads started), ``errors`` (loads that did not return status "ok"; these are
+    not cached, so the next request retries) and the current ``inflight`` count.
+    """
+
+    def __init__(
+        self,
+        loader: SessionLoader,
+        *,
+        max_sessions: int = 4,
+        order: Iterable[SessionIdentifier] = (),
+        prefetch_depth: int = 0,
+    ) -> None:
+        order = list(order)
+        self.loader = loader
+        self.cache = LRUCache(max_items=max_sessions)
+        self.order = [session_key(identifier) for identifier in order]
+        self._identifiers = {session_key(identifier): identifier for identifier in order}
+        self._position = {key: i for i, key in enumerate(self.order)}
+        self.prefetch_depth = prefetch_depth
+        self._inflight: Dict[SessionKey, "asyncio.Future[FetchResult]"] = {}
+        self._background: Set["asyncio.Task[Any]"] = set()
+        self._queued: Set[SessionKey] = set()
+        self._failed: Set[SessionKey] = set()  # not prefetched again until a request loads them
+        self._prefetch_lock: asyncio.Lock | None = None
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.prefetched = 0
+        self.errors = 0
+
+    async def get(self, identifier: SessionIdentifier) -> FetchResult:
+        """The loaded session, from cache, from a load already in flight, or from a new load."""
+        key = session_key(identifier)
+        self.schedule_prefetch(key)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            future = self._start(identifier)
+        # shield: a cancelled request must not cancel the load other callers share
+        return await asyncio.shield(future)
+
+    def _start(self, identifier: SessionIdentifier) -> "asyncio.Future[FetchResult]":
+        key = session_key(identifier)
+        future = asyncio.ensure_future(self._load(identifier))
+        self._inflight[key] = future
+        future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return future
+
+    async def _load(self, identifier: SessionIdentifier) -> FetchResult:
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(None, self.loader, identifier)
+        except Exception as exc:  # pragma: no cover - defensive logging
+            result = FetchResult(status="error", identifier=identifier, message=f"{exc.__class__.__name__}: {exc}")
+        key = session_key(identifier)
+        if result.status == "ok":
+            self.cache.put(key, result)
+            self._failed.discard(key)
+        else:
+            self.errors += 1
+            self._failed.add(key)
+        return result
+
+    # ---------- prefetch ----------
+    def upcoming(self, key: SessionKey) -> List[SessionIdentifier]:
+        """The ``prefetch_depth`` sessions after ``key`` in calendar order."""
+        position = self._position.get(key)
+        if position is None or self.prefetch_depth <= 0:
+            return []
+        keys = self.order[position + 1 : position + 1 + self.prefetch_depth]
+        return [self._identifiers[k] for k in keys]
+
+    def schedule_prefetch(self, key: SessionKey) -> None:
+        for identifier in self.upcoming(key):
+            upcoming_key = session_key(identifier)
+            if any(upcoming_key in pending for pending in (self.cache, self._inflight, self._queued, self._failed)):
+                continue
+            self._queued.add(upcoming_key)
+            task = asyncio.ensure_future(self._prefetch(identifier))
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+
+    async def _prefetch(self, identifier: SessionIdentifier) -> None:
+        # one background load at a time so prefetch never crowds out requests
+        if self._prefetch_lock is None:
+            self._prefetch_lock = asyncio.Lock()
+        key = session_key(identifier)
+        try:
+            async with self._prefetch_lock:
+                if key in self.cache or key in self._inflight:
+                    return
+                self.prefetched += 1
+                await asyncio.shield(self._start(identifier))
+        finally:
+            self._queued.discard(key)
+
+    async def aclose(self) -> None:
+        """Cancel queued prefetches; loads already running on a thread finish on their own."""
+        for task in list(self._background):
+            task.cancel()
+        await asyncio.gather(*self._background, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self.cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "inflight": len(self._inflight),
+            "prefetched": self.prefetched,
+            "errors": self.errors,
+            "evictions": self.cache.evictions,
+        }
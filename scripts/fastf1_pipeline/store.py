@@ -0,0 +1,354 @@
+"""
+Local SQLite analytics store fed from the pipeline's JSON artifacts.
+
+``session.json`` and ``corners.json`` are what the UI reads, but answering a
+question across sessions ("apex speed at Monaco corner 6 in every 2025
+session") from them means parsing every file. This stage loads sessions,
+drivers, laps and per-corner metrics into one SQLite database (by default
+``cache/fastf1/analytics.sqlite``) so such queries are a single indexed
+lookup::
+
+    with AnalyticsStore(path) as store:
+        store.ingest(sessions_root)
+        store.corner_metric("monaco", 6, "apex_speed", year=2025)
+
+Each session is upserted in one transaction: its rows are replaced with
+``executemany`` batches, so re-ingesting is idempotent. Sessions whose
+artifacts carry the same ``generatedAt`` stamps as the stored copy are
+skipped. The database is a derived cache; it is rebuilt from scratch when
+``STORE_VERSION`` changes.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+# Bump whenever the schema or the ingested columns change; older databases are rebuilt.
+STORE_VERSION = 1
+
+# corners.json record key -> corners table column
+CORNER_METRICS: Tuple[Tuple[str, str], ...] = (
+    ("d_start", "d_start"),
+    ("d_apex", "d_apex"),
+    ("d_end", "d_end"),
+    ("EntrySpeed", "entry_speed"),
+    ("ApexSpeed", "apex_speed"),
+    ("ExitSpeed", "exit_speed"),
+    ("CornerTime", "corner_time"),
+    ("MinSpeed", "min_speed"),
+    ("d_min_speed", "d_min_speed"),
+    ("BrakingDistance", "braking_distance"),
+    ("d_throttle_on", "d_throttle_on"),
+    ("MeanThrottle", "mean_throttle"),
+    ("MeanBrake", "mean_brake"),
+)
+METRIC_COLUMNS = tuple(column for _, column in CORNER_METRICS)
+
+_SESSION_KEY = ("year", "round", "session")
+
+_SCHEMA = f"""
+CREATE TABLE sessions (
+    year INTEGER NOT NULL,
+    round TEXT NOT NULL,
+    session TEXT NOT NULL,
+    event_name TEXT,
+    status TEXT,
+    total_laps INTEGER,
+    valid_laps INTEGER,
+    generated_at TEXT,
+    corners_generated_at TEXT,
+    track_index TEXT,
+    reference_driver TEXT,
+    reference_lap INTEGER,
+    PRIMARY KEY (year, round, session)
+);
+CREATE TABLE drivers (
+    year INTEGER NOT NULL,
+    round TEXT NOT NULL,
+    session TEXT NOT NULL,
+    driver TEXT NOT NULL,
+    team TEXT,
+    number INTEGER,
+    default_compound TEXT,
+    PRIMARY KEY (year, round, session, driver)
+);
+CREATE TABLE laps (
+    year INTEGER NOT NULL,
+    round TEXT NOT NULL,
+    session TEXT NOT NULL,
+    driver TEXT NOT NULL,
+    lap_number INTEGER,
+    stint INTEGER,
+    compound TEXT,
+    tyre_life INTEGER,
+    lap_time REAL,
+    sector1 REAL,
+    sector2 REAL,
+    sector3 REAL,
+    is_personal_best INTEGER,
+    track_status TEXT,
+    has_data INTEGER,
+    flags TEXT,
+    is_valid INTEGER
+);
+CREATE TABLE corners (
+    year INTEGER NOT NULL,
+    round TEXT NOT NULL,
+    session TEXT NOT NULL,
+    driver TEXT NOT NULL,
+    lap_number INTEGER,
+    lap_time REAL,
+    corner INTEGER,
+    {", ".join(f"{column} REAL" for column in METRIC_COLUMNS)}
+);
+CREATE INDEX laps_session_driver ON laps (year, round, session, driver);
+CREATE INDEX laps_round_driver ON laps (round, driver);
+CREATE INDEX corners_session_driver_corner ON corners (year, round, session, driver, corner);
+CREATE INDEX corners_round_corner ON corners (round, corner);
+"""
+
+_LAP_COLUMNS = (
+    "driver", "lap_number", "stint", "compound", "tyre_life", "lap_time", "sector1", "sector2", "sector3",
+    "is_personal_best", "track_status", "has_data", "flags", "is_valid",
+)
+_CORNER_COLUMNS = ("driver", "lap_number", "lap_time", "corner") + METRIC_COLUMNS
+
+
+def _insert_sql(table: str, columns: Sequence[str]) -> str:
+    names = _SESSION_KEY + tuple(columns)
+    return f"INSERT INTO {table} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})"
+
+
+def _flag(value: Any) -> int | None:
+    return None if value is None else int(bool(value))
+
+
+def _lap_rows(payload: Dict[str, Any]) -> Iterable[Tuple[Any, ...]]:
+    for lap in payload.get("laps", []):
+        sectors = (list(lap.get("sectorTimesSeconds") or []) + [None] * 3)[:3]
+        yield (
+            lap.get("driver"),
+            lap.get("lapNumber"),
+            lap.get("stint"),
+            lap.get("compound"),
+            lap.get("tyreLife"),
+            lap.get("lapTimeSeconds"),
+            *sectors,
+            _flag(lap.get("isPersonalBest")),
+            lap.get("trackStatus"),
+            _flag(lap.get("hasData")),
+            ",".join(lap.get("flags") or []),
+            _flag(lap.get("isValid")),
+        )
+
+
+def _corner_rows(payload: Dict[str, Any]) -> Iterable[Tuple[Any, ...]]:
+    for driver, laps in (payload.get("drivers") or {}).items():
+        for lap in laps:
+            for record in lap.get("corners", []):
+                yield (
+                    driver,
+                    lap.get("lapNumber"),
+                    lap.get("lapTimeSeconds"),
+                    record.get("corner"),
+                    *(record.get(key) for key, _ in CORNER_METRICS),
+                )
+
+
+def _read_json(path: Path) -> Dict[str, Any] | None:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+class AnalyticsStore:
+    """A connection to the analytics database plus the ingest and query helpers."""
+
+    def __init__(self, path: Path | str = ":memory:") -> None:
+        self.path = path
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(path))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._ensure_schema()
+
+    def __enter__(self) -> "AnalyticsStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def _ensure_schema(self) -> None:
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version == STORE_VERSION:
+            return
+        with self.conn:
+            for table in ("sessions", "drivers", "laps", "corners"):
+                self.conn.execute(f"DROP TABLE IF EXISTS {table}")
+            self.conn.executescript(_SCHEMA)
+            self.conn.execute(f"PRAGMA user_version = {STORE_VERSION}")
+
+    # ---------- ingest ----------
+
+    def upsert_session(
+        self,
+        session_payload: Dict[str, Any],
+        corners_payload: Dict[str, Any] | None = None,
+        *,
+        force: bool = False,
+    ) -> bool:
+        """
+        Replace one session's rows with the contents of its ``session.json`` and
+        (optionally) ``corners.json`` payloads in a single transaction. Returns
+        False when the stored copy was built from the same artifacts.
+        """
+        meta = session_payload.get("meta", {})
+        key = (meta["year"], meta["round"], meta["session"])
+        corners_meta = (corners_payload or {}).get("meta", {})
+        generated = (meta.get("generatedAt"), corners_meta.get("generatedAt"))
+        if not force:
+            stored = self.conn.execute(
+                "SELECT generated_at, corners_generated_at FROM sessions WHERE year = ? AND round = ? AND session = ?",
+                key,
+            ).fetchone()
+            if stored is not None and tuple(stored) == generated:
+                return False
+
+        reference = (corners_payload or {}).get("reference") or {}
+        session_row = (
+            (meta.get("event") or {}).get("name"),
+            meta.get("status"),
+            meta.get("totalLapCount"),
+            meta.get("validLapCount"),
+            *generated,
+            corners_meta.get("trackIndex"),
+            reference.get("driver"),
+            reference.get("lapNumber"),
+        )
+        driver_rows = [
+            (code, entry.get("team"), entry.get("number"), entry.get("defaultCompound"))
+            for code, entry in (session_payload.get("drivers") or {}).items()
+        ]
+        with self.conn:
+            for table in ("sessions", "drivers", "laps", "corners"):
+                self.conn.execute(f"DELETE FROM {table} WHERE year = ? AND round = ? AND session = ?", key)
+            self.conn.execute(
+                _insert_sql(
+                    "sessions",
+                    ("event_name", "status", "total_laps", "valid_laps", "generated_at", "corners_generated_at",
+                     "track_index", "reference_driver", "reference_lap"),
+                ),
+                key + session_row,
+            )
+            self.conn.executemany(
+                _insert_sql("drivers", ("driver", "team", "number", "default_compound")),
+                (key + row for row in driver_rows),
+            )
+            self.conn.executemany(_insert_sql("laps", _LAP_COLUMNS), (key + row for row in _lap_rows(session_payload)))
+            if corners_payload:
+                self.conn.executemany(
+                    _insert_sql("corners", _CORNER_COLUMNS), (key + row for row in _corner_rows(corners_payload))
+                )
+        return True
+
+    def ingest(self, sessions_root: Path, ids: Iterable[str] | None = None, *, force: bool = False) -> int:
+        """
+        Upsert ``<sessions_root>/<year>/<round>/<session>`` artifacts, every session
+        under the root or only the ``ids`` given (as ``"2025/monaco/Q"``). Returns
+        how many sessions changed.
+        """
+        if ids is None:
+            dirs = sorted(path.parent for path in sessions_root.glob("*/*/*/session.json"))
+        else:
+            dirs = [sessions_root / session_id for session_id in ids]
+        return sum(self.ingest_dir(session_dir, force=force) for session_dir in dirs)
+
+    def ingest_dir(self, session_dir: Path, *, force: bool = False) -> bool:
+        """Upsert the ``session.json`` (and ``corners.json``, if any) in one output directory."""
+        payload = _read_json(session_dir / "session.json")
+        if not payload or "meta" not in payload:
+            return False
+        corners_path = session_dir / "corners.json"
+        corners = _read_json(corners_path) if corners_path.exists() else None
+        return self.upsert_session(payload, corners, force=force)
+
+    # ---------- queries ----------
+
+    def query(self, sql: str, params: Sequence[Any] | Dict[str, Any] = ()) -> List[Dict[str, Any]]:
+        """Run any read query and return its rows as dicts."""
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def sessions(self, *, year: int | None = None, round_slug: str | None = None) -> List[Dict[str, Any]]:
+        where, params = _filters(year=year, round=round_slug)
+        return self.query(f"SELECT * FROM sessions{where} ORDER BY year, round, session", params)
+
+    def corner_metric(
+        self,
+        round_slug: str,
+        corner: int,
+        metric: str = "apex_speed",
+        *,
+        year: int | None = None,
+        session: str | None = None,
+        drivers: Iterable[str] | None = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        One corner's ``metric`` (a ``METRIC_COLUMNS`` name) for every stored lap at
+        ``round_slug``, as rows of year, round, session, driver, lap_number and value.
+        """
+        if metric not in METRIC_COLUMNS:
+            raise ValueError(f"Unknown corner metric {metric!r}; expected one of {', '.join(METRIC_COLUMNS)}")
+        where, params = _filters(round=round_slug, corner=corner, year=year, session=session, driver=_codes(drivers))
+        return self.query(
+            f"SELECT year, round, session, driver, lap_number, {metric} AS value FROM corners{where} "
+            "ORDER BY year, session, driver, lap_number",
+            params,
+        )
+
+    def best_laps(
+        self,
+        *,
+        year: int | None = None,
+        round_slug: str | None = None,
+        session: str | None = None,
+        drivers: Iterable[str] | None = None,
+        valid_only: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """Each driver's fastest lap per matching session, fastest first within a session."""
+        where, params = _filters(year=year, round=round_slug, session=session, driver=_codes(drivers))
+        condition = "lap_time IS NOT NULL" + (" AND is_valid = 1" if valid_only else "")
+        where = f"{where} AND {condition}" if where else f" WHERE {condition}"
+        return self.query(
+            "SELECT year, round, session, driver, lap_number, MIN(lap_time) AS lap_time, compound "
+            f"FROM laps{where} GROUP BY year, round, session, driver ORDER BY year, round, session, lap_time",
+            params,
+        )
+
+
+def _codes(drivers: Iterable[str] | None) -> List[str] | None:
+    return [code.upper() for code in drivers] if drivers else None
+
+
+def _filters(**values: Any) -> Tuple[str, List[Any]]:
+    """A WHERE clause matching every non-None value (iterables match any of their items)."""
+    clauses, params = [], []
+    for column, value in values.items():
+        if value is None:
+            continue
+        if not isinstance(value, (str, int)):
+            items = list(value)
+            clauses.append(f"{column} IN ({', '.join('?' * len(items))})")
+            params.extend(items)
+        else:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
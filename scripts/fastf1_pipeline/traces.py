@@ -0,0 +1,181 @@
+"""
+Lap trace stage: downsampled speed and time-delta traces written to ``laps.json``.
+
+Each driver's fastest clean lap is resampled onto the shared distance grid
+(all drivers in one batch) and compared with the session's fastest lap: the
+delta trace is ``Time_s(driver) - Time_s(reference)`` at every grid point, so
+its slope shows where time is gained or lost. Full-resolution traces are a
+few thousand points per driver; they are cut to a point budget with
+Largest-Triangle-Three-Buckets (LTTB), which keeps the peaks and kinks a line
+chart needs, and written as parallel distance/value arrays. Mini-sector
+deltas (time lost in each of ``mini_sectors`` equal slices of the lap) come
+from the full-resolution trace.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Sequence
+
+from ._lazy import lazy_import
+from .corners import clean_number, corner_engine, lap_number, representative_laps
+from .fetch import FetchResult
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+# Bump whenever build_laps_payload output changes; incremental builds key on it.
+TRACES_VERSION = 1
+
+_DISTANCE_DECIMALS = 1
+_DELTA_DECIMALS = 3
+_SPEED_DECIMALS = 1
+
+
+def lttb_indices(x: "np.ndarray", y: "np.ndarray", n_out: int) -> "np.ndarray":
+    """
+    Indices of the ``n_out`` points Largest-Triangle-Three-Buckets keeps from
+    the series (x, y). The first and last points are always kept; every other
+    kept point is the one in its bucket that spans the largest triangle with
+    the previously kept point and the mean of the next bucket.
+    """
+    n = len(x)
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 3:
+        return np.array([0, n - 1][:max(n_out, 0)], dtype=np.intp)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    every = (n - 2) / (n_out - 2)
+    edges = np.floor(np.arange(n_out - 1) * every).astype(np.intp) + 1  # bucket b is [edges[b], edges[b + 1])
+    edges[-1] = n - 1
+    # mean of each bucket, with the last point standing in as the bucket after the last
+    sums_x = np.add.reduceat(x[: n - 1], edges[:-1])
+    sums_y = np.add.reduceat(y[: n - 1], edges[:-1])
+    counts = np.diff(edges)
+    next_x = np.append(sums_x[1:] / counts[1:], x[-1])
+    next_y = np.append(sums_y[1:] / counts[1:], y[-1])
+
+    kept = np.empty(n_out, dtype=np.intp)
+    kept[0], kept[-1] = 0, n - 1
+    a = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        area = np.abs((x[a] - next_x[b]) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (next_y[b] - y[a]))
+        a = lo + int(np.argmax(area))
+        kept[b + 1] = a
+    return kept
+
+
+def downsample_trace(distance: "np.ndarray", values: "np.ndarray", max_points: int, decimals: int) -> Dict[str, List[float]]:
+    """An LTTB-reduced trace as compact, rounded ``distance`` / ``values`` lists."""
+    keep = lttb_indices(distance, values, max_points)
+    return {
+        "distance": np.round(distance[keep], _DISTANCE_DECIMALS).tolist(),
+        "values": np.round(values[keep], decimals).tolist(),
+    }
+
+
+def max_reconstruction_error(distance: "np.ndarray", values: "np.ndarray", trace: Dict[str, List[float]]) -> float:
+    """Largest absolute gap between the full trace and the linear interpolation of its downsampled form."""
+    rebuilt = np.interp(distance, trace["distance"], trace["values"])
+    return float(np.max(np.abs(rebuilt - values))) if len(values) else 0.0
+
+
+def mini_sector_deltas(distance: "np.ndarray", delta: "np.ndarray", lap_length: float, count: int) -> List[Any]:
+    """Time lost (positive) or gained in each of ``count`` equal-length slices of the lap."""
+    if count <= 0 or len(distance) < 2:
+        return []
+    edges = np.linspace(0.0, min(lap_length, float(distance[-1])), count + 1)
+    at_edges = np.interp(edges, distance, delta)
+    return [clean_number(float(v)) for v in np.round(np.diff(at_edges), _DELTA_DECIMALS)]
+
+
+def _empty_payload(meta: Dict[str, Any], note: str) -> Dict[str, Any]:
+    return {"meta": meta, "reference": None, "drivers": {}, "notes": [note]}
+
+
+def build_laps_payload(
+    fetch_result: FetchResult,
+    *,
+    drivers: Iterable[str] | None = None,
+    dist_step: float = 2.0,
+    max_points: int = 400,
+    mini_sectors: int = 25,
+) -> Dict[str, Any]:
+    """
+    Convert a telemetry-loaded FastF1 session into the ``laps.json`` payload.
+
+    Every driver gets a speed trace and a delta-to-reference trace of at most
+    ``max_points`` points each (``distance`` in metres, ``values`` in km/h or
+    seconds; positive delta means behind the reference) plus ``miniSectors``.
+    """
+    identifier = fetch_result.identifier
+    selected_drivers: Sequence[str] | None = [d.upper() for d in drivers] if drivers else None
+
+    meta = {
+        "year": identifier.year,
+        "round": identifier.round_slug,
+        "session": identifier.session_code,
+        "generatedAt": datetime.now(timezone.utc).isoformat(),
+        "status": fetch_result.status,
+        "version": TRACES_VERSION,
+        "distStep": dist_step,
+        "maxPoints": max_points,
+        "miniSectors": mini_sectors,
+    }
+
+    if fetch_result.status != "ok" or fetch_result.session is None or pd is None:
+        return _empty_payload(meta, fetch_result.message or "Session unavailable")
+
+    laps_df = getattr(fetch_result.session, "laps", None)
+    if laps_df is None or laps_df.empty:
+        return _empty_payload(meta, "No lap data returned by fastf1 for this session.")
+
+    codes = list(dict.fromkeys(laps_df["Driver"].tolist()))
+    if selected_drivers:
+        codes = [code for code in codes if code in selected_drivers]
+
+    picks = [(code, representative_laps(laps_df, code, 1)) for code in codes]
+    picks = [(code, laps.iloc[0]) for code, laps in picks if not laps.empty]
+    if not picks:
+        return _empty_payload(meta, "No clean laps available for lap traces.")
+
+    engine = corner_engine()
+    tels = [engine.with_distance(lap.get_car_data()) for _, lap in picks]
+    batch = engine.resample_laps_to_common_distance(tels, step=dist_step, channels=["Speed", "Time_s"])
+    del tels
+    speed_c, time_c = batch.channels.index("Speed"), batch.channels.index("Time_s")
+
+    usable = [i for i in range(len(picks)) if batch.valid[i].any()]
+    if not usable:
+        return _empty_payload(meta, "No lap has usable telemetry.")
+    ref = min(usable, key=lambda i: picks[i][1]["LapTime"])
+    ref_valid = batch.valid[ref]
+    ref_length = float(batch.grid[ref_valid][-1])
+
+    def lap_info(i: int) -> Dict[str, Any]:
+        lap = picks[i][1]
+        return {"lapNumber": lap_number(lap), "lapTimeSeconds": clean_number(lap["LapTime"].total_seconds())}
+
+    drivers_payload: Dict[str, Dict[str, Any]] = {}
+    for i in usable:
+        valid = batch.valid[i]
+        distance = batch.grid[valid]
+        speed = batch.data[i, speed_c, valid].astype(float)
+        both = valid & ref_valid
+        delta_distance = batch.grid[both]
+        delta = (batch.data[i, time_c, both] - batch.data[ref, time_c, both]).astype(float)
+        drivers_payload[picks[i][0]] = dict(
+            lap_info(i),
+            speed=downsample_trace(distance, speed, max_points, _SPEED_DECIMALS),
+            delta=downsample_trace(delta_distance, delta, max_points, _DELTA_DECIMALS),
+            miniSectors=mini_sector_deltas(delta_distance, delta, ref_length, mini_sectors),
+        )
+
+    return {
+        "meta": meta,
+        "reference": dict(lap_info(ref), driver=picks[ref][0], lengthMeters=round(ref_length, _DISTANCE_DECIMALS)),
+        "drivers": drivers_payload,
+        "notes": [],
+    }
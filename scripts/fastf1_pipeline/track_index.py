@@ -0,0 +1,155 @@
+"""
+Per-circuit corner reference index built from ``corners.json`` artifacts.
+
+Corner detection is a heuristic run on every lap, so corner counts and
+numbering drift between drivers and sessions. This stage pools the corner
+windows of every lap recorded for a circuit, clusters them by apex distance
+and stores the consensus corners in ``public/data/track_corners.json``::
+
+    {
+      "version": 1,
+      "tracks": {
+        "monaco": {
+          "key": "<sha256>",
+          "lapCount": 60,
+          "sources": ["2024/monaco/Q", ...],
+          "corners": [{"number": 1, "dStart": 120.0, "dApex": 180.0, "dEnd": 230.0, "support": 0.97}, ...]
+        }
+      }
+    }
+
+Later corner builds segment laps against these fixed windows with
+``np.searchsorted`` (see ``f1_corners.segment_by_corner_index``), so every
+driver's corner N is the same stretch of track.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from ._lazy import lazy_import
+from .corners import corner_engine
+
+# numpy is imported on first use; it ships with pandas/fastf1
+np = lazy_import("numpy")
+
+TRACK_INDEX_VERSION = 1
+
+_DISTANCE_DECIMALS = 1
+
+
+def lap_windows(corners_payload: Dict[str, Any]) -> List[List[Tuple[float, float, float]]]:
+    """(d_start, d_apex, d_end) per corner for every driver lap in a ``corners.json`` payload."""
+    windows = []
+    for laps in (corners_payload.get("drivers") or {}).values():
+        for lap in laps:
+            rows = [
+                (corner["d_start"], corner["d_apex"], corner["d_end"])
+                for corner in lap.get("corners", [])
+                if None not in (corner.get("d_start"), corner.get("d_apex"), corner.get("d_end"))
+            ]
+            if rows:
+                windows.append(rows)
+    return windows
+
+
+def collect_corner_payloads(sessions_root: Path, track_id: str) -> List[Tuple[str, Dict[str, Any]]]:
+    """Every ``<year>/<track_id>/<session>/corners.json`` under ``sessions_root`` as (source id, payload)."""
+    found = []
+    for path in sorted(sessions_root.glob(f"*/{track_id}/*/corners.json")):
+        try:
+            payload = json.loads(path.read_text())
+        except (OSError, ValueError):
+            continue
+        found.append((path.parent.relative_to(sessions_root).as_posix(), payload))
+    return found
+
+
+def build_track_entry(
+    sources: Sequence[Tuple[str, Dict[str, Any]]],
+    *,
+    tol_m: float = 25.0,
+    min_support: float = 0.5,
+) -> Dict[str, Any] | None:
+    """Consensus corners for one circuit, or None when no source has corner data."""
+    windows = [rows for _, payload in sources for rows in lap_windows(payload)]
+    if not windows:
+        return None
+    index = corner_engine().build_corner_index(windows, tol_m=tol_m, min_support=min_support)
+    corners = [
+        {
+            "number": number,
+            "dStart": round(float(start), _DISTANCE_DECIMALS),
+            "dApex": round(float(apex), _DISTANCE_DECIMALS),
+            "dEnd": round(float(end), _DISTANCE_DECIMALS),
+            "support": round(float(support), 3),
+        }
+        for number, (start, apex, end, support) in enumerate(zip(*index), start=1)
+    ]
+    key = hashlib.sha256(json.dumps(corners, sort_keys=True).encode("utf-8")).hexdigest()
+    return {
+        "key": key,
+        "lapCount": len(windows),
+        "sources": [source for source, _ in sources],
+        "tolM": tol_m,
+        "minSupport": min_support,
+        "corners": corners,
+    }
+
+
+def corner_index_from_entry(entry: Dict[str, Any]) -> Any:
+    """The ``f1_corners.CornerIndex`` stored in a track entry."""
+    engine = corner_engine()
+    corners = entry.get("corners", [])
+    columns = [[corner[field] for corner in corners] for field in ("dStart", "dApex", "dEnd", "support")]
+    return engine.CornerIndex(*(np.asarray(column, dtype=float) for column in columns))
+
+
+def load_track_index(path: Path) -> Dict[str, Dict[str, Any]]:
+    """Track entries keyed by track id; empty when the file is missing, unreadable or outdated."""
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != TRACK_INDEX_VERSION:
+        return {}
+    return data.get("tracks", {})
+
+
+def load_track_entry(path: Path, track_id: str) -> Dict[str, Any] | None:
+    entry = load_track_index(path).get(track_id)
+    if not entry or not entry.get("corners"):
+        return None
+    return entry
+
+
+def update_track_index(path: Path, entries: Dict[str, Dict[str, Any]], *, indent: int | None = None) -> Path:
+    """Merge ``entries`` into the index file, replacing those tracks, and write it atomically."""
+    tracks = load_track_index(path)
+    tracks.update(entries)
+    data = {"version": TRACK_INDEX_VERSION, "tracks": dict(sorted(tracks.items()))}
+    separators = (",", ":") if indent is None else None
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(data, indent=indent, separators=separators))
+    tmp_path.replace(path)
+    return path
+
+
+def build_track_index(
+    sessions_root: Path,
+    track_ids: Iterable[str],
+    *,
+    tol_m: float = 25.0,
+    min_support: float = 0.5,
+) -> Dict[str, Dict[str, Any]]:
+    """Track entries for every id in ``track_ids`` that has at least one ``corners.json``."""
+    entries = {}
+    for track_id in track_ids:
+        entry = build_track_entry(collect_corner_payloads(sessions_root, track_id), tol_m=tol_m, min_support=min_support)
+        if entry is not None:
+            entries[track_id] = entry
+    return entries
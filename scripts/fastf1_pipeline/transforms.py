@@ -1,29 +1,15 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Dict, Iterable, List, Sequence, Set
+from typing import Any, Dict, Iterable, Iterator, List, Sequence
 
+from ._lazy import lazy_import
 from .fetch import FetchResult
 
-try:
-    import pandas as pd  # type: ignore
-except ImportError:  # pragma: no cover - allows running without pandas when FastF1 absent
-    pd = None  # type: ignore
-
-
-def _timedelta_to_seconds(value: Any) -> float | None:
-    if value is None:
-        return None
-    if pd is not None:
-        if pd.isna(value):
-            return None
-        if isinstance(value, pd.Timedelta):
-            return float(value.total_seconds())
-    try:
-        total_seconds = value.total_seconds()  # type: ignore[attr-defined]
-        return float(total_seconds)
-    except AttributeError:
-        return None
+# pandas is imported on first use; None when it is not installed (FastF1 absent)
+pd = lazy_import("pandas")
+np = lazy_import("numpy")
 
 
 def _safe_int(value: Any) -> int | None:
@@ -37,23 +23,60 @@ def _safe_int(value: Any) -> int | None:
         return None
 
 
-def _stringify_track_status(value: Any) -> str | None:
-    if value is None:
-        return None
-    if pd is not None and pd.isna(value):
-        return None
-    text = str(value)
-    if text.endswith(".0"):
-        text = text[:-2]
-    return text or None
+def _column_values(laps_df: "pd.DataFrame", column: str, default: Any) -> List[Any]:
+    if column not in laps_df.columns:
+        return [default] * len(laps_df)
+    return laps_df[column].tolist()
 
 
-def _extract_status_codes(track_status: str | None) -> Set[str]:
-    if not track_status:
-        return set()
-    return {ch for ch in track_status if ch.isdigit()}
+def _column_truthy(laps_df: "pd.DataFrame", column: str, default: bool) -> "pd.Series":
+    if column not in laps_df.columns:
+        return pd.Series(default, index=laps_df.index, dtype=bool)
+    return laps_df[column].astype(bool)
 
 
+def _column_seconds(laps_df: "pd.DataFrame", column: str) -> "pd.Series":
+    """
+    Timedelta column as float seconds, NaN when missing.
+
+    Mirrors ``pd.Timedelta.total_seconds()`` (whole seconds plus microseconds / 1e6)
+    rather than ``.dt.total_seconds()``, which rounds differently in the last digit
+    and would change the serialised JSON.
+    """
+    if column not in laps_df.columns:
+        return pd.Series(float("nan"), index=laps_df.index)
+    td = pd.to_timedelta(laps_df[column])
+    micros = td.to_numpy(dtype="timedelta64[ns]").view("int64") // 1000
+    whole_seconds = micros // 1_000_000
+    seconds = whole_seconds.astype(float) + (micros - whole_seconds * 1_000_000) / 1_000_000
+    return pd.Series(seconds, index=laps_df.index).where(td.notna())
+
+
+def _column_ints(laps_df: "pd.DataFrame", column: str) -> List[int | None]:
+    if column not in laps_df.columns:
+        return [None] * len(laps_df)
+    values = laps_df[column]
+    if values.dtype.kind in "iu":
+        return values.tolist()
+    if values.dtype.kind == "f":
+        missing = values.isna()
+        ints = values.fillna(0).astype("int64").astype(object)
+        return ints.where(~missing, None).tolist()
+    return [_safe_int(value) for value in values.tolist()]
+
+
+def _column_track_status(laps_df: "pd.DataFrame") -> "pd.Series":
+    """Track status as text ('1', '26', ...) with a trailing '.0' removed, None when missing."""
+    if "TrackStatus" not in laps_df.columns:
+        return pd.Series([None] * len(laps_df), index=laps_df.index, dtype=object)
+    raw = laps_df["TrackStatus"]
+    text = raw.astype(str).str.replace(r"\.0$", "", regex=True)
+    return text.astype(object).where(raw.notna() & (text != ""), None)
+
+
+# Bump whenever build_session_payload output changes; incremental builds key on it.
+PAYLOAD_VERSION = 3
+
 OUTLIER_FLAGS = {
     "out-lap",
     "in-lap",
@@ -67,14 +90,182 @@ OUTLIER_FLAGS = {
     "missing-laptime",
 }
 
+# Emission order of lap flags; bit i of a lap's flag mask stands for _FLAG_ORDER[i].
+_FLAG_ORDER = [
+    "missing-laptime",
+    "deleted",
+    "inaccurate",
+    "out-lap",
+    "in-lap",
+    "formation-lap",
+    "yellow-flag",
+    "safety-car",
+    "virtual-safety-car",
+    "red-flag",
+]
+_FLAG_BITS = {flag: 1 << bit for bit, flag in enumerate(_FLAG_ORDER)}
+_OUTLIER_MASK = sum(_FLAG_BITS[flag] for flag in OUTLIER_FLAGS)
+
+# Track status digits that raise a flag.
+_TRACK_STATUS_FLAGS = [
+    ("yellow-flag", "2"),
+    ("safety-car", "34"),
+    ("virtual-safety-car", "56"),
+    ("red-flag", "789"),
+]
+
+
+def _track_status_bits(track_status: str | None) -> int:
+    if not isinstance(track_status, str) or not track_status:
+        return 0
+    bits = 0
+    for flag, codes in _TRACK_STATUS_FLAGS:
+        if any(code in track_status for code in codes):
+            bits |= _FLAG_BITS[flag]
+    return bits
+
+
+def _flags_from_bits(bits: int) -> List[str]:
+    return [flag for flag in _FLAG_ORDER if bits & _FLAG_BITS[flag]]
+
+
+# Missing integers (lap number, stint, tyre life) are stored as this value in LapTable.
+_MISSING_INT = -(2**31)
+
+
+def _int_array(values: List[int | None]) -> "np.ndarray":
+    return np.asarray([_MISSING_INT if value is None else value for value in values], dtype=np.int32)
+
+
+def _int_list(array: "np.ndarray") -> List[int | None]:
+    return [None if value == _MISSING_INT else value for value in array.tolist()]
+
+
+def _float_list(array: "np.ndarray") -> List[float | None]:
+    return [None if value != value else value for value in array.tolist()]
+
+
+# Lap dict keys in session.json order.
+_LAP_FIELDS = (
+    "driver",
+    "lapNumber",
+    "stint",
+    "compound",
+    "tyreLife",
+    "lapTimeSeconds",
+    "sectorTimesSeconds",
+    "isPersonalBest",
+    "trackStatus",
+    "hasData",
+    "flags",
+    "isValid",
+)
+
+
+@dataclass(slots=True)
+class LapTable:
+    """
+    A session's laps as one array per field (struct of arrays) instead of one
+    dict per lap. ``flags`` is a uint16 bitmask over ``_FLAG_ORDER``; missing
+    times are NaN and missing integers ``_MISSING_INT``. String and
+    ``hasData`` columns are object arrays holding the original values. Lap
+    dicts are only built by ``to_json`` (or per lap by indexing), so
+    ``session.json`` comes out exactly as before.
+    """
+
+    driver: "np.ndarray"
+    lap_number: "np.ndarray"
+    stint: "np.ndarray"
+    compound: "np.ndarray"
+    tyre_life: "np.ndarray"
+    lap_time: "np.ndarray"
+    sectors: "np.ndarray"  # (n_laps, 3) float64
+    is_personal_best: "np.ndarray"
+    track_status: "np.ndarray"
+    has_data: "np.ndarray"
+    flags: "np.ndarray"
+    is_valid: "np.ndarray"
+
+    def __len__(self) -> int:
+        return len(self.driver)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self.iter_json()
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        if index < 0:
+            index += len(self)
+        return self._rows(index, index + 1).to_json()[0]
+
+    def _rows(self, start: int, stop: int) -> "LapTable":
+        return LapTable(*(getattr(self, name)[start:stop] for name in self.__slots__))
+
+    def column(self, field: str) -> List[Any]:
+        """One ``session.json`` lap field for every lap, as the values the lap dicts hold."""
+        if field == "driver":
+            return self.driver.tolist()
+        if field == "lapNumber":
+            return _int_list(self.lap_number)
+        if field == "stint":
+            return _int_list(self.stint)
+        if field == "compound":
+            return self.compound.tolist()
+        if field == "tyreLife":
+            return _int_list(self.tyre_life)
+        if field == "lapTimeSeconds":
+            return _float_list(self.lap_time)
+        if field == "sectorTimesSeconds":
+            return [[None if v != v else v for v in row] for row in self.sectors.tolist()]
+        if field == "isPersonalBest":
+            return self.is_personal_best.tolist()
+        if field == "trackStatus":
+            return self.track_status.tolist()
+        if field == "hasData":
+            return self.has_data.tolist()
+        if field == "flags":
+            names = {int(b): _flags_from_bits(int(b)) for b in np.unique(self.flags)}
+            return [list(names[b]) for b in self.flags.tolist()]
+        if field == "isValid":
+            return self.is_valid.tolist()
+        raise KeyError(field)
+
+    def to_json(self) -> List[Dict[str, Any]]:
+        """The ``laps`` list of ``session.json``."""
+        return [dict(zip(_LAP_FIELDS, values)) for values in zip(*(self.column(field) for field in _LAP_FIELDS))]
+
+    def iter_json(self, chunk: int = 1024) -> Iterator[Dict[str, Any]]:
+        """The ``to_json`` records, built ``chunk`` laps at a time (for streaming writers)."""
+        for start in range(0, len(self), chunk):
+            yield from self._rows(start, start + chunk).to_json()
+
 
 def build_session_payload(
     fetch_result: FetchResult,
     *,
     drivers: Iterable[str] | None = None,
+    corners_file: bool = False,
 ) -> Dict[str, Any]:
     """
     Convert FastF1 fetch result into a serialisable JSON payload for the UI.
+    ``corners_file`` says the corners stage writes ``corners.json`` alongside;
+    the notes then point readers at it.
+    """
+    payload = build_session_tables(fetch_result, drivers=drivers, corners_file=corners_file)
+    if isinstance(payload["laps"], LapTable):
+        payload["laps"] = payload["laps"].to_json()
+    return payload
+
+
+def build_session_tables(
+    fetch_result: FetchResult,
+    *,
+    drivers: Iterable[str] | None = None,
+    corners_file: bool = False,
+) -> Dict[str, Any]:
+    """
+    ``build_session_payload`` with ``laps`` left as a ``LapTable`` (an empty list
+    when the session has no laps). The pipeline writes this form: ``write_json``
+    streams the table and ``to_columnar`` reads its columns directly.
     """
     identifier = fetch_result.identifier
     selected_drivers: Sequence[str] | None = [d.upper() for d in drivers] if drivers else None
@@ -140,86 +331,51 @@ def build_session_payload(
             "defaultCompound": getattr(row, "Compound", None),
         }
 
-    lap_entries: List[Dict[str, Any]] = []
     total_laps = int(len(laps_df))
-    valid_laps = 0
-    outlier_laps = 0
-
     is_race_session = getattr(session, "session_type", "").upper() == "R"
 
-    for row in laps_df.itertuples(index=False):
-        driver_code = getattr(row, "Driver")
-        lap_number = _safe_int(getattr(row, "LapNumber"))
-        lap_time_seconds = _timedelta_to_seconds(getattr(row, "LapTime", None))
-        track_status_raw = _stringify_track_status(getattr(row, "TrackStatus", None))
-        status_codes = _extract_status_codes(track_status_raw)
-
-        flags: List[str] = []
-
-        if lap_time_seconds is None:
-            flags.append("missing-laptime")
-
-        if bool(getattr(row, "Deleted", False)):
-            flags.append("deleted")
-
-        if not bool(getattr(row, "IsAccurate", True)):
-            flags.append("inaccurate")
-
-        if pd is not None and "PitOutTime" in laps_df.columns:
-            if pd.notna(getattr(row, "PitOutTime", None)):
-                flags.append("out-lap")
-
-        if pd is not None and "PitInTime" in laps_df.columns:
-            if pd.notna(getattr(row, "PitInTime", None)):
-                flags.append("in-lap")
-
-        if is_race_session and lap_number == 1:
-            flags.append("formation-lap")
-
-        if "2" in status_codes:
-            flags.append("yellow-flag")
-        if "3" in status_codes or "4" in status_codes:
-            flags.append("safety-car")
-        if "5" in status_codes or "6" in status_codes:
-            flags.append("virtual-safety-car")
-        if any(code in status_codes for code in {"7", "8", "9"}):
-            flags.append("red-flag")
-
-        seen: List[str] = []
-        for flag in flags:
-            if flag not in seen:
-                seen.append(flag)
-        flags = seen
-
-        is_valid = lap_time_seconds is not None and not any(flag in OUTLIER_FLAGS for flag in flags)
-
-        if is_valid:
-            valid_laps += 1
-        else:
-            outlier_laps += 1
-
-        lap_entries.append(
-            {
-                "driver": driver_code,
-                "lapNumber": lap_number,
-                "stint": _safe_int(getattr(row, "Stint")),
-                "compound": getattr(row, "Compound", None),
-                "tyreLife": _safe_int(getattr(row, "TyreLife")),
-                "lapTimeSeconds": lap_time_seconds,
-                "sectorTimesSeconds": [
-                    _timedelta_to_seconds(getattr(row, "Sector1Time", None)),
-                    _timedelta_to_seconds(getattr(row, "Sector2Time", None)),
-                    _timedelta_to_seconds(getattr(row, "Sector3Time", None)),
-                ],
-                "isPersonalBest": bool(getattr(row, "IsPersonalBest", False)),
-                "trackStatus": track_status_raw,
-                "hasData": getattr(row, "IsAccurate", True),
-                "flags": flags,
-                "isValid": is_valid,
-            }
-        )
+    lap_times = _column_seconds(laps_df, "LapTime")
+    lap_numbers = _column_ints(laps_df, "LapNumber")
+    lap_number_series = pd.Series(lap_numbers, index=laps_df.index, dtype=object)
+    track_status = _column_track_status(laps_df)
+
+    # Flags are built column-wise as a bitmask per lap, then decoded once per distinct mask.
+    flag_masks = {
+        "missing-laptime": lap_times.isna(),
+        "deleted": _column_truthy(laps_df, "Deleted", False),
+        "inaccurate": ~_column_truthy(laps_df, "IsAccurate", True),
+        "out-lap": laps_df["PitOutTime"].notna() if "PitOutTime" in laps_df.columns else None,
+        "in-lap": laps_df["PitInTime"].notna() if "PitInTime" in laps_df.columns else None,
+        "formation-lap": lap_number_series.eq(1) if is_race_session else None,
+    }
+
+    # Only a handful of distinct status strings occur per session, so decode each once.
+    status_bits = {status: _track_status_bits(status) for status in track_status.unique()}
+    bits = track_status.map(status_bits).astype("int64")
+    for flag, mask in flag_masks.items():
+        if mask is not None:
+            bits = bits | (mask.to_numpy(dtype=bool).astype("int64") * _FLAG_BITS[flag])
+
+    valid_mask = (bits.to_numpy() & _OUTLIER_MASK == 0) & lap_times.notna().to_numpy()
+    valid_laps = int(valid_mask.sum())
+    outlier_laps = total_laps - valid_laps
+
+    lap_table = LapTable(
+        driver=np.asarray(_column_values(laps_df, "Driver", None), dtype=object),
+        lap_number=_int_array(lap_numbers),
+        stint=_int_array(_column_ints(laps_df, "Stint")),
+        compound=np.asarray(_column_values(laps_df, "Compound", None), dtype=object),
+        tyre_life=_int_array(_column_ints(laps_df, "TyreLife")),
+        lap_time=lap_times.to_numpy(dtype=float),
+        sectors=np.column_stack([_column_seconds(laps_df, f"Sector{k}Time").to_numpy(dtype=float) for k in (1, 2, 3)]),
+        is_personal_best=_column_truthy(laps_df, "IsPersonalBest", False).to_numpy(dtype=bool),
+        track_status=np.asarray(track_status.tolist(), dtype=object),
+        has_data=np.asarray(_column_values(laps_df, "IsAccurate", True), dtype=object),
+        flags=bits.to_numpy().astype(np.uint16),
+        is_valid=valid_mask,
+    )
 
-    # Corner-level telemetry not yet implemented; include empty arrays with a note.
+    # Corner metrics live in corners.json (corners stage); the map stays for existing readers.
     corners_payload = {code: [] for code in drivers_payload.keys()}
 
     meta["totalLapCount"] = total_laps
@@ -233,7 +389,8 @@ def build_session_payload(
         notes.append(
             f"Flagged {outlier_laps} of {total_laps} laps as outliers (out laps, safety car periods, yellow flags, etc.)."
         )
-    notes.append("Corner-level telemetry aggregation not yet implemented; arrays are placeholders.")
+    if corners_file:
+        notes.append("Per-corner metrics are in corners.json alongside this file.")
 
     event = getattr(session, "event", None)
     event_name = getattr(event, "EventName", None) if event is not None else None
@@ -251,7 +408,7 @@ def build_session_payload(
             "availableDrivers": list(drivers_payload.keys()),
         },
         "drivers": drivers_payload,
-        "laps": lap_entries,
+        "laps": lap_table,
         "corners": corners_payload,
         "notes": notes,
     }
@@ -0,0 +1,140 @@
+"""
+Streaming, atomic JSON writer for pipeline artifacts.
+
+``json.dumps`` of a whole session payload holds the object tree, every lap
+dict and the full output string at once, and ``write_text`` leaves a
+truncated file behind if the process dies mid-write. ``write_json`` instead
+walks the payload and writes it piece by piece into ``<name>.tmp`` next to
+the target, then renames it into place:
+
+  - dicts are written key by key,
+  - objects with ``iter_json()`` (``LapTable``) are streamed record by record
+    and lists longer than ``CHUNK_ITEMS`` are written in chunks of that size,
+  - everything else is encoded in one call, with ``to_json()`` objects
+    (``CornerTable``) converted on the way.
+
+With the stdlib backend the bytes are identical to
+``json.dumps(payload, indent=indent, separators=...)``. The ``orjson``
+backend (used when requested and installed) is about twice as fast but
+writes NaN as ``null``, keeps non-ASCII characters as UTF-8 and only
+supports ``indent`` None or 2; other indents fall back to the stdlib.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import io
+import json
+from itertools import islice
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Iterator
+
+JSON_BACKENDS = ("json", "orjson")
+
+# List items (or streamed records) encoded per call.
+CHUNK_ITEMS = 512
+
+_WRITE_BUFFER = 1 << 20
+
+
+def json_default(value: Any) -> Any:
+    """Serialise payload parts held in compact form (``LapTable``, ``CornerTable``) via their ``to_json``."""
+    to_json = getattr(value, "to_json", None)
+    if to_json is None:
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+    return to_json()
+
+
+def orjson_available() -> bool:
+    return importlib.util.find_spec("orjson") is not None
+
+
+def resolve_backend(backend: str, indent: int | None = None) -> str:
+    """The backend ``write_json`` will actually use for ``backend`` and ``indent``."""
+    if backend not in JSON_BACKENDS:
+        raise ValueError(f"Unknown JSON backend {backend!r}; expected one of {', '.join(JSON_BACKENDS)}")
+    if backend == "orjson" and (indent not in (None, 2) or not orjson_available()):
+        return "json"
+    return backend
+
+
+def _encoder(backend: str, indent: int | None) -> Callable[[Any], bytes]:
+    if backend == "orjson":
+        import orjson  # type: ignore
+
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return lambda value: orjson.dumps(value, default=json_default, option=option)
+    separators = (",", ":") if indent is None else None
+    encoder = json.JSONEncoder(indent=indent, separators=separators, default=json_default)
+    return lambda value: encoder.encode(value).encode("utf-8")
+
+
+class _Writer:
+    def __init__(self, handle: BinaryIO, indent: int | None, backend: str) -> None:
+        self.write = handle.write
+        self.indent = indent
+        self.encode = _encoder(backend, indent)
+        self.key_separator = b":" if indent is None else b": "
+
+    def _newline(self, level: int) -> bytes:
+        return b"" if self.indent is None else b"\n" + b" " * (self.indent * level)
+
+    def _reindent(self, text: bytes, level: int) -> bytes:
+        # encoded values are indented from column 0; JSON strings never contain raw newlines
+        return text if self.indent is None or not level else text.replace(b"\n", self._newline(level))
+
+    def value(self, value: Any, level: int) -> None:
+        if isinstance(value, dict):
+            self.mapping(value, level)
+        elif hasattr(value, "iter_json"):
+            self.sequence(value.iter_json(), level)
+        elif isinstance(value, (list, tuple)) and len(value) > CHUNK_ITEMS:
+            self.sequence(iter(value), level)
+        else:
+            self.write(self._reindent(self.encode(value), level))
+
+    def mapping(self, value: dict, level: int) -> None:
+        if not value:
+            self.write(b"{}")
+            return
+        self.write(b"{")
+        for position, (key, item) in enumerate(value.items()):
+            self.write((b"," if position else b"") + self._newline(level + 1))
+            self.write(self.encode(key if isinstance(key, str) else json.dumps(key)) + self.key_separator)
+            self.value(item, level + 1)
+        self.write(self._newline(level) + b"}")
+
+    def sequence(self, items: Iterator[Any], level: int) -> None:
+        wrote = False
+        while True:
+            chunk = list(islice(items, CHUNK_ITEMS))
+            if not chunk:
+                break
+            # the chunk encoded as a list, minus its brackets (and, indented, the closing newline)
+            inner = self.encode(chunk)[1:-1]
+            if self.indent is not None:
+                inner = self._reindent(inner[: inner.rindex(b"\n")], level)
+            self.write((b"," if wrote else b"[") + inner)
+            wrote = True
+        self.write(self._newline(level) + b"]" if wrote else b"[]")
+
+
+def write_json(path: Path, value: Any, *, indent: int | None = None, backend: str = "json") -> Path:
+    """Stream ``value`` as JSON into ``path`` via a temp file that is renamed into place when complete."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    try:
+        with tmp_path.open("wb", buffering=_WRITE_BUFFER) as handle:
+            _Writer(handle, indent, resolve_backend(backend, indent)).value(value, 0)
+        tmp_path.replace(path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return path
+
+
+def dumps(value: Any, *, indent: int | None = None, backend: str = "json") -> str:
+    """What ``write_json`` would write, as a string."""
+    buffer = io.BytesIO()
+    _Writer(buffer, indent, resolve_backend(backend, indent)).value(value, 0)
+    return buffer.getvalue().decode("utf-8")
@@ -4,23 +4,66 @@ Command line entry point for fetching FastF1 telemetry.
 
 Usage:
   python scripts/fetch_fastf1_data.py --year 2025 --round bahrain --session Q --drivers VER PER
+  python scripts/fetch_fastf1_data.py --year 2025 --round bahrain --session FP1 FP2 FP3 Q R --workers 5
+  python scripts/fetch_fastf1_data.py --year 2023-2025 --round monaco --session Q R
 """
 
 from __future__ import annotations
 
 import argparse
-import json
+from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
 from typing import List, Sequence
 
-from fastf1_pipeline import PipelineConfig, SessionIdentifier, build_session_payload, fetch_session
+from fastf1_pipeline import (
+    PipelineConfig,
+    SessionIdentifier,
+    build_corners_payload,
+    build_laps_payload,
+    fetch_session,
+)
+from fastf1_pipeline.fanout import run_fan_out
+from fastf1_pipeline.incremental import BuildManifest, BuildRecord, build_key, fingerprint_cache, output_id
+from fastf1_pipeline.reference import build_reference_pack
+from fastf1_pipeline.store import AnalyticsStore
+from fastf1_pipeline.transforms import build_session_tables
+from fastf1_pipeline.writer import resolve_backend
+
+
+@dataclass(slots=True)
+class SessionRun:
+    identifier: SessionIdentifier
+    status: str
+    message: str | None
+    output_dir: Path
+    written: List[str] = field(default_factory=list)
+    record: BuildRecord | None = None
+
+
+def parse_years(values: Sequence[str]) -> List[int]:
+    """Years and inclusive ranges, e.g. ``["2023-2025", "2019"]`` -> ``[2023, 2024, 2025, 2019]``."""
+    years: List[int] = []
+    for value in values:
+        start, _, end = value.partition("-")
+        try:
+            first, last = int(start), int(end or start)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid year or year range: {value!r}") from None
+        years.extend(range(first, last + 1) if first <= last else range(first, last - 1, -1))
+    return list(dict.fromkeys(years))
 
 
 def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Fetch and transform FastF1 telemetry into JSON assets.")
-    parser.add_argument("--year", type=int, required=True, help="Championship year, e.g. 2025")
-    parser.add_argument("--round", required=True, help="Round slug matching tracks.json (e.g. 'bahrain')")
-    parser.add_argument("--session", required=True, help="Session code (FP1, FP2, FP3, Q, R, SQ, etc.)")
+    parser.add_argument(
+        "--year",
+        nargs="+",
+        required=True,
+        help="Championship year(s) or inclusive ranges, e.g. 2025 or 2023-2025",
+    )
+    parser.add_argument("--round", nargs="+", required=True, help="Round slug(s) matching tracks.json (e.g. 'bahrain')")
+    parser.add_argument("--session", nargs="+", required=True, help="Session code(s) (FP1, FP2, FP3, Q, R, SQ, etc.)")
     parser.add_argument(
         "--drivers",
         nargs="*",
@@ -31,34 +74,189 @@ def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
         "--output",
         type=Path,
         default=None,
-        help="Override output directory (defaults to config output_dir/year/round/session)",
+        help="Override output directory (defaults to config output_dir/year/round/session; single session only)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Sessions fetched at the same time, each in its own process (default: 4).",
+    )
+    parser.add_argument(
+        "--indent",
+        type=int,
+        default=None,
+        help="Pretty-print session.json with this indent (default: compact JSON).",
+    )
+    parser.add_argument(
+        "--orjson",
+        action="store_true",
+        help="Write JSON with orjson when it is installed (faster; NaN is written as null).",
+    )
+    parser.add_argument(
+        "--no-columnar",
+        action="store_true",
+        help="Skip writing the columnar session.columnar.json artifact.",
+    )
+    parser.add_argument(
+        "--corners",
+        action="store_true",
+        help="Also load telemetry and write corners.json with per-driver corner metrics.",
+    )
+    parser.add_argument(
+        "--traces",
+        action="store_true",
+        help="Also load telemetry and write laps.json with downsampled speed and time-delta traces.",
     )
-    return parser.parse_args(argv)
+    parser.add_argument(
+        "--reference",
+        action="store_true",
+        help="Also load telemetry and write a reference-lap pack (every driver's fastest lap as one float32 array).",
+    )
+    parser.add_argument(
+        "--trace-points",
+        type=int,
+        default=400,
+        help="Point budget per downsampled trace in laps.json (default: 400).",
+    )
+    parser.add_argument(
+        "--no-track-index",
+        action="store_true",
+        help="Detect corners per lap even when the circuit has a track corner index entry.",
+    )
+    parser.add_argument(
+        "--store",
+        nargs="?",
+        type=Path,
+        const=True,
+        default=None,
+        metavar="PATH",
+        help="Also load the session into the SQLite analytics store (default path: cache/fastf1/analytics.sqlite).",
+    )
+    args = parser.parse_args(argv)
+    try:
+        args.year = parse_years(args.year)
+    except argparse.ArgumentTypeError as exc:
+        parser.error(str(exc))
+    if args.output is not None and len(args.year) * len(args.round) * len(args.session) > 1:
+        parser.error("--output needs a single --year, --round and --session")
+    return args
+
+
+def run_session(
+    identifier: SessionIdentifier,
+    config: PipelineConfig,
+    drivers: Sequence[str] | None = None,
+    output: Path | None = None,
+) -> SessionRun:
+    """
+    Fetch, transform and write one session. Safe to run in a worker process.
+
+    Builds into the default output directory carry a build record (keyed on
+    ``drivers`` too), so a later incremental bulk run rebuilds a filtered output.
+    """
+    cache_dir = config.resolve_cache(identifier.year, identifier.round_slug, identifier.session_code)
+    fetch_result = fetch_session(identifier, cache_dir, telemetry=config.needs_telemetry)
+    payload = build_session_tables(fetch_result, drivers=drivers, corners_file=config.build_corners)
+
+    output_dir = output or config.resolve_output(identifier.year, identifier.round_slug, identifier.session_code)
+    run = SessionRun(identifier, fetch_result.status, fetch_result.message, output_dir)
+    output_path = config.write_manifest(output_dir, payload)
+    track_entry = config.track_entry(identifier.round_slug) if config.build_corners else None
+    if config.build_corners:
+        corners_payload = build_corners_payload(fetch_result, drivers=drivers, track_entry=track_entry)
+        corners_path = config.write_corners(output_dir, corners_payload)
+        run.written.append(f"Wrote corner metrics to {corners_path}")
+    if config.build_traces:
+        laps_payload = build_laps_payload(fetch_result, drivers=drivers, max_points=config.trace_points)
+        laps_path = config.write_laps(output_dir, laps_payload)
+        run.written.append(f"Wrote lap traces to {laps_path}")
+    if config.build_reference:
+        pack = build_reference_pack(fetch_result, drivers=drivers)
+        if pack is not None:
+            reference_path = config.write_reference(
+                config.resolve_reference(identifier.year, identifier.round_slug, identifier.session_code), pack
+            )
+            run.written.append(f"Wrote reference-lap pack to {reference_path}")
+    run.written.append(f"Wrote session data to {output_path}")
+    if fetch_result.status == "ok" and output is None:
+        files = fingerprint_cache(cache_dir)
+        track_key = track_entry["key"] if track_entry else None
+        run.record = BuildRecord(
+            key=build_key(files, config=config, drivers=drivers, track_index=track_key),
+            files=files,
+            drivers=sorted(d.upper() for d in drivers) if drivers else None,
+        )
+    return run
 
 
 def main(argv: Sequence[str] | None = None) -> int:
     args = parse_args(argv)
-    config = PipelineConfig()
+    config = PipelineConfig(
+        json_indent=args.indent,
+        json_backend=resolve_backend("orjson" if args.orjson else "json", args.indent),
+        write_columnar=not args.no_columnar,
+        build_corners=args.corners,
+        build_traces=args.traces,
+        trace_points=args.trace_points,
+        build_reference=args.reference,
+        use_track_index=not args.no_track_index,
+    )
+    if args.orjson and config.json_backend != "orjson":
+        print("orjson is not installed or --indent is not 2; writing JSON with the standard library.")
 
-    identifier = SessionIdentifier(
-        year=args.year,
-        round_slug=args.round,
-        session_code=args.session.upper(),
+    identifiers = [
+        SessionIdentifier(year=year, round_slug=round_slug, session_code=code.upper())
+        for year in args.year
+        for round_slug in args.round
+        for code in args.session
+    ]
+    single = len(identifiers) == 1
+    results = run_fan_out(
+        identifiers,
+        partial(run_session, config=config, drivers=args.drivers, output=args.output),
+        workers=args.workers,
+        # FastF1's cache is process-wide, so concurrent sessions need their own processes
+        processes=not single and args.workers > 1,
+        on_progress=None if single else lambda progress: print(progress.to_text(), flush=True),
     )
 
-    cache_dir = config.resolve_cache(identifier.year, identifier.round_slug, identifier.session_code)
-    fetch_result = fetch_session(identifier, cache_dir)
-    payload = build_session_payload(fetch_result, drivers=args.drivers)
-
-    output_dir = args.output or config.resolve_output(identifier.year, identifier.round_slug, identifier.session_code)
-    output_dir.mkdir(parents=True, exist_ok=True)
-    output_path = output_dir / "session.json"
-    output_path.write_text(json.dumps(payload, indent=2))
-
-    print(f"Wrote session data to {output_path}")
-    if fetch_result.status != "ok":
-        print(f"Warning: fetch status = {fetch_result.status} ({fetch_result.message})")
-    return 0
+    records = {
+        output_id(r.identifier.year, r.identifier.round_slug, r.identifier.session_code): r.value.record
+        for r in results
+        if r.error is None and r.value.record is not None
+    }
+    if records:
+        manifest = BuildManifest.load(config.resolve_build_manifest())
+        for name, record in records.items():
+            manifest.update(name, record)
+        manifest.save()
+
+    store = None
+    if args.store:
+        store_path = config.resolve_analytics_store() if args.store is True else args.store
+        store = AnalyticsStore(store_path)
+    failed = 0
+    for result in results:
+        ident = result.identifier
+        label = "" if single else f"{ident.year} {ident.round_slug} {ident.session_code}: "
+        if result.error is not None:
+            failed += 1
+            print(f"{label}failed ({result.error})")
+            continue
+        run = result.value
+        for line in run.written:
+            print(f"{label}{line}")
+        if store is not None:
+            store.ingest_dir(run.output_dir)
+        if run.status != "ok":
+            print(f"{label}Warning: fetch status = {run.status} ({run.message})")
+    if store is not None:
+        store.close()
+        print(f"Loaded {len(results) - failed} session(s) into analytics store {store_path}")
+    if not single:
+        print(f"Fetched {len(results) - failed}/{len(results)} sessions.")
+    return 1 if failed else 0
 
 
 if __name__ == "__main__":
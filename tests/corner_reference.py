@@ -0,0 +1,90 @@
+"""
+Reference corner detectors and hand-built speed batches for the corner
+detection parity tests and benchmarks.
+
+detect_corners_reference is the per-sample while-loop detector that the
+vectorized f1_corners.detect_corners replaced, unchanged apart from the name.
+detect_lap_by_lap runs detect_corners on each lap of a (laps x grid) batch, the
+answer every detect_corners_batch engine must give.
+"""
+
+import numpy as np
+
+import f1_corners as fc
+
+
+def detect_corners_reference(speed_series, distance_series, min_drop_kmh=18.0, min_recovery_kmh=10.0, min_len_pts=4):
+    """The pre-vectorization detect_corners: descent and recovery scans sample by sample."""
+    sp = np.asarray(speed_series)
+    n = len(sp)
+    corners = []
+    i = 1
+    while i < n - 2:
+        # look for start of braking - negative gradient region
+        if sp[i-1] - sp[i] < 0.5:
+            i += 1
+            continue
+        # potential braking window
+        j = i
+        drop = 0.0
+        while j < n - 1 and sp[j] - sp[j+1] > 0:  # descending
+            drop += sp[j] - sp[j+1]
+            j += 1
+        if drop >= min_drop_kmh:
+            # j is at the apex index approx
+            apex_idx = j
+            # now find recovery
+            k = apex_idx
+            recover = 0.0
+            while k < n - 1 and recover < min_recovery_kmh and sp[k+1] - sp[k] >= -0.2:
+                recover += max(0.0, sp[k+1] - sp[k])
+                k += 1
+            start_idx = max(i - 1, 0)
+            end_idx = min(k + 1, n - 1)
+            if end_idx - start_idx >= min_len_pts:
+                corners.append({"start_idx": start_idx, "apex_idx": apex_idx, "end_idx": end_idx})
+            i = end_idx + 1
+        else:
+            i = j + 1
+    return corners
+
+
+def detect_lap_by_lap(speed, valid):
+    lengths = valid.sum(axis=1)
+    return [fc.detect_corners(speed[k, :n], np.arange(n, dtype=float)) for k, n in enumerate(lengths.tolist())]
+
+
+def python_kernel(speed, valid):
+    """The uncompiled sequential kernel (f1_corners._scan_laps), unpacked into per-lap corner dicts."""
+    offsets, start, apex, end = fc._scan_laps(
+        np.ascontiguousarray(speed, dtype=float), valid.sum(axis=1).astype(np.int64), 18.0, 10.0, 4
+    )
+    return [
+        [{"start_idx": int(start[c]), "apex_idx": int(apex[c]), "end_idx": int(end[c])} for c in range(offsets[k], offsets[k + 1])]
+        for k in range(len(offsets) - 1)
+    ]
+
+
+def noisy_batch(n_laps, n_grid, seed):
+    """Random-walk speed traces of random valid lengths."""
+    rng = np.random.default_rng(seed)
+    speed = 200.0 + np.cumsum(rng.normal(0.0, 4.0, (n_laps, n_grid)), axis=1)
+    lengths = rng.integers(0, n_grid + 1, n_laps)
+    valid = np.arange(n_grid) < lengths[:, None]
+    return speed, valid
+
+
+def edge_batch():
+    """Traces on the drop/recovery thresholds, with NaN gaps, plus laps too short to hold a corner."""
+    # drop of exactly 18 km/h and recovery of exactly 10 km/h, in 0.1 km/h steps
+    exact = np.concatenate([np.full(5, 250.0), 250.0 - np.arange(1, 181) * 0.1, 232.0 + np.arange(1, 101) * 0.1, np.full(5, 242.0)])
+    gappy = exact.copy()
+    gappy[[3, 60, 200]] = np.nan
+    rows = [exact, exact + 1e-9, exact - 1e-9, gappy]
+    lengths = [len(exact)] * len(rows)
+    for n in range(6):  # too short for a corner
+        short = np.full(len(exact), 300.0)
+        short[:n] = 250.0 - 20.0 * np.arange(n)
+        rows.append(short)
+        lengths.append(n)
+    return np.vstack(rows), np.arange(len(exact)) < np.asarray(lengths)[:, None]
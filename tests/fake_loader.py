@@ -0,0 +1,34 @@
+"""
+A fake session loader for the fan-out tests and benchmarks/session_fanout.py:
+it sleeps instead of calling session.load().
+"""
+
+import threading
+import time
+from collections import Counter
+
+from fastf1_pipeline.sessions import session_key
+
+
+class SleepingLoader:
+    """Sleeps for each session's load time and records per-key concurrency."""
+
+    def __init__(self, durations, fail=()):
+        self.durations = durations
+        self.fail = {session_key(identifier) for identifier in fail}
+        self.lock = threading.Lock()
+        self.active = Counter()
+        self.peak = Counter()
+
+    def __call__(self, identifier):
+        with self.lock:
+            self.active[identifier.year] += 1
+            self.peak[identifier.year] = max(self.peak[identifier.year], self.active[identifier.year])
+        try:
+            time.sleep(self.durations[session_key(identifier)])
+            if session_key(identifier) in self.fail:
+                raise RuntimeError("simulated load failure")
+            return identifier
+        finally:
+            with self.lock:
+                self.active[identifier.year] -= 1
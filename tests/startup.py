@@ -0,0 +1,60 @@
+"""
+Entry points with their import-time budgets and the heavy modules they must
+not import, plus an ``-X importtime`` profiler. Shared by the startup tests and
+benchmarks/import_time.py.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, NamedTuple, Set, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPTS = ROOT / "scripts"
+
+
+class Target(NamedTuple):
+    name: str
+    argv: List[str]         # arguments after ``python -X importtime``
+    cwd: Path
+    budget_ms: float
+    forbidden: Tuple[str, ...]
+
+
+TARGETS = [
+    Target("import fastf1_pipeline", ["-c", "import fastf1_pipeline"], SCRIPTS, 100.0,
+           ("fastf1", "matplotlib", "pandas", "numpy")),
+    Target("bulk_fetch_fastf1_data.py --help", [str(SCRIPTS / "bulk_fetch_fastf1_data.py"), "--help"], ROOT, 150.0,
+           ("fastf1", "matplotlib", "pandas", "numpy")),
+    Target("fetch_fastf1_data.py --help", [str(SCRIPTS / "fetch_fastf1_data.py"), "--help"], ROOT, 150.0,
+           ("fastf1", "matplotlib", "pandas", "numpy")),
+    Target("analysis_server.py --help", [str(SCRIPTS / "analysis_server.py"), "--help"], ROOT, 150.0,
+           ("fastf1", "matplotlib", "pandas", "numpy")),
+    Target("import f1_corners", ["-c", "import f1_corners"], ROOT, 1000.0,
+           ("fastf1", "matplotlib")),
+]
+
+
+def import_profile(target: Target) -> Tuple[float, Set[str]]:
+    """Milliseconds spent importing (top-level entries except ``site``) and every module imported."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *target.argv],
+        cwd=target.cwd,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total_us = 0
+    modules = set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue  # header row
+        module = name.strip()
+        modules.add(module)
+        top_level = len(name) - len(name.lstrip()) <= 1
+        if top_level and module != "site":
+            total_us += int(cumulative)
+    return total_us / 1000.0, modules
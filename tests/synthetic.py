@@ -0,0 +1,163 @@
+"""
+Synthetic, FastF1-shaped fixtures shared by the tests and the benchmarks.
+Everything is seeded and offline.
+
+synthetic_car_data() builds a lap of car data (Date/SessionTime/Time, RPM,
+Speed, nGear, Throttle, Brake, DRS, Source, Distance) on a fixed 5.3 km
+layout with TRACK_CORNERS as ground truth: speed follows braking and traction
+limits into and out of each apex, and samples arrive at car-data rate
+(~4 Hz) with a little sensor noise. synthetic_laps() builds the matching
+Laps frame, with rows that answer get_car_data(), for a whole field.
+"""
+
+import numpy as np
+import pandas as pd
+
+TRACK_LENGTH_M = 5300.0
+
+# (apex distance [m], apex speed [km/h]) of the synthetic circuit
+TRACK_CORNERS = [
+    (420.0, 95.0),
+    (780.0, 160.0),
+    (1350.0, 75.0),
+    (1720.0, 210.0),
+    (2240.0, 125.0),
+    (2650.0, 250.0),
+    (3100.0, 90.0),
+    (3480.0, 185.0),
+    (3950.0, 140.0),
+    (4400.0, 80.0),
+    (4820.0, 230.0),
+]
+
+V_MAX_KMH = 325.0
+BRAKE_MS2 = 45.0     # ~4.6 g
+ACCEL_MS2 = 9.0      # traction-limited exit
+CAR_DATA_HZ = 4.0
+
+
+def _speed_profile(distance, corners):
+    v = np.full(distance.shape, V_MAX_KMH / 3.6)
+    for apex_d, apex_kmh in corners:
+        apex = apex_kmh / 3.6
+        gap = distance - apex_d
+        rate = np.where(gap < 0, BRAKE_MS2, ACCEL_MS2)
+        limit = np.sqrt(apex ** 2 + 2 * rate * np.abs(gap))
+        v = np.minimum(v, limit)
+    return v
+
+
+def synthetic_car_data(seed=0, noise_kmh=0.8, jitter_m=4.0, session_start_s=3600.0):
+    """One lap of car data; apex positions and speeds vary slightly with the seed."""
+    rng = np.random.default_rng(seed)
+    corners = [
+        (d + rng.normal(0.0, jitter_m), v * (1.0 + rng.normal(0.0, 0.01)))
+        for d, v in TRACK_CORNERS
+    ]
+    fine = np.arange(0.0, TRACK_LENGTH_M, 0.5)
+    v = _speed_profile(fine, corners)
+    t_fine = np.concatenate(([0.0], np.cumsum(np.diff(fine) / v[1:])))
+
+    t = np.arange(0.0, t_fine[-1], 1.0 / CAR_DATA_HZ) + rng.uniform(0.0, 0.05)
+    t = t[t < t_fine[-1]]
+    d = np.interp(t, t_fine, fine)
+    speed = np.interp(t, t_fine, v) * 3.6 + rng.normal(0.0, noise_kmh, len(t))
+    accel = np.gradient(speed, t)
+    braking = accel < -15.0
+    throttle = np.clip(np.where(braking, 0.0, 100.0 * (0.3 + accel / 30.0)), 0.0, 100.0)
+    throttle[speed > V_MAX_KMH - 10.0] = 100.0
+    gear = np.clip(np.ceil(speed / 42.0), 1, 8)
+
+    return pd.DataFrame({
+        "Date": pd.Timestamp("2025-05-25 13:00:00") + pd.to_timedelta(session_start_s + t, unit="s"),
+        "SessionTime": pd.to_timedelta(session_start_s + t, unit="s"),
+        "Time": pd.to_timedelta(t, unit="s"),
+        "RPM": 4000.0 + speed * 30.0,
+        "Speed": speed,
+        "nGear": gear.astype(int),
+        "Throttle": throttle,
+        "Brake": braking,
+        "DRS": np.zeros(len(t), dtype=int),
+        "Source": "car",
+        "Distance": d,
+    })
+
+
+class SyntheticLap(pd.Series):
+    @property
+    def _constructor(self):
+        return SyntheticLap
+
+    @property
+    def _constructor_expanddim(self):
+        return SyntheticLaps
+
+    def get_car_data(self):
+        return synthetic_car_data(seed=int(self["Seed"]))
+
+
+class SyntheticLaps(pd.DataFrame):
+    @property
+    def _constructor(self):
+        return SyntheticLaps
+
+    @property
+    def _constructor_sliced(self):
+        return SyntheticLap
+
+
+class SyntheticEvent:
+    EventName = "Synthetic Grand Prix"
+    EventCountry = "Nowhere"
+    OfficialEventName = "FORMULA 1 SYNTHETIC GRAND PRIX"
+
+
+class SyntheticSession:
+    def __init__(self, laps, session_type="Race"):
+        self.laps = laps
+        self.session_type = session_type
+        self.event = SyntheticEvent()
+
+
+def synthetic_laps(n_drivers=20, n_laps=57, seed=0):
+    """A race-shaped Laps frame: stints, pit laps, a safety-car spell and a few deleted laps."""
+    rng = np.random.default_rng(seed)
+    compounds = ["SOFT", "MEDIUM", "HARD"]
+    rows = []
+    for k in range(n_drivers):
+        code = f"D{k:02d}"
+        pit_lap = int(rng.integers(15, max(16, n_laps - 10))) if n_laps > 20 else None
+        base = 90.0 + k * 0.08
+        clock = 3600.0
+        for n in range(1, n_laps + 1):
+            stint = 1 if pit_lap is None or n <= pit_lap else 2
+            in_lap = n == pit_lap
+            out_lap = n == 1 or (pit_lap is not None and n == pit_lap + 1)
+            sc = n_laps // 2 <= n < n_laps // 2 + 3
+            lap_s = base + rng.normal(0.0, 0.3) + (20.0 if sc else 0.0) + (5.0 if in_lap or out_lap else 0.0)
+            missing = rng.random() < 0.01
+            sectors = lap_s * np.array([0.31, 0.37, 0.32])
+            rows.append({
+                "Driver": code,
+                "DriverNumber": str(k + 1),
+                "Team": f"Team {k // 2}",
+                "LapTime": pd.NaT if missing else pd.Timedelta(seconds=round(lap_s, 3)),
+                "LapNumber": float(n),
+                "Stint": float(stint),
+                "Compound": compounds[(k + stint) % 3],
+                "TyreLife": float(n if stint == 1 else n - pit_lap),
+                "Sector1Time": pd.Timedelta(seconds=round(sectors[0], 3)),
+                "Sector2Time": pd.Timedelta(seconds=round(sectors[1], 3)),
+                "Sector3Time": pd.Timedelta(seconds=round(sectors[2], 3)),
+                "IsPersonalBest": False,
+                "TrackStatus": "14" if sc else "1",
+                "IsAccurate": not (missing or in_lap or out_lap or sc),
+                "Deleted": rng.random() < 0.005,
+                "PitOutTime": pd.Timedelta(seconds=clock) if out_lap else pd.NaT,
+                "PitInTime": pd.Timedelta(seconds=clock + lap_s) if in_lap else pd.NaT,
+                "LapStartTime": pd.Timedelta(seconds=clock),
+                "Time": pd.Timedelta(seconds=clock + lap_s),
+                "Seed": seed * 100000 + k * 1000 + n,
+            })
+            clock += lap_s
+    return SyntheticLaps(rows)
@@ -0,0 +1,88 @@
+import time
+
+import pytest
+
+import bulk_fetch_fastf1_data as bulk
+from fastf1_pipeline import FetchResult, PipelineConfig
+
+TASKS = [bulk.SessionTask(2025, round_id, number, "Q") for number, round_id in enumerate(["bahrain", "jeddah", "melbourne"], 1)]
+
+
+def summary(task, status):
+    return bulk.FetchSummary(task.round_id, task.round_number, task.session_code, status, None, None)
+
+
+class ScriptedTasks:
+    """Stands in for run_session_task: each round returns its scripted statuses in turn."""
+
+    def __init__(self, script):
+        self.script = {round_id: list(statuses) for round_id, statuses in script.items()}
+        self.calls = []
+
+    def __call__(self, task, config, timeout=None, previous=None, force=False, profile_dir=None):
+        self.calls.append(task.round_id)
+        status = self.script[task.round_id].pop(0)
+        if status == "crash":
+            raise RuntimeError("worker blew up")
+        return summary(task, status)
+
+
+@pytest.fixture
+def config(tmp_path):
+    return PipelineConfig(root=tmp_path)
+
+
+def run(monkeypatch, config, script, **kwargs):
+    scripted = ScriptedTasks(script)
+    monkeypatch.setattr(bulk, "run_session_task", scripted)
+    settled = []
+    results = bulk.run_tasks(TASKS, config=config, on_result=settled.append, **kwargs)
+    return results, settled, scripted
+
+
+def test_failed_tasks_are_retried(monkeypatch, config):
+    results, settled, scripted = run(
+        monkeypatch, config, {"bahrain": ["ok"], "jeddah": ["error", "timeout", "ok"], "melbourne": ["crash", "ok"]}, retries=2
+    )
+    assert [r.round_id for r in results] == ["bahrain", "jeddah", "melbourne"]
+    assert [r.status for r in results] == ["ok", "ok", "ok"]
+    assert [r.attempts for r in results] == [1, 3, 2]
+    assert len(settled) == 3 and scripted.calls.count("jeddah") == 3
+
+
+def test_retries_are_bounded(monkeypatch, config):
+    results, _, scripted = run(
+        monkeypatch, config, {"bahrain": ["error"] * 5, "jeddah": ["no_data", "ok"], "melbourne": ["crash"] * 5}, retries=1
+    )
+    assert [r.status for r in results] == ["error", "no_data", "error"]
+    assert [r.attempts for r in results] == [2, 1, 2]
+    assert "RuntimeError: worker blew up" in results[2].message
+    assert scripted.calls.count("jeddah") == 1
+
+
+def test_no_retries_by_default(monkeypatch, config):
+    results, _, _ = run(monkeypatch, config, {"bahrain": ["timeout", "ok"], "jeddah": ["ok"], "melbourne": ["ok"]})
+    assert [r.status for r in results] == ["timeout", "ok", "ok"]
+
+
+def test_time_limit_interrupts_block():
+    t0 = time.perf_counter()
+    with pytest.raises(bulk.TaskTimeout):
+        with bulk.time_limit(0.1):
+            time.sleep(2)
+    assert time.perf_counter() - t0 < 1
+    with bulk.time_limit(None):
+        time.sleep(0.01)
+
+
+def test_slow_fetch_times_out(monkeypatch, config):
+    def slow_fetch(identifier, cache_dir, telemetry=False, timer=None):
+        time.sleep(2)
+        return FetchResult(status="no_data", identifier=identifier)
+
+    monkeypatch.setattr(bulk, "fetch_session", slow_fetch)
+    t0 = time.perf_counter()
+    result = bulk.run_session_task(TASKS[0], config, timeout=0.1)
+    assert result.status == "timeout"
+    assert result.output_path is None
+    assert time.perf_counter() - t0 < 1
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+import f1_corners as fc
+from corner_reference import detect_lap_by_lap, edge_batch, noisy_batch, python_kernel
+
+FIXTURES = {
+    "noisy": noisy_batch(80, 600, seed=3),
+    "edges": edge_batch(),
+}
+
+
+def _with_nan_gaps():
+    speed, valid = noisy_batch(40, 400, seed=5)
+    speed[np.random.default_rng(5).random(speed.shape) < 0.02] = np.nan
+    return speed, valid
+
+
+FIXTURES["nan-gaps"] = _with_nan_gaps()
+
+
+@pytest.mark.parametrize("name", FIXTURES)
+def test_numpy_engine_matches_per_lap(name):
+    speed, valid = FIXTURES[name]
+    assert fc.detect_corners_batch(speed, valid, engine="numpy") == detect_lap_by_lap(speed, valid)
+
+
+@pytest.mark.parametrize("name", FIXTURES)
+def test_sequential_kernel_matches_per_lap(name):
+    speed, valid = FIXTURES[name]
+    assert python_kernel(speed, valid) == detect_lap_by_lap(speed, valid)
+
+
+@pytest.mark.parametrize("name", FIXTURES)
+def test_numba_engine_matches_per_lap(name):
+    pytest.importorskip("numba")
+    speed, valid = FIXTURES[name]
+    assert fc.detect_corners_batch(speed, valid, engine="numba") == detect_lap_by_lap(speed, valid)
+
+
+def test_rows_used_in_full_without_valid():
+    speed, _ = noisy_batch(5, 300, seed=9)
+    assert fc.detect_corners_batch(speed, engine="numpy") == [fc.detect_corners(row, np.arange(300.0)) for row in speed]
+
+
+def test_rejects_bad_input():
+    with pytest.raises(ValueError):
+        fc.detect_corners_batch(np.zeros(10))
+    with pytest.raises(ValueError):
+        fc.detect_corners_batch(np.zeros((2, 10)), engine="gpu")
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+import f1_corners as fc
+import synthetic
+from corner_reference import detect_corners_reference
+
+
+def _traces():
+    rng = np.random.default_rng(7)
+    yield "synthetic", fc.resample_to_common_distance(fc.with_distance(synthetic.synthetic_car_data(seed=3)))["Speed"].to_numpy()
+    for k in range(20):
+        yield f"random-walk-{k}", 200.0 + np.cumsum(rng.normal(0.0, 4.0, 600))
+    with_gaps = 200.0 + np.cumsum(rng.normal(0.0, 4.0, 600))
+    with_gaps[rng.choice(600, 40, replace=False)] = np.nan
+    yield "nan-gaps", with_gaps
+    nan_run = 200.0 + np.cumsum(rng.normal(0.0, 4.0, 300))
+    nan_run[100:130] = np.nan
+    yield "nan-run", nan_run
+    yield "all-nan", np.full(50, np.nan)
+    yield "flat", np.full(100, 150.0)
+    yield "short", np.array([200.0, 150.0, 100.0])
+    yield "empty", np.array([])
+    # a descent of exactly min_drop_kmh and a recovery of exactly min_recovery_kmh
+    yield "thresholds", np.array([200.0, 200.0, 194.0, 188.0, 182.0, 182.0, 187.0, 192.0, 192.0, 192.0])
+
+
+@pytest.mark.parametrize("name,speed", list(_traces()), ids=lambda v: v if isinstance(v, str) else "")
+def test_detect_corners_matches_while_loop(name, speed):
+    distance = np.arange(len(speed)) * 2.0
+    assert fc.detect_corners(speed, distance) == detect_corners_reference(speed, distance)
+
+
+@pytest.mark.parametrize("params", [dict(min_drop_kmh=5.0), dict(min_recovery_kmh=25.0), dict(min_len_pts=12)])
+def test_detect_corners_matches_while_loop_with_thresholds(params):
+    rng = np.random.default_rng(11)
+    for _ in range(10):
+        speed = 200.0 + np.cumsum(rng.normal(0.0, 4.0, 400))
+        distance = np.arange(len(speed)) * 2.0
+        assert fc.detect_corners(speed, distance, **params) == detect_corners_reference(speed, distance, **params)
+
+
+def test_synthetic_lap_finds_every_track_corner():
+    tel = fc.resample_to_common_distance(fc.with_distance(synthetic.synthetic_car_data(seed=0)))
+    corners = fc.detect_corners(tel["Speed"], tel["Distance"])
+    apexes = tel["Distance"].to_numpy()[[c["apex_idx"] for c in corners]]
+    for apex_d, _ in synthetic.TRACK_CORNERS:
+        assert np.min(np.abs(apexes - apex_d)) < 40.0
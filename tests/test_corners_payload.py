@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+import f1_corners
+from fastf1_pipeline import FetchResult, SessionIdentifier, build_corners_payload
+from fastf1_pipeline.corners import representative_laps
+from fastf1_pipeline.track_index import build_track_entry
+from fastf1_pipeline.writer import dumps
+from synthetic import TRACK_CORNERS, SyntheticSession, synthetic_laps
+
+LAPS = synthetic_laps(n_drivers=4, n_laps=6)
+IDENTIFIER = SessionIdentifier(2025, "synthetic", "Q")
+
+
+def fetch_result(status="ok"):
+    return FetchResult(status=status, identifier=IDENTIFIER, session=SyntheticSession(LAPS, session_type="Qualifying"))
+
+
+@pytest.fixture(scope="module")
+def payload():
+    return json.loads(dumps(build_corners_payload(fetch_result(), laps_per_driver=2)))
+
+
+def test_reference_is_fastest_clean_lap(payload):
+    fastest = min((representative_laps(LAPS, code, 1).iloc[0] for code in LAPS["Driver"].unique()), key=lambda lap: lap["LapTime"])
+    reference = payload["reference"]
+    assert reference["driver"] == fastest["Driver"]
+    assert reference["lapNumber"] == int(fastest["LapNumber"])
+    assert [c["corner"] for c in reference["corners"]] == list(range(1, len(TRACK_CORNERS) + 1))
+    for corner, (apex, _) in zip(reference["corners"], TRACK_CORNERS):
+        assert corner["d_apex"] == pytest.approx(apex, abs=30)
+
+
+def test_drivers_carry_their_fastest_laps(payload):
+    assert list(payload["drivers"]) == list(LAPS["Driver"].unique())
+    for code, laps in payload["drivers"].items():
+        expected = representative_laps(LAPS, code, 2)
+        assert [lap["lapNumber"] for lap in laps] == expected["LapNumber"].astype(int).tolist()
+        assert [lap["lapTimeSeconds"] for lap in laps] == [round(t.total_seconds(), 3) for t in expected["LapTime"]]
+        for lap in laps:
+            numbers = [c["corner"] for c in lap["corners"] if c["corner"] is not None]
+            assert numbers == sorted(set(numbers))
+            assert len(numbers) == len(TRACK_CORNERS)
+
+
+def test_each_lap_is_analysed_once(monkeypatch):
+    loaded = []
+    with_distance = f1_corners.with_distance
+    monkeypatch.setattr(f1_corners, "with_distance", lambda tel: loaded.append(1) or with_distance(tel))
+    result = build_corners_payload(fetch_result(), laps_per_driver=2)
+    assert len(loaded) == sum(len(laps) for laps in result["drivers"].values())
+
+
+def test_driver_filter():
+    result = build_corners_payload(fetch_result(), drivers=["d01", "D03"], laps_per_driver=1)
+    assert list(result["drivers"]) == ["D01", "D03"]
+    assert all(len(laps) == 1 for laps in result["drivers"].values())
+
+
+def test_unavailable_session_gives_empty_payload():
+    result = build_corners_payload(fetch_result(status="error"))
+    assert result["reference"] is None
+    assert result["drivers"] == {}
+    assert result["meta"]["status"] == "error"
+    assert result["notes"]
+
+
+def test_track_entry_numbers_corners(payload):
+    entry = build_track_entry([("2025/synthetic/Q", payload)])
+    assert len(entry["corners"]) == len(TRACK_CORNERS)
+    result = json.loads(dumps(build_corners_payload(fetch_result(), laps_per_driver=1, track_entry=entry)))
+    assert result["meta"]["trackIndex"] == entry["key"]
+    for laps in result["drivers"].values():
+        assert [c["corner"] for c in laps[0]["corners"]] == [c["number"] for c in entry["corners"]]
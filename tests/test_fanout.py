@@ -0,0 +1,58 @@
+import time
+
+from fastf1_pipeline import SessionIdentifier
+from fastf1_pipeline.fanout import run_fan_out
+from fastf1_pipeline.sessions import session_key
+from fake_loader import SleepingLoader
+
+IDENTIFIERS = [
+    SessionIdentifier(year, "monaco", code) for year in (2024, 2025) for code in ("FP1", "FP2", "FP3", "Q", "R")
+]
+
+
+def durations(slow_first=True):
+    # earlier requests sleep longer, so completion order is the reverse of request order
+    n = len(IDENTIFIERS)
+    return {session_key(ident): 0.02 * ((n - k) if slow_first else k + 1) for k, ident in enumerate(IDENTIFIERS)}
+
+
+def test_results_follow_request_order():
+    progress = []
+    results = run_fan_out(IDENTIFIERS, SleepingLoader(durations()), workers=len(IDENTIFIERS), processes=False, on_progress=progress.append)
+    assert [r.identifier for r in results] == IDENTIFIERS
+    assert [r.value for r in results] == IDENTIFIERS
+    # completion order differs from request order, and progress counts up to the total
+    assert [p.result.identifier for p in progress] != IDENTIFIERS
+    assert [p.finished for p in progress] == list(range(1, len(IDENTIFIERS) + 1))
+    assert progress[-1].running == progress[-1].waiting == 0
+
+
+def test_failing_job_is_isolated():
+    failing = IDENTIFIERS[3]
+    results = run_fan_out(IDENTIFIERS, SleepingLoader(durations(), fail=[failing]), workers=4, processes=False)
+    assert [r.identifier for r in results if r.error] == [failing]
+    assert "simulated load failure" in results[3].error
+    assert all(r.value == r.identifier for r in results if not r.error)
+
+
+def test_jobs_overlap():
+    loader = SleepingLoader({session_key(ident): 0.2 for ident in IDENTIFIERS})
+    t0 = time.perf_counter()
+    run_fan_out(IDENTIFIERS, loader, workers=len(IDENTIFIERS), processes=False)
+    assert time.perf_counter() - t0 < 0.2 * len(IDENTIFIERS) / 2
+
+
+def test_worker_cap():
+    loader = SleepingLoader(durations())
+    run_fan_out(IDENTIFIERS, loader, workers=1, processes=False)
+    assert max(loader.peak.values()) == 1
+
+
+def test_per_cache_cap():
+    loader = SleepingLoader(durations())
+    run_fan_out(IDENTIFIERS, loader, workers=len(IDENTIFIERS), processes=False, cache_key=lambda ident: ident.year, per_cache=2)
+    assert max(loader.peak.values()) == 2
+
+
+def test_empty_request():
+    assert run_fan_out([], SleepingLoader({}), processes=False) == []
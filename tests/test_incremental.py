@@ -0,0 +1,81 @@
+import pytest
+
+import bulk_fetch_fastf1_data as bulk
+from fastf1_pipeline import FetchResult, PipelineConfig
+from fastf1_pipeline.incremental import BuildRecord, build_key, fingerprint_cache
+
+TASK = bulk.SessionTask(2025, "monaco", 8, "Q")
+
+
+@pytest.fixture
+def fetches(monkeypatch):
+    calls = []
+
+    def fetch_session(identifier, cache_dir, telemetry=False, timer=None):
+        calls.append(identifier)
+        return FetchResult(status="no_data", identifier=identifier, message="stub")
+
+    monkeypatch.setattr(bulk, "fetch_session", fetch_session)
+    return calls
+
+
+def previous_build(config, **key):
+    cache_dir = config.resolve_cache(TASK.year, TASK.round_id, TASK.session_code)
+    cache_dir.mkdir(parents=True)
+    (cache_dir / "timing.ff1pkl").write_bytes(b"raw")
+    files = fingerprint_cache(cache_dir)
+    return BuildRecord(key=build_key(files, config=config, **key), files=files)
+
+
+def write_artifacts(config, paths):
+    for path in paths:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("{}")
+
+
+@pytest.mark.parametrize(
+    "stages",
+    [{}, {"build_corners": True}, {"build_traces": True}, {"build_reference": True}, {"write_columnar": False}],
+    ids=["default", "corners", "traces", "reference", "no-columnar"],
+)
+def test_skip_needs_every_enabled_artifact(tmp_path, fetches, stages):
+    config = PipelineConfig(root=tmp_path, use_track_index=False, **stages)
+    previous = previous_build(config)
+    artifacts = config.output_artifacts(TASK.year, TASK.round_id, TASK.session_code)
+    assert artifacts[0].name == "session.json"
+
+    for missing in artifacts:
+        write_artifacts(config, [path for path in artifacts if path != missing])
+        missing.unlink(missing_ok=True)
+        assert bulk.run_session_task(TASK, config, previous=previous).status == "no_data"
+    assert len(fetches) == len(artifacts)
+
+    write_artifacts(config, artifacts)
+    assert bulk.run_session_task(TASK, config, previous=previous).status == "unchanged"
+    assert len(fetches) == len(artifacts)
+
+
+def test_artifacts_follow_enabled_stages(tmp_path):
+    config = PipelineConfig(root=tmp_path, build_corners=True, build_traces=True, build_reference=True)
+    names = [path.name for path in config.output_artifacts(2025, "monaco", "Q")]
+    assert names == ["session.json", "session.columnar.json", "corners.json", "laps.json", "reference.npy", "reference.json"]
+    reference = config.resolve_reference(2025, "monaco", "Q")
+    assert config.output_artifacts(2025, "monaco", "Q")[-1].parent == reference
+
+
+def test_driver_filtered_build_is_rebuilt(tmp_path, fetches):
+    config = PipelineConfig(root=tmp_path)
+    previous = previous_build(config, drivers=["ver", "nor"])
+    write_artifacts(config, config.output_artifacts(TASK.year, TASK.round_id, TASK.session_code))
+    assert bulk.run_session_task(TASK, config, previous=previous).status == "no_data"
+
+
+def test_build_key_includes_drivers(tmp_path):
+    config = PipelineConfig(root=tmp_path)
+    keys = {
+        build_key({}, config=config),
+        build_key({}, config=config, drivers=["VER"]),
+        build_key({}, config=config, drivers=["VER", "NOR"]),
+    }
+    assert len(keys) == 3
+    assert build_key({}, config=config, drivers=["nor", "VER"]) == build_key({}, config=config, drivers=["VER", "NOR"])
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+import f1_corners as fc
+import synthetic
+from f1_lap_cache import ResampledLapCache
+
+ARGS = (2025, "Monaco Grand Prix", "Q", "VER")
+
+
+@pytest.fixture(scope="module")
+def lap():
+    return fc.resample_to_common_distance(fc.with_distance(synthetic.synthetic_car_data(seed=1)))
+
+
+def test_round_trip_keyed_on_lap_number(tmp_path, lap):
+    cache = ResampledLapCache(tmp_path)
+    cache.put(*ARGS, 12, 2.0, lap)
+    assert cache.get(*ARGS, 13, 2.0) is None
+    assert cache.get(*ARGS, 12, 1.0) is None
+    got = cache.get(*ARGS, 12.0, 2.0)
+    assert list(got.columns) == list(lap.columns)
+    for column in lap.columns:
+        np.testing.assert_array_equal(got[column].to_numpy(), lap[column].to_numpy())
+
+
+def test_get_wraps_the_memory_map(tmp_path, lap):
+    cache = ResampledLapCache(tmp_path)
+    cache.put(*ARGS, 12, 2.0, lap)
+    got = cache.get(*ARGS, 12, 2.0)
+    for column in got.columns:
+        values = got[column].to_numpy()
+        assert not values.flags.writeable
+        while values.base is not None and not isinstance(values, np.memmap):
+            values = values.base
+        assert isinstance(values, np.memmap)
+    # the corner maths only reads the columns
+    corners = fc.detect_corners(got["Speed"], got["Distance"])
+    assert len(fc.per_corner_metrics(got, corners)) == len(corners) > 0
+
+
+def test_lap_alias(tmp_path):
+    cache = ResampledLapCache(tmp_path)
+    assert cache.lap_alias(*ARGS) is None
+    cache.put_lap_alias(*ARGS, 12)
+    cache.put_lap_alias(2025, "Monaco Grand Prix", "Q", "NOR", 9)
+    assert cache.lap_alias(*ARGS) == 12
+    assert cache.lap_alias(2025, "Monaco Grand Prix", "Q", "NOR") == 9
+    assert cache.lap_alias(*ARGS, pick="slowest") is None
+    assert cache.lap_alias(2025, "Monaco Grand Prix", "R", "VER") is None
+
+
+def test_version_bump_drops_old_entries(tmp_path, lap):
+    old = ResampledLapCache(tmp_path, version=1)
+    old.put(*ARGS, 12, 2.0, lap)
+    old.put_lap_alias(*ARGS, 12)
+    new = ResampledLapCache(tmp_path, version=2)
+    assert new.lap_alias(*ARGS) is None and new.get(*ARGS, 12, 2.0) is None
+    new.evict()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_eviction_keeps_recent_entries(tmp_path, lap):
+    size = lap.to_records(index=False).nbytes
+    cache = ResampledLapCache(tmp_path, max_bytes=int(size * 2.5))
+    for number in range(1, 5):
+        cache.put(*ARGS, number, 2.0, lap)
+    kept = [n for n in range(1, 5) if cache._path(*ARGS, n, 2.0).exists()]
+    assert kept == [3, 4]
@@ -0,0 +1,63 @@
+import sys
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+import f1_corners as fc
+from f1_reference_pack import write_reference_pack
+from fastf1_pipeline import FetchResult, SessionIdentifier
+from fastf1_pipeline.corners import representative_laps
+from fastf1_pipeline.reference import build_reference_pack
+from synthetic import SyntheticSession, synthetic_laps
+
+LAPS = synthetic_laps(n_drivers=3, n_laps=30)
+SESSION = SyntheticSession(LAPS)
+RESULT = FetchResult(status="ok", identifier=SessionIdentifier(2025, "synthetic", "R"), session=SESSION)
+
+
+def test_clean_laps_drop_unusable_laps():
+    laps = fc.clean_laps(LAPS, "D00")
+    assert len(laps) < (LAPS["Driver"] == "D00").sum()
+    assert laps["LapTime"].notna().all()
+    assert not laps["Deleted"].any() and laps["IsAccurate"].all()
+    assert laps["PitInTime"].isna().all() and laps["PitOutTime"].isna().all()
+
+
+def test_fastest_clean_laps_order():
+    laps = fc.fastest_clean_laps(LAPS, "D01")
+    assert laps["LapTime"].is_monotonic_increasing
+    assert len(laps) == len(fc.clean_laps(LAPS, "D01"))
+    pd.testing.assert_frame_equal(fc.fastest_clean_laps(LAPS, "D01", 3), laps.head(3))
+
+
+@pytest.mark.parametrize("selection, count", [("fastest", 1), ("top-4", 4), ("all", None)])
+def test_driver_laps_follow_the_clean_rule(selection, count):
+    expected = fc.fastest_clean_laps(LAPS, "D02", count)["LapNumber"].tolist()
+    assert [lap["LapNumber"] for lap in fc.get_driver_laps(SESSION, "D02", selection)] == expected
+
+
+def test_pipeline_and_cli_pick_the_same_lap():
+    pack = build_reference_pack(RESULT)
+    for driver, lap in zip(pack.drivers, pack.laps):
+        assert representative_laps(LAPS, driver, 1).iloc[0]["LapNumber"] == lap["lapNumber"]
+        assert fc.get_fastest_lap(SESSION, driver)["LapNumber"] == lap["lapNumber"]
+
+
+def test_pack_on_another_grid_is_not_used(tmp_path, capsys):
+    pack = build_reference_pack(RESULT, dist_step=2.0)
+    write_reference_pack(tmp_path, pack)
+    assert fc.open_reference_pack(tmp_path, 2.0).drivers == pack.drivers
+    assert fc.open_reference_pack(tmp_path, 1.0) is None
+    assert "--dist_step 1" in capsys.readouterr().out
+
+
+def test_main_exits_when_a_driver_has_no_clean_lap(monkeypatch):
+    laps = LAPS.assign(IsAccurate=LAPS["IsAccurate"] & (LAPS["Driver"] != "D00"))
+    session = SimpleNamespace(laps=laps, load=lambda: None)
+    fastf1 = SimpleNamespace(Cache=SimpleNamespace(enable_cache=lambda path: None), get_session=lambda *args: session)
+    monkeypatch.setitem(sys.modules, "fastf1", fastf1)
+    monkeypatch.setattr(sys, "argv", ["f1_corners.py", "--drvA", "D00", "--drvB", "D01", "--no_lap_cache"])
+    assert fc.get_fastest_lap(session, "D00") is None
+    with pytest.raises(SystemExit, match="No valid laps for D00"):
+        fc.main()
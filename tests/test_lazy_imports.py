@@ -0,0 +1,33 @@
+import subprocess
+import sys
+
+import pytest
+
+from startup import SCRIPTS, TARGETS, import_profile
+
+
+# Budgets are tuned for a quiet machine; shared CI runners get this much headroom.
+BUDGET_SCALE = 3.0
+RUNS = 3
+
+
+@pytest.mark.parametrize("target", TARGETS, ids=[target.name for target in TARGETS])
+def test_entry_point_skips_heavy_imports(target):
+    _, modules = import_profile(target)
+    assert not set(target.forbidden) & modules
+
+
+@pytest.mark.parametrize("target", TARGETS, ids=[target.name for target in TARGETS])
+def test_entry_point_meets_startup_budget(target):
+    best_ms = min(import_profile(target)[0] for _ in range(RUNS))
+    assert best_ms <= target.budget_ms * BUDGET_SCALE
+
+
+def test_lazy_module_loads_on_first_use():
+    code = (
+        "import sys, fastf1_pipeline.transforms as t\n"
+        "assert 'pandas.core.frame' not in sys.modules\n"
+        "assert t.pd.DataFrame({'a': [1]}).shape == (1, 1)\n"
+        "assert 'pandas.core.frame' in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], cwd=SCRIPTS, check=True)
@@ -0,0 +1,71 @@
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from fastf1_pipeline import FetchResult, SessionIdentifier, build_session_payload
+
+SESSIONS = Path(__file__).resolve().parents[1] / "public" / "data" / "sessions"
+FIXTURES = [path for path in sorted(SESSIONS.glob("*/*/*/session.json")) if json.loads(path.read_text())["laps"]]
+
+
+def _timedelta(seconds):
+    return pd.NaT if seconds is None else pd.Timedelta(milliseconds=round(seconds * 1000))
+
+
+def _number(value):
+    return np.nan if value is None else float(value)
+
+
+def _laps_frame(payload):
+    """A FastF1-shaped Laps frame holding exactly what the fixture's lap records carry."""
+    rows = []
+    for lap in payload["laps"]:
+        flags = set(lap["flags"])
+        driver = payload["drivers"].get(lap["driver"], {})
+        sectors = lap["sectorTimesSeconds"]
+        rows.append(
+            {
+                "Driver": lap["driver"],
+                "DriverNumber": str(driver.get("number")),
+                "Team": driver.get("team"),
+                "LapTime": _timedelta(lap["lapTimeSeconds"]),
+                "LapNumber": _number(lap["lapNumber"]),
+                "Stint": _number(lap["stint"]),
+                "Compound": np.nan if lap["compound"] is None else lap["compound"],
+                "TyreLife": _number(lap["tyreLife"]),
+                "Sector1Time": _timedelta(sectors[0]),
+                "Sector2Time": _timedelta(sectors[1]),
+                "Sector3Time": _timedelta(sectors[2]),
+                "IsPersonalBest": lap["isPersonalBest"],
+                "TrackStatus": np.nan if lap["trackStatus"] is None else lap["trackStatus"],
+                "IsAccurate": lap["hasData"],
+                "Deleted": "deleted" in flags,
+                "PitOutTime": pd.Timedelta(seconds=1) if "out-lap" in flags else pd.NaT,
+                "PitInTime": pd.Timedelta(seconds=1) if "in-lap" in flags else pd.NaT,
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+@pytest.mark.parametrize("path", FIXTURES, ids=lambda path: "/".join(path.parts[-4:-1]))
+def test_fixture_serialises_byte_for_byte(path):
+    text = path.read_text()
+    fixture = json.loads(text)
+    meta, event = fixture["meta"], fixture["meta"]["event"]
+    session = SimpleNamespace(
+        laps=_laps_frame(fixture),
+        event=SimpleNamespace(EventName=event["name"], EventCountry=event["country"], OfficialEventName=event["officialName"]),
+    )
+    result = FetchResult(
+        status="ok",
+        identifier=SessionIdentifier(meta["year"], meta["round"], meta["session"]),
+        session=session,
+        message="OK",
+    )
+    payload = build_session_payload(result)
+    payload["meta"]["generatedAt"] = meta["generatedAt"]
+    assert json.dumps(payload, indent=2) == text
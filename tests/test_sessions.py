@@ -0,0 +1,103 @@
+import asyncio
+import threading
+import time
+from collections import Counter
+
+from fastf1_pipeline import FetchResult, SessionIdentifier
+from fastf1_pipeline.sessions import LRUCache, SessionManager, session_key
+
+
+class StubLoader:
+    """Sleeps instead of session.load(); counts loads per session."""
+
+    def __init__(self, delay=0.05, fail=()):
+        self.delay = delay
+        self.fail = set(fail)
+        self.calls = Counter()
+        self.lock = threading.Lock()
+
+    def __call__(self, identifier):
+        with self.lock:
+            self.calls[session_key(identifier)] += 1
+        time.sleep(self.delay)
+        if session_key(identifier) in self.fail:
+            return FetchResult(status="error", identifier=identifier, message="boom")
+        return FetchResult(status="ok", identifier=identifier, session=object())
+
+
+def ident(round_slug="monaco", code="Q"):
+    return SessionIdentifier(2025, round_slug, code)
+
+
+def test_concurrent_requests_share_one_load():
+    loader = StubLoader()
+    manager = SessionManager(loader)
+
+    async def run():
+        return await asyncio.gather(*(manager.get(ident()) for _ in range(5)))
+
+    results = asyncio.run(run())
+    assert loader.calls[session_key(ident())] == 1
+    assert len({id(result) for result in results}) == 1
+    assert (manager.misses, manager.coalesced, manager.hits) == (1, 4, 0)
+    assert manager.stats()["inflight"] == 0
+
+
+def test_cached_session_is_a_hit():
+    loader = StubLoader(delay=0.0)
+    manager = SessionManager(loader)
+
+    async def run():
+        await manager.get(ident())
+        await manager.get(ident())
+
+    asyncio.run(run())
+    assert loader.calls[session_key(ident())] == 1
+    assert (manager.misses, manager.hits) == (1, 1)
+
+
+def test_failed_loads_are_not_cached():
+    loader = StubLoader(delay=0.0, fail=[session_key(ident())])
+    manager = SessionManager(loader)
+
+    async def run():
+        first = await manager.get(ident())
+        second = await manager.get(ident())
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first.status == second.status == "error"
+    assert loader.calls[session_key(ident())] == 2
+    assert manager.errors == 2
+
+
+def test_prefetch_loads_next_sessions_in_calendar_order():
+    order = [ident("bahrain", "Q"), ident("bahrain", "R"), ident("jeddah", "Q"), ident("jeddah", "R")]
+    loader = StubLoader(delay=0.01)
+    manager = SessionManager(loader, order=order, prefetch_depth=2)
+
+    async def settle():
+        while manager._background:
+            await asyncio.sleep(0.01)
+
+    async def run():
+        await manager.get(order[0])
+        await settle()
+        assert manager.prefetched == 2  # bahrain R and jeddah Q
+        await manager.get(order[1])
+        await settle()
+
+    asyncio.run(run())
+    assert manager.hits == 1  # bahrain R was already loaded
+    assert manager.prefetched == 3  # then jeddah R
+    assert all(loader.calls[session_key(i)] == 1 for i in order)
+
+
+def test_lru_cache_evicts_least_recent():
+    cache = LRUCache(max_items=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert "b" not in cache and "a" in cache and "c" in cache
+    assert cache.evictions == 1
@@ -0,0 +1,75 @@
+import json
+
+import numpy as np
+import pytest
+
+from fastf1_pipeline import build_laps_payload
+from fastf1_pipeline.traces import downsample_trace, lttb_indices, max_reconstruction_error, mini_sector_deltas
+from trace_bounds import BYTES_PER_POINT, FULL_RESOLUTION, LIMITS, session, worst_error
+
+
+@pytest.fixture(scope="module")
+def fixture():
+    return session(6)
+
+
+@pytest.fixture(scope="module")
+def full(fixture):
+    return build_laps_payload(fixture, max_points=FULL_RESOLUTION)
+
+
+def test_lttb_keeps_endpoints_and_budget():
+    x = np.linspace(0.0, 100.0, 1000)
+    y = np.sin(x)
+    kept = lttb_indices(x, y, 50)
+    assert len(kept) == 50
+    assert kept[0] == 0 and kept[-1] == 999
+    assert np.all(np.diff(kept) > 0)
+
+
+@pytest.mark.parametrize("n_out", [0, 1, 2, 10, 10_000])
+def test_lttb_small_and_oversized_budgets(n_out):
+    x = np.arange(10.0)
+    kept = lttb_indices(x, x ** 2, n_out)
+    assert len(kept) == min(n_out, 10)
+    if n_out >= 10:
+        assert kept.tolist() == list(range(10))
+
+
+def test_lttb_keeps_a_spike():
+    x = np.arange(1000.0)
+    y = np.zeros(1000)
+    y[537] = 50.0
+    assert 537 in lttb_indices(x, y, 20).tolist()
+
+
+def test_straight_line_reconstructs_exactly():
+    x = np.linspace(0.0, 5000.0, 2500)
+    trace = downsample_trace(x, 0.01 * x, 10, 3)
+    assert max_reconstruction_error(x, 0.01 * x, trace) < 1e-3
+
+
+@pytest.mark.parametrize("budget", sorted(LIMITS))
+def test_laps_payload_size_and_error_bounds(fixture, full, budget):
+    payload = build_laps_payload(fixture, max_points=budget)
+    delta_limit, speed_limit = LIMITS[budget]
+    for code, driver in payload["drivers"].items():
+        for name, limit in (("delta", delta_limit), ("speed", speed_limit)):
+            assert len(driver[name]["distance"]) <= budget
+            assert len(driver[name]["distance"]) == len(driver[name]["values"])
+            assert worst_error(full["drivers"][code][name], driver[name]) <= limit
+    size = len(json.dumps(payload, separators=(",", ":")))
+    assert size <= BYTES_PER_POINT * budget * len(payload["drivers"])
+
+
+def test_reference_driver_has_zero_delta(full):
+    reference = full["reference"]["driver"]
+    assert set(full["drivers"][reference]["delta"]["values"]) == {0.0}
+
+
+def test_mini_sectors_sum_to_lap_delta():
+    distance = np.linspace(0.0, 5000.0, 2501)
+    delta = np.linspace(0.0, 0.5, 2501)
+    sectors = mini_sector_deltas(distance, delta, 5000.0, 25)
+    assert len(sectors) == 25
+    assert sum(sectors) == pytest.approx(0.5, abs=1e-2)
@@ -0,0 +1,81 @@
+import json
+
+import pandas as pd
+import pytest
+
+from fastf1_pipeline import FetchResult, SessionIdentifier, build_session_payload
+from fastf1_pipeline.transforms import LapTable, _track_status_bits, build_session_tables
+
+
+class _Session:
+    def __init__(self, laps, session_type="R"):
+        self.laps = laps
+        self.session_type = session_type
+        self.event = None
+
+
+def _laps(**extra):
+    data = {
+        "Driver": ["VER", "VER", "NOR"],
+        "DriverNumber": ["1", "1", "4"],
+        "Team": ["Red Bull Racing", "Red Bull Racing", "McLaren"],
+        "Compound": ["SOFT", "SOFT", "MEDIUM"],
+        "TyreLife": [1.0, 2.0, 1.0],
+        "LapNumber": [1.0, 2.0, 2.0],
+        "Stint": [1.0, 1.0, 1.0],
+        "LapTime": pd.to_timedelta([91.2, 90.5, None], unit="s"),
+        "IsAccurate": [True, True, False],
+    }
+    data.update(extra)
+    return pd.DataFrame(data)
+
+
+def _result(laps, session_type="R", status="ok"):
+    return FetchResult(status=status, identifier=SessionIdentifier(2025, "monaco", "R"), session=_Session(laps, session_type))
+
+
+def _payload(laps, session_type="R"):
+    return build_session_payload(_result(laps, session_type))
+
+
+def test_missing_track_status_column_writes_null():
+    records = json.loads(json.dumps(_payload(_laps())["laps"]))
+    assert [lap["trackStatus"] for lap in records] == [None, None, None]
+    assert all(not {"yellow-flag", "safety-car", "red-flag"} & set(lap["flags"]) for lap in records)
+
+
+def test_track_status_flags():
+    records = _payload(_laps(TrackStatus=["1", "24", None]))["laps"]
+    assert [lap["trackStatus"] for lap in records] == ["1", "24", None]
+    assert "yellow-flag" in records[1]["flags"] and "safety-car" in records[1]["flags"]
+    assert records[0]["flags"] == ["formation-lap"]
+
+
+@pytest.mark.parametrize("value", [None, float("nan"), "", 3])
+def test_track_status_bits_ignores_non_text(value):
+    assert _track_status_bits(value) == 0
+
+
+def test_corners_note_only_when_corners_json_is_written():
+    payload = _payload(_laps())
+    assert payload["corners"] == {"VER": [], "NOR": []}
+    assert not any("corners" in note for note in payload["notes"])
+    with_corners = build_session_payload(_result(_laps()), corners_file=True)
+    assert any("corners.json" in note for note in with_corners["notes"])
+
+
+@pytest.mark.parametrize(
+    "result",
+    [_result(_laps()), _result(_laps().iloc[:0]), _result(_laps(), status="error")],
+    ids=["laps", "no-laps", "unavailable"],
+)
+def test_payload_is_plain_json(result):
+    payload = build_session_payload(result)
+    assert isinstance(payload["laps"], list)
+    assert json.loads(json.dumps(payload)) == payload
+
+
+def test_tables_keep_laps_compact():
+    tables = build_session_tables(_result(_laps()))
+    assert isinstance(tables["laps"], LapTable)
+    assert tables["laps"].to_json() == _payload(_laps())["laps"]
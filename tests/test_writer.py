@@ -0,0 +1,81 @@
+import json
+import math
+
+import pytest
+
+from fastf1_pipeline import FetchResult, SessionIdentifier
+from fastf1_pipeline.transforms import build_session_tables
+from fastf1_pipeline.writer import CHUNK_ITEMS, dumps, json_default, orjson_available, resolve_backend, write_json
+from synthetic import SyntheticSession, synthetic_laps
+
+NESTED = {
+    "version": 1,
+    "empty": {},
+    "none": [],
+    "small": [1, 2.5, None, True, "naïve"],
+    "long": [{"i": i, "x": i / 3, "tag": f"t{i}"} for i in range(CHUNK_ITEMS * 2 + 7)],
+    "exact": list(range(CHUNK_ITEMS)),
+    "deep": {"a": {"b": [[1, 2], {"c": []}]}, "nan": math.nan},
+    3: "int key",
+}
+
+
+def _race_payload():
+    result = FetchResult(
+        status="ok",
+        identifier=SessionIdentifier(2025, "synthetic", "R"),
+        session=SyntheticSession(synthetic_laps(n_drivers=20, n_laps=57)),
+    )
+    return build_session_tables(result)
+
+
+class Explodes:
+    def to_json(self):
+        raise RuntimeError("simulated crash mid-write")
+
+
+def expected(value, indent):
+    separators = (",", ":") if indent is None else None
+    return json.dumps(value, indent=indent, separators=separators, default=json_default)
+
+
+@pytest.mark.parametrize("indent", [None, 2, 4])
+def test_dumps_matches_json_dumps(indent):
+    assert dumps(NESTED, indent=indent) == expected(NESTED, indent)
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+def test_lap_table_streams_like_json_dumps(tmp_path, indent):
+    payload = _race_payload()
+    path = write_json(tmp_path / "session.json", payload, indent=indent)
+    assert path.read_text() == expected(payload, indent)
+    assert not path.with_suffix(".tmp").exists()
+
+
+def test_failed_write_keeps_previous_file(tmp_path):
+    path = tmp_path / "session.json"
+    write_json(path, {"version": 1})
+    with pytest.raises(RuntimeError):
+        write_json(path, {"laps": list(range(10_000)), "boom": Explodes()})
+    assert json.loads(path.read_text()) == {"version": 1}
+    assert not path.with_suffix(".tmp").exists()
+
+
+def test_unserialisable_value_raises():
+    with pytest.raises(TypeError):
+        dumps({"bad": object()})
+
+
+def test_resolve_backend():
+    with pytest.raises(ValueError):
+        resolve_backend("ujson")
+    assert resolve_backend("json", 2) == "json"
+    assert resolve_backend("orjson", 4) == "json"
+    assert resolve_backend("orjson", 2) == ("orjson" if orjson_available() else "json")
+
+
+@pytest.mark.skipif(not orjson_available(), reason="orjson not installed")
+@pytest.mark.parametrize("indent", [None, 2])
+def test_orjson_parses_to_same_data(indent):
+    payload = _race_payload()
+    assert json.loads(dumps(payload, indent=indent, backend="orjson")) == json.loads(expected(payload, indent))
@@ -0,0 +1,38 @@
+"""
+Size and error bounds for the laps.json trace downsampling, shared by the trace
+tests and benchmarks/trace_downsampling.py, plus the synthetic qualifying
+session both check them on.
+"""
+
+import numpy as np
+
+from fastf1_pipeline import FetchResult, SessionIdentifier
+from fastf1_pipeline.traces import max_reconstruction_error
+
+import synthetic
+
+# budget -> (max delta error [s], max speed error [km/h]). LTTB keeps shape,
+# not a max-error guarantee, so these are measured worst cases plus headroom.
+LIMITS = {
+    100: (0.150, 50.0),
+    200: (0.060, 20.0),
+    400: (0.040, 12.0),
+    800: (0.020, 6.0),
+}
+BYTES_PER_POINT = 30  # two traces of (distance, value) pairs plus keys and mini-sectors
+FULL_RESOLUTION = 1 << 20
+
+
+def session(n_drivers):
+    """A synthetic qualifying session with 15 laps per driver."""
+    laps = synthetic.synthetic_laps(n_drivers=n_drivers, n_laps=15)
+    return FetchResult(
+        status="ok",
+        identifier=SessionIdentifier(2025, "synthetic", "Q"),
+        session=synthetic.SyntheticSession(laps, session_type="Qualifying"),
+    )
+
+
+def worst_error(full, reduced):
+    """Largest gap between a full-resolution trace and its downsampled version, interpolated."""
+    return max_reconstruction_error(np.asarray(full["distance"]), np.asarray(full["values"]), reduced)